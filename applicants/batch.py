@@ -0,0 +1,190 @@
+import os
+import zipfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+
+from .models import AnalysisBatch, AnalysisJob, JobDescription, ResumeAnalysis
+from .task import enqueue_batch_jobs, requeue_stale_jobs
+
+
+class BatchUploadError(ValueError):
+    pass
+
+
+# --- 1. Collecting Resumes ---
+
+def _is_resume_name(name):
+    base = os.path.basename(name)
+    return base.lower().endswith('.pdf') and not base.startswith('.') and '__MACOSX' not in name
+
+
+def _check_count(count, empty_message):
+    if not count:
+        raise BatchUploadError(empty_message)
+    if count > settings.BATCH_MAX_FILES:
+        raise BatchUploadError(f"A batch can contain at most {settings.BATCH_MAX_FILES} resumes.")
+
+
+def iter_zip_resumes(zip_file):
+    """
+    Returns an iterator of (filename, bytes) for every PDF in a ZIP archive.
+    The archive and the count limit are checked right away (raising BatchUploadError);
+    the files are read one at a time as the iterator is consumed.
+    """
+    try:
+        archive = zipfile.ZipFile(zip_file)
+    except zipfile.BadZipFile:
+        raise BatchUploadError("The uploaded file is not a valid ZIP archive.")
+
+    members = [info for info in archive.infolist() if not info.is_dir() and _is_resume_name(info.filename)]
+    try:
+        _check_count(len(members), "The ZIP archive does not contain any PDF files.")
+    except BatchUploadError:
+        archive.close()
+        raise
+
+    def read_members():
+        with archive:
+            for info in members:
+                # file_size is the uncompressed size, so this also guards against zip bombs
+                if info.file_size > settings.BATCH_MAX_FILE_BYTES:
+                    print(f"Skipping {info.filename}: larger than {settings.BATCH_MAX_FILE_BYTES} bytes")
+                    continue
+                yield os.path.basename(info.filename), archive.read(info)
+
+    return read_members()
+
+
+def iter_directory_resumes(directory):
+    """Same as iter_zip_resumes() for a directory tree of PDFs."""
+    paths = sorted(p for p in Path(directory).rglob('*') if p.is_file() and _is_resume_name(str(p)))
+    _check_count(len(paths), f"No PDF files found in {directory}.")
+
+    def read_paths():
+        for path in paths:
+            if path.stat().st_size > settings.BATCH_MAX_FILE_BYTES:
+                print(f"Skipping {path}: larger than {settings.BATCH_MAX_FILE_BYTES} bytes")
+                continue
+            yield path.name, path.read_bytes()
+
+    return read_paths()
+
+
+# --- 2. Creating & Resuming Batches ---
+
+def create_batch(user, job_title, job_description, resumes, source_name=''):
+    """
+    Creates the batch and one ResumeAnalysis per resume in one transaction, and queues
+    low-priority jobs. No LLM call happens here: if the JD has no current parse, a single
+    JD parse job is queued first and releases the analyze jobs once the parse is stored
+    (enqueue_batch_jobs), so the JD is parsed once and every worker reuses that parse.
+    """
+    job_posting = JobDescription.objects.get_or_create_from_text(job_description)
+
+    with transaction.atomic():
+        batch = AnalysisBatch.objects.create(
+            user=user, job_title=job_title, job_posting=job_posting, source_name=source_name
+        )
+        analyses = [
+            ResumeAnalysis.objects.create(
+                user=user,
+                job_title=job_title,
+                job_posting=job_posting,
+                batch=batch,
+                resume_file=ContentFile(content, name=filename),
+            )
+            for filename, content in resumes
+        ]
+        if not analyses:
+            raise BatchUploadError(
+                f"Every resume is larger than the {settings.BATCH_MAX_FILE_BYTES} byte limit."
+            )
+        enqueue_batch_jobs(batch)
+    return batch
+
+
+def resume_batch(batch, retry_failed=False):
+    """
+    Picks an interrupted batch back up: stale RUNNING jobs go back to the queue (or fail,
+    once out of attempts), analyses that never got a job are enqueued (after the JD parse,
+    if it is still missing), and optionally FAILED jobs are retried. Finished analyses are left untouched.
+    Returns the number of jobs (re)queued.
+    """
+    requeued = requeue_stale_jobs()
+    jobs = AnalysisJob.objects.filter(
+        analysis__batch=batch, kind__in=[AnalysisJob.KIND_ANALYZE, AnalysisJob.KIND_PARSE_JD]
+    )
+    if retry_failed:
+        requeued += jobs.filter(status=AnalysisJob.STATUS_FAILED).update(
+            status=AnalysisJob.STATUS_QUEUED, attempts=0, error=None
+        )
+
+    return requeued + enqueue_batch_jobs(batch)
+
+
+# --- 3. Progress & Ranking ---
+
+def batch_progress(batch):
+    """
+    Analyses of the batch per status of their latest analyze job (retries and requeues count
+    once). Analyses still waiting for the JD parse count as queued, or as failed if it failed.
+    """
+    latest_status = (
+        AnalysisJob.objects.filter(analysis=OuterRef('pk'), kind=AnalysisJob.KIND_ANALYZE)
+        .order_by('-created_at', '-id')
+        .values('status')[:1]
+    )
+    counts = dict(
+        batch.analyses.annotate(job_status=Subquery(latest_status))
+        .order_by()
+        .values_list('job_status')
+        .annotate(total=Count('id'))
+    )
+    total = sum(counts.values())
+    waiting = counts.get(None, 0)
+    parse_job = (
+        AnalysisJob.objects.filter(analysis__batch=batch, kind=AnalysisJob.KIND_PARSE_JD)
+        .order_by('-created_at', '-id').first()
+    )
+    parse_failed = parse_job is not None and parse_job.status == AnalysisJob.STATUS_FAILED
+    done = counts.get(AnalysisJob.STATUS_DONE, 0)
+    failed = counts.get(AnalysisJob.STATUS_FAILED, 0) + (waiting if parse_failed else 0)
+    return {
+        "total": total,
+        "done": done,
+        "failed": failed,
+        "running": counts.get(AnalysisJob.STATUS_RUNNING, 0),
+        "queued": counts.get(AnalysisJob.STATUS_QUEUED, 0) + (0 if parse_failed else waiting),
+        "finished": done + failed >= total,
+        "percent": round((done + failed) / total * 100, 1) if total else 100.0,
+    }
+
+
+def ranked_results(batch, limit=None):
+    """Completed analyses of the batch, best overall match first."""
+    analyses = (
+        batch.analyses.filter(jobs__kind=AnalysisJob.KIND_ANALYZE, jobs__status=AnalysisJob.STATUS_DONE)
+        .order_by('-overall_match_score', 'id')
+        .distinct()
+    )
+    if limit:
+        analyses = analyses[:limit]
+
+    rows = []
+    for rank, analysis in enumerate(analyses, start=1):
+        resume = analysis.parsed_resume_data or {}
+        rows.append({
+            "rank": rank,
+            "analysis_id": analysis.pk,
+            "file": os.path.basename(analysis.resume_file.name),
+            "candidate": resume.get("full_name", ""),
+            "overall_match_score": analysis.overall_match_score,
+            "Skill_Match": analysis.section_match_score.get("Skill_Match"),
+            "Impact_Score": analysis.section_match_score.get("Impact_Score"),
+            "missing_keywords": analysis.missing_keywords,
+        })
+    return rows
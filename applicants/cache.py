@@ -0,0 +1,154 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ParsedResumeCache, CacheStat, JobDescription
+from utils.resume_parser import PARSER_VERSION
+from utils.resume_analysis import JD_PARSER_VERSION, JobDescriptionSchema, parse_job_description
+from utils.skill_index import get_skill_index
+
+RESUME_CACHE = 'parsed_resume'
+JOB_DESCRIPTION_CACHE = 'job_description'
+
+
+# --- 1. Counters ---
+
+def record_cache_access(name, hit):
+    field = 'hits' if hit else 'misses'
+    updated = CacheStat.objects.filter(name=name).update(**{field: F(field) + 1})
+    if not updated:
+        CacheStat.objects.get_or_create(name=name)
+        CacheStat.objects.filter(name=name).update(**{field: F(field) + 1})
+
+
+# --- 2. Parsed Resume Cache ---
+
+def file_sha256(file_field, chunk_size=64 * 1024):
+    """Hashes an uploaded file in chunks so large PDFs are never fully loaded in memory."""
+    digest = hashlib.sha256()
+    file_field.open('rb')
+    try:
+        for chunk in file_field.chunks(chunk_size):
+            digest.update(chunk)
+    finally:
+        file_field.close()
+    return digest.hexdigest()
+
+
+def get_cached_resume(file_hash):
+    """Returns the cached parse for this PDF hash, or None on a miss."""
+    entry = (
+        ParsedResumeCache.objects.filter(file_hash=file_hash, parser_version=PARSER_VERSION)
+        .only('id', 'parsed_data')
+        .first()
+    )
+    record_cache_access(RESUME_CACHE, hit=entry is not None)
+    if entry is None:
+        return None
+
+    ParsedResumeCache.objects.filter(pk=entry.pk).update(
+        hit_count=F('hit_count') + 1, last_used_at=timezone.now()
+    )
+    return entry.parsed_data
+
+
+def store_parsed_resume(file_hash, parsed_data):
+    size_bytes = len(json.dumps(parsed_data).encode('utf-8'))
+    try:
+        ParsedResumeCache.objects.create(
+            file_hash=file_hash,
+            parser_version=PARSER_VERSION,
+            parsed_data=parsed_data,
+            size_bytes=size_bytes,
+        )
+    except IntegrityError:
+        # Another worker parsed the same file concurrently
+        return
+    evict_resume_cache()
+
+
+def evict_resume_cache(max_bytes=None, max_age_days=None):
+    """
+    Eviction policy:
+    1. Drop entries produced by an older parser version.
+    2. Drop entries not used for `max_age_days`.
+    3. While the cache is above `max_bytes`, drop the least recently used entries.
+    Returns the number of deleted entries.
+    """
+    if max_bytes is None:
+        max_bytes = settings.RESUME_CACHE_MAX_BYTES
+    if max_age_days is None:
+        max_age_days = settings.RESUME_CACHE_MAX_AGE_DAYS
+
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    deleted, _ = ParsedResumeCache.objects.exclude(parser_version=PARSER_VERSION).delete()
+    deleted += ParsedResumeCache.objects.filter(last_used_at__lt=cutoff).delete()[0]
+
+    total = ParsedResumeCache.objects.aggregate(total=Sum('size_bytes'))['total'] or 0
+    if total <= max_bytes:
+        return deleted
+
+    to_free = total - max_bytes
+    victims = []
+    for entry_id, size in ParsedResumeCache.objects.order_by('last_used_at').values_list('id', 'size_bytes').iterator():
+        if to_free <= 0:
+            break
+        victims.append(entry_id)
+        to_free -= size
+    deleted += ParsedResumeCache.objects.filter(id__in=victims).delete()[0]
+    return deleted
+
+
+# --- 3. Shared Job Description Parse ---
+
+def job_description_is_parsed(job_posting):
+    """True if the JD has a parse from the current parser."""
+    return job_posting.parsed_data is not None and job_posting.parser_version == JD_PARSER_VERSION
+
+
+def get_cached_job_description(job_posting):
+    """Returns the stored JobDescriptionSchema, or None if the JD was never parsed by the current parser."""
+    hit = job_description_is_parsed(job_posting)
+    record_cache_access(JOB_DESCRIPTION_CACHE, hit=hit)
+    return JobDescriptionSchema(**job_posting.parsed_data) if hit else None
+
+
+def store_parsed_job_description(job_posting, parsed_jd):
+    job_posting.parsed_data = parsed_jd.model_dump()
+    job_posting.parser_version = JD_PARSER_VERSION
+    JobDescription.objects.filter(pk=job_posting.pk).update(
+        parsed_data=job_posting.parsed_data, parser_version=JD_PARSER_VERSION
+    )
+
+
+def get_parsed_job_description(job_posting):
+    """
+    Returns the JobDescriptionSchema for a JobDescription row.
+    The LLM parse runs once per distinct JD (and again only when the JD parser changes).
+    """
+    parsed_jd = get_cached_job_description(job_posting)
+    if parsed_jd is None:
+        parsed_jd = parse_job_description(job_posting.text)
+        store_parsed_job_description(job_posting, parsed_jd)
+    return parsed_jd
+
+
+def update_job_requirements(job_posting, required_skills=None, nice_to_have=None):
+    """
+    Edits the parsed requirement lists of a JD in place (e.g. a recruiter fixing the parse).
+    Skills are canonicalized like a fresh parse. Returns the updated JobDescriptionSchema;
+    existing analyses pick up the change with `rescore_analyses`.
+    """
+    parsed_jd = get_parsed_job_description(job_posting)
+    index = get_skill_index()
+    if required_skills is not None:
+        parsed_jd.required_skills = index.normalize_list(required_skills)
+    if nice_to_have is not None:
+        parsed_jd.nice_to_have = index.normalize_list(nice_to_have)
+    store_parsed_job_description(job_posting, parsed_jd)
+    return parsed_jd
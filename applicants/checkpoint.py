@@ -0,0 +1,226 @@
+"""
+LangGraph checkpointer on the project database, so interview state survives between
+requests (and processes) without being rebuilt from the transcript on every turn.
+
+Each interview session is one thread (`interview_thread_config`). A turn loads only the
+latest checkpoint of its thread, applies the new candidate message and saves the result.
+Checkpoints hold the channel values inline; the message window inside them is bounded by
+the interview memory, and only the last INTERVIEW_CHECKPOINTS_KEPT per thread are kept,
+so the work per turn does not grow with the length of the interview.
+"""
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_serializable_checkpoint_metadata,
+)
+
+from .models import GraphCheckpoint, GraphCheckpointWrite
+
+
+def interview_thread_id(session):
+    return f"interview-{session.pk}"
+
+
+def interview_thread_config(session):
+    return {"configurable": {"thread_id": interview_thread_id(session)}}
+
+
+class DjangoCheckpointSaver(BaseCheckpointSaver):
+    """
+    BaseCheckpointSaver backed by the GraphCheckpoint / GraphCheckpointWrite tables.
+    The async methods run the ORM calls in a thread (sync_to_async).
+    """
+
+    def __init__(self, *, serde=None, keep_last=None):
+        super().__init__(serde=serde)
+        self.keep_last = settings.INTERVIEW_CHECKPOINTS_KEPT if keep_last is None else keep_last
+
+    # --- Reading ---
+
+    def _to_tuple(self, row):
+        writes = GraphCheckpointWrite.objects.filter(
+            thread_id=row.thread_id, checkpoint_ns=row.checkpoint_ns, checkpoint_id=row.checkpoint_id
+        ).order_by('task_path', 'task_id', 'idx')
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": row.thread_id,
+                "checkpoint_ns": row.checkpoint_ns,
+                "checkpoint_id": row.checkpoint_id,
+            }},
+            checkpoint=self.serde.loads_typed((row.type, bytes(row.checkpoint))),
+            metadata=row.metadata,
+            parent_config=(
+                {"configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.parent_checkpoint_id,
+                }}
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.type, bytes(write.value))))
+                for write in writes
+            ],
+        )
+
+    def get_tuple(self, config):
+        """The checkpoint named by `checkpoint_id`, or else the latest one of the thread."""
+        configurable = config["configurable"]
+        rows = GraphCheckpoint.objects.filter(
+            thread_id=configurable["thread_id"], checkpoint_ns=configurable.get("checkpoint_ns", "")
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            rows = rows.filter(checkpoint_id=checkpoint_id)
+        row = rows.order_by('-checkpoint_id').first()
+        return self._to_tuple(row) if row else None
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        """Checkpoints newest first, optionally filtered by thread, metadata and `before`."""
+        rows = GraphCheckpoint.objects.order_by('-checkpoint_id')
+        if config:
+            configurable = config["configurable"]
+            rows = rows.filter(thread_id=configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                rows = rows.filter(checkpoint_ns=configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                rows = rows.filter(checkpoint_id=checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            rows = rows.filter(checkpoint_id__lt=before_id)
+
+        for row in rows.iterator():
+            if filter and not all(row.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield self._to_tuple(row)
+
+    # --- Writing ---
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, data = self.serde.dumps_typed(checkpoint)
+
+        # One INSERT ... ON CONFLICT statement: LangGraph saves from several threads, and a
+        # read-then-write transaction would deadlock them on SQLite
+        GraphCheckpoint.objects.bulk_create(
+            [GraphCheckpoint(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=configurable.get("checkpoint_id") or '',
+                type=type_,
+                checkpoint=data,
+                metadata=get_serializable_checkpoint_metadata(config, metadata),
+            )],
+            update_conflicts=True,
+            unique_fields=['thread_id', 'checkpoint_ns', 'checkpoint_id'],
+            update_fields=['parent_checkpoint_id', 'type', 'checkpoint', 'metadata'],
+        )
+        self._prune(thread_id, checkpoint_ns)
+        return {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+        }}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        configurable = config["configurable"]
+        key = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": configurable["checkpoint_id"],
+            "task_id": task_id,
+        }
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append(GraphCheckpointWrite(
+                **key, task_path=task_path, idx=WRITES_IDX_MAP.get(channel, idx),
+                channel=channel, type=type_, value=data,
+            ))
+
+        # Special writes (errors, interrupts) replace the previous one; regular writes are kept
+        if all(channel in WRITES_IDX_MAP for channel, _ in writes):
+            GraphCheckpointWrite.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'],
+                update_fields=['task_path', 'channel', 'type', 'value'],
+            )
+        else:
+            GraphCheckpointWrite.objects.bulk_create(rows, ignore_conflicts=True)
+
+    def _prune(self, thread_id, checkpoint_ns):
+        """Deletes all but the `keep_last` newest checkpoints of the thread, with their writes."""
+        if not self.keep_last:
+            return
+        checkpoints = GraphCheckpoint.objects.filter(thread_id=thread_id, checkpoint_ns=checkpoint_ns)
+        oldest_kept = checkpoints.order_by('-checkpoint_id').values_list('checkpoint_id', flat=True)[
+            self.keep_last - 1:self.keep_last
+        ]
+        if not oldest_kept:
+            return
+        checkpoints.filter(checkpoint_id__lt=oldest_kept[0]).delete()
+        GraphCheckpointWrite.objects.filter(
+            thread_id=thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id__lt=oldest_kept[0]
+        ).delete()
+
+    def delete_thread(self, thread_id):
+        GraphCheckpoint.objects.filter(thread_id=thread_id).delete()
+        GraphCheckpointWrite.objects.filter(thread_id=thread_id).delete()
+
+    # --- Async ---
+
+    async def aget_tuple(self, config):
+        return await sync_to_async(self.get_tuple)(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        tuples = await sync_to_async(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))()
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await sync_to_async(self.put)(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await sync_to_async(self.put_writes)(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await sync_to_async(self.delete_thread)(thread_id)
+
+
+@lru_cache(maxsize=1)
+def get_interview_checkpointer():
+    return DjangoCheckpointSaver()
+
+
+@lru_cache(maxsize=1)
+def get_persistent_interview_graph():
+    """
+    Process-wide interview graph compiled with the database checkpointer. Invoke it with
+    interview_thread_config(session); the state of each session lives in its own thread.
+    """
+    from utils.interview_agent import build_interview_graph
+
+    return build_interview_graph(checkpointer=get_interview_checkpointer())
+
+
+async def ainterview_thread_started(session):
+    """
+    True once a run on the session's thread got past its input step. A first run that
+    failed only leaves its input checkpoint (step -1) behind, so the thread must be seeded again.
+    """
+    return await GraphCheckpoint.objects.filter(
+        thread_id=interview_thread_id(session), metadata__step__gte=0
+    ).aexists()
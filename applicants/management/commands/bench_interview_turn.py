@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from utils.candidate_brief import build_candidate_brief
+from utils.interview_agent import build_interview_graph
+
+
+SAMPLE_BRIEF = build_candidate_brief({
+    "full_name": "Jane Doe",
+    "work_experience": [
+        {"role": "Software Engineer", "company": "Acme", "technologies": ["Python", "Django", "Redis"],
+         "key_achievements": ["Reduced API latency by 40%", "Led migration to PostgreSQL"]},
+    ],
+    "projects": [
+        {"name": "Resume Analyzer", "description": "LLM powered resume screening",
+         "technologies": ["LangGraph", "Django"]},
+    ],
+})
+
+SAMPLE_STATE = {
+    "full_name": SAMPLE_BRIEF["full_name"],
+    "job_description": "Backend Engineer (Python, Django, PostgreSQL, AWS). 3+ years of experience.",
+    "workexperience": SAMPLE_BRIEF["workexperience"],
+    "projects": SAMPLE_BRIEF["projects"],
+}
+
+
+class Command(BaseCommand):
+    help = "Measures the per-turn CPU overhead of the interview graph, using a fake LLM (no network)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--turns', type=int, default=200)
+        parser.add_argument('--history', type=int, default=6, help="Messages already in the conversation")
+
+    def handle(self, *args, **options):
+        turns, history = options['turns'], options['history']
+        fake_llm = FakeListChatModel(responses=["Okay. Tell me more about that."])
+        messages = [
+            (HumanMessage if i % 2 == 0 else AIMessage)(content=f"Message {i} about Django and Redis.")
+            for i in range(history)
+        ] + [HumanMessage(content="I used Redis to cache sessions.")]
+        state = {**SAMPLE_STATE, "messages": messages}
+
+        # Warm up imports and lazy initialisation outside the measurement (fake LLM only:
+        # the shared chains would build the provider client, which needs an API key)
+        build_interview_graph(fake_llm).invoke(state)
+
+        def measure(label, turn):
+            start_cpu, start_wall = time.process_time(), time.perf_counter()
+            for _ in range(turns):
+                turn()
+            cpu_ms = (time.process_time() - start_cpu) / turns * 1000
+            wall_ms = (time.perf_counter() - start_wall) / turns * 1000
+            self.stdout.write(f"{label:<34} {cpu_ms:8.3f} ms CPU   {wall_ms:8.3f} ms wall")
+            return cpu_ms
+
+        self.stdout.write(f"{turns} turns, {len(messages)} messages in state\n")
+        llm_only = measure("LLM call only (fake)", lambda: fake_llm.invoke(messages))
+        rebuilt = measure("Rebuild + compile every turn", lambda: build_interview_graph(fake_llm).invoke(state))
+        shared_graph = build_interview_graph(fake_llm)
+        shared = measure("Compiled once per process", lambda: shared_graph.invoke(state))
+
+        self.stdout.write("")
+        self.stdout.write(f"Graph overhead per turn: {rebuilt - llm_only:.3f} ms -> {shared - llm_only:.3f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {rebuilt / shared:.1f}x"))
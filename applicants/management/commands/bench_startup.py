@@ -0,0 +1,105 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Packages that should only load on first use (PDF extraction, LLM calls, interview turns)
+HEAVY_PACKAGES = ['langchain_groq', 'langchain_community', 'langgraph', 'langchain_core', 'pdfplumber', 'numpy', 'pydantic']
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Runs in a fresh interpreter: Django setup, then the first request (URLconf and view imports
+# included), then the first interview turn's imports and graph compilation
+FIRST_REQUEST_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+
+from django.test import Client
+from django.test.utils import setup_test_environment
+setup_test_environment()
+response = Client().get(sys.argv[1])
+request_done = time.perf_counter()
+
+from applicants.checkpoint import get_persistent_interview_graph
+get_persistent_interview_graph()
+interview_done = time.perf_counter()
+
+print(response.status_code, setup_done - started, request_done - setup_done, interview_done - request_done)
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures startup cost with `python -X importtime manage.py check` and the latency of "
+        "the first request in a fresh process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help="Fresh processes per measurement")
+        parser.add_argument('--top', type=int, default=15, help="Slowest imports to list")
+        parser.add_argument('--path', default='/accounts/login/', help="URL of the first request")
+
+    def _run(self, *args):
+        env = os.environ.copy()
+        # Compiling the interview graph builds the Groq client, which refuses to start without a
+        # key; nothing is sent to the provider, so a placeholder keeps the benchmark offline
+        env.setdefault('GROQ_API_KEY', 'bench-startup-placeholder')
+        result = subprocess.run(
+            [sys.executable, *args], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            self.stderr.write(result.stderr[-2000:])
+            raise SystemExit(result.returncode)
+        return result
+
+    def handle(self, *args, **options):
+        repeat, top = options['repeat'], options['top']
+        manage = str(settings.BASE_DIR / 'manage.py')
+
+        # 1. manage.py check, with per-module import times
+        imports = {}
+        wall = []
+        for _ in range(repeat):
+            result = self._run('-X', 'importtime', manage, 'check')
+            for line in result.stderr.splitlines():
+                match = IMPORTTIME_LINE.match(line)
+                if match:
+                    imports[match.group(4)] = (int(match.group(2)) / 1000, len(match.group(3)) // 2)
+            # Wall time without the -X importtime overhead
+            started = time.perf_counter()
+            self._run(manage, 'check')
+            wall.append((time.perf_counter() - started) * 1000)
+
+        roots = sum(ms for ms, depth in imports.values() if depth == 0)
+        self.stdout.write(f"manage.py check: {statistics.median(wall):.0f} ms wall (median of {repeat}), "
+                          f"{roots:.0f} ms in imports, {len(imports)} modules")
+        self.stdout.write("\nHeavy packages at startup:")
+        for package in HEAVY_PACKAGES:
+            loaded = imports.get(package)
+            status = f"loaded ({loaded[0]:.0f} ms)" if loaded else "not loaded"
+            self.stdout.write(f"  {package:<22} {status}")
+
+        self.stdout.write("\nSlowest imports (cumulative):")
+        for name, (ms, depth) in sorted(imports.items(), key=lambda item: -item[1][0])[:top]:
+            self.stdout.write(f"  {ms:8.1f} ms  {'  ' * depth}{name}")
+
+        # 2. First request and first interview turn in a fresh process
+        runs = []
+        for _ in range(repeat):
+            status, *timings = self._run('-c', FIRST_REQUEST_SCRIPT, options['path']).stdout.split()
+            runs.append([float(seconds) * 1000 for seconds in timings])
+        setup_ms, request_ms, interview_ms = (statistics.median(column) for column in zip(*runs))
+
+        self.stdout.write(f"\nFresh process, median of {repeat}:")
+        self.stdout.write(f"  django.setup()                    {setup_ms:8.1f} ms")
+        self.stdout.write(f"  first request {options['path']:<19} {request_ms:8.1f} ms (HTTP {status})")
+        self.stdout.write(f"  first interview turn imports      {interview_ms:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Time to first response: {setup_ms + request_ms:.0f} ms"))
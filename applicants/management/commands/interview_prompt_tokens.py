@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from langchain_core.prompts import ChatPromptTemplate
+
+from applicants.models import ResumeAnalysis
+from utils.candidate_brief import build_candidate_brief, count_text_tokens
+from utils.interview_agent import system_prompt_dsa, system_prompt_feedback, system_prompt_hr
+
+AGENT_PROMPTS = {
+    "hr_agent": system_prompt_hr,
+    "technical_agent": system_prompt_dsa,
+    "feedback_agent": system_prompt_feedback,
+}
+
+
+def _prompt_tokens(system_prompt, values):
+    rendered = ChatPromptTemplate.from_messages([("system", system_prompt)]).format_messages(**values)
+    return count_text_tokens(rendered[0].content)
+
+
+class Command(BaseCommand):
+    help = "Compares interview system prompt sizes: raw parsed resume dicts vs the compact candidate brief."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analysis', type=int, metavar='ID', help="Only this analysis")
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        analyses = ResumeAnalysis.objects.select_related('job_posting').exclude(parsed_resume_data=None).order_by('-id')
+        if options['analysis']:
+            analyses = analyses.filter(id=options['analysis'])
+        analyses = list(analyses[:options['limit']])
+        if not analyses:
+            raise CommandError("No analyses with a parsed resume found.")
+
+        totals = {name: [0, 0] for name in AGENT_PROMPTS}
+        self.stdout.write(f"{'analysis':>8}  {'agent':<16} {'raw repr':>9} {'brief':>7} {'saved':>7}")
+        for analysis in analyses:
+            resume = analysis.parsed_resume_data or {}
+            brief = build_candidate_brief(resume)
+            raw_values = {
+                "job_description": analysis.job_description,
+                "full_name": resume.get("full_name", "Candidate"),
+                "workexperience": resume.get("work_experience", []),
+                "projects": resume.get("projects", []),
+            }
+            brief_values = {**raw_values, "workexperience": brief["workexperience"], "projects": brief["projects"]}
+
+            for name, system_prompt in AGENT_PROMPTS.items():
+                old = _prompt_tokens(system_prompt, raw_values)
+                new = _prompt_tokens(system_prompt, brief_values)
+                totals[name][0] += old
+                totals[name][1] += new
+                self.stdout.write(f"{analysis.pk:>8}  {name:<16} {old:>9} {new:>7} {old - new:>7}")
+
+        self.stdout.write("")
+        count = len(analyses)
+        for name, (old, new) in totals.items():
+            saved = (old - new) / old if old else 0.0
+            self.stdout.write(self.style.SUCCESS(
+                f"{name:<16} avg {old / count:8.0f} -> {new / count:6.0f} tokens per turn ({saved:.0%} smaller)"
+            ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from utils.llm_governor import PRIORITY_BATCH, PRIORITY_CHAT, PRIORITY_INTERACTIVE, get_llm_governor
+
+PRIORITY_NAMES = {PRIORITY_CHAT: "chat", PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+
+class Command(BaseCommand):
+    help = "Shows the LLM rate budgets, queue depth and wait times per priority."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Clear the call and wait-time counters")
+
+    def handle(self, *args, **options):
+        governor = get_llm_governor()
+        if governor is None:
+            self.stdout.write("Rate governor disabled (LLM_RPM_LIMIT and LLM_TPM_LIMIT are 0).")
+            return
+        if options['reset']:
+            governor.reset_metrics()
+            self.stdout.write("Counters cleared.")
+
+        metrics = governor.metrics()
+        for name, budget in metrics["budgets"].items():
+            self.stdout.write(f"{name.upper()}: {budget['available']:.0f} of {budget['limit_per_minute']:.0f} available")
+
+        self.stdout.write(f"\n{'priority':<14}{'queued':>8}{'calls':>8}{'waited':>8}{'avg wait':>12}{'max wait':>12}{'tokens':>10}")
+        for priority in sorted(metrics["queue_depth"], reverse=True):
+            stats = metrics["priorities"].get(priority, {})
+            self.stdout.write(
+                f"{PRIORITY_NAMES.get(priority, priority):<14}{metrics['queue_depth'][priority]:>8}"
+                f"{stats.get('calls', 0):>8}{stats.get('waited_calls', 0):>8}"
+                f"{stats.get('avg_wait_ms', 0.0):>9.1f} ms{stats.get('max_wait_ms', 0.0):>9.1f} ms{stats.get('tokens', 0):>10}"
+            )
@@ -0,0 +1,132 @@
+import csv
+import multiprocessing
+import os
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from applicants.batch import (
+    BatchUploadError, batch_progress, create_batch, iter_directory_resumes, iter_zip_resumes,
+    ranked_results, resume_batch,
+)
+from applicants.models import AnalysisBatch
+from .run_workers import worker_main
+
+
+class Command(BaseCommand):
+    help = "Ranks a ZIP or directory of resumes against one job description, using a local worker pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', nargs='?', help="ZIP archive or directory of PDF resumes")
+        parser.add_argument('--jd-file', help="Text file containing the job description")
+        parser.add_argument('--title', default='', help="Job title for the batch")
+        parser.add_argument('--user', help="Email of the recruiter that owns the batch")
+        parser.add_argument('--resume-batch', type=int, metavar='ID', help="Continue an interrupted batch instead of creating one")
+        parser.add_argument('--retry-failed', action='store_true', help="With --resume-batch, retry failed analyses too")
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--poll-interval', type=float, default=settings.ANALYSIS_WORKER_POLL_INTERVAL)
+        parser.add_argument('--top', type=int, default=20, help="Number of ranked candidates to print")
+        parser.add_argument('--csv', help="Write the full ranking to this CSV file")
+
+    def handle(self, *args, **options):
+        batch = self._get_or_create_batch(options)
+        self.stdout.write(f"Batch #{batch.pk}: {batch.analyses.count()} resume(s) for '{batch.job_title}'.")
+
+        if not batch_progress(batch)['finished']:
+            self._run_until_finished(batch, options)
+
+        self._report(batch, options)
+
+    def _get_or_create_batch(self, options):
+        if options['resume_batch']:
+            try:
+                batch = AnalysisBatch.objects.get(pk=options['resume_batch'])
+            except AnalysisBatch.DoesNotExist:
+                raise CommandError(f"Batch {options['resume_batch']} does not exist.")
+            requeued = resume_batch(batch, retry_failed=options['retry_failed'])
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} job(s).")
+            return batch
+
+        source, jd_file = options['source'], options['jd_file']
+        if not source or not jd_file:
+            raise CommandError("A resume source and --jd-file are required (or use --resume-batch).")
+        if not options['user']:
+            raise CommandError("--user is required to create a batch.")
+
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}.")
+        with open(jd_file, encoding='utf-8') as f:
+            job_description = f.read()
+
+        try:
+            if os.path.isdir(source):
+                resumes = iter_directory_resumes(source)
+            else:
+                resumes = iter_zip_resumes(source)
+            return create_batch(user, options['title'] or os.path.basename(jd_file), job_description,
+                                resumes, source_name=os.path.basename(source.rstrip('/')))
+        except BatchUploadError as e:
+            raise CommandError(str(e))
+
+    def _run_until_finished(self, batch, options):
+        # Children open their own DB connections
+        connections.close_all()
+        ctx = multiprocessing.get_context('spawn')
+        # Not daemonic: each worker owns a pool of PDF extraction processes
+        workers = [
+            ctx.Process(target=worker_main, args=(i, options['poll_interval']))
+            for i in range(max(1, options['processes']))
+        ]
+        for proc in workers:
+            proc.start()
+
+        started = time.monotonic()
+        try:
+            while True:
+                progress = batch_progress(batch)
+                elapsed = time.monotonic() - started
+                sys.stdout.write(
+                    f"\r{progress['done']}/{progress['total']} done, {progress['failed']} failed, "
+                    f"{progress['running']} running ({progress['percent']}%, {elapsed:.0f}s)"
+                )
+                sys.stdout.flush()
+                if progress['finished']:
+                    break
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stdout.write(f"\nInterrupted. Continue later with --resume-batch {batch.pk}.")
+        finally:
+            self.stdout.write("")
+            for proc in workers:
+                proc.terminate()
+            for proc in workers:
+                proc.join()
+
+    def _report(self, batch, options):
+        progress = batch_progress(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f"{progress['done']} analyzed, {progress['failed']} failed, {progress['total']} total."
+        ))
+
+        if options['csv']:
+            rows = ranked_results(batch)
+            fields = ['rank', 'analysis_id', 'file', 'candidate', 'overall_match_score',
+                      'Skill_Match', 'Impact_Score', 'missing_keywords']
+            with open(options['csv'], 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow({**row, 'missing_keywords': '; '.join(row['missing_keywords'] or [])})
+            self.stdout.write(f"Wrote {len(rows)} row(s) to {options['csv']}.")
+
+        for row in ranked_results(batch, limit=options['top']):
+            self.stdout.write(
+                f"{row['rank']:>4}. {row['overall_match_score']:>6}  {row['candidate'] or '-':<30} {row['file']}"
+            )
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from applicants.cache import update_job_requirements
+from applicants.models import JobDescription, ResumeAnalysis
+from applicants.scoring import rescore_analyses
+
+
+def _skill_list(value):
+    return [skill.strip() for skill in value.split(',') if skill.strip()]
+
+
+class Command(BaseCommand):
+    help = "Re-scores stored analyses with the current weights and JD requirements, reusing stored match results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job-posting', type=int, metavar='ID', help="Only analyses of this JobDescription")
+        parser.add_argument('--batch', type=int, metavar='ID', help="Only analyses of this recruiter batch")
+        parser.add_argument('--skill-weight', type=float, help="Override ANALYSIS_SCORE_WEIGHTS['skills']")
+        parser.add_argument('--impact-weight', type=float, help="Override ANALYSIS_SCORE_WEIGHTS['impact']")
+        parser.add_argument('--requirements', help="With --job-posting: replace the required skills (comma separated)")
+        parser.add_argument('--no-llm', action='store_true', help="Never call the LLM; unresolved requirements count as missing")
+
+    def handle(self, *args, **options):
+        analyses = ResumeAnalysis.objects.all()
+        if options['job_posting']:
+            analyses = analyses.filter(job_posting_id=options['job_posting'])
+        if options['batch']:
+            analyses = analyses.filter(batch_id=options['batch'])
+
+        if options['requirements'] is not None:
+            if not options['job_posting']:
+                raise CommandError("--requirements needs --job-posting.")
+            try:
+                job_posting = JobDescription.objects.get(pk=options['job_posting'])
+            except JobDescription.DoesNotExist:
+                raise CommandError(f"JobDescription {options['job_posting']} does not exist.")
+            parsed_jd = update_job_requirements(job_posting, required_skills=_skill_list(options['requirements']))
+            self.stdout.write(f"Required skills: {parsed_jd.required_skills}")
+
+        weights = dict(settings.ANALYSIS_SCORE_WEIGHTS)
+        if options['skill_weight'] is not None:
+            weights['skills'] = options['skill_weight']
+        if options['impact_weight'] is not None:
+            weights['impact'] = options['impact_weight']
+
+        stats = rescore_analyses(analyses, weights=weights, llm_fallback=not options['no_llm'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-scored {stats['scored']} analys{'i' if stats['scored'] == 1 else 'e'}s "
+            f"({stats['rematched_requirements']} requirement match(es) recomputed, {stats['skipped']} skipped, "
+            f"{stats['unlocked']} interview(s) unlocked)."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+from applicants.cache import RESUME_CACHE, evict_resume_cache
+from applicants.models import CacheStat, ParsedResumeCache
+
+
+class Command(BaseCommand):
+    help = "Shows parsed resume cache statistics and optionally runs eviction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help="Apply the size/age eviction policy")
+        parser.add_argument('--max-bytes', type=int, default=None)
+        parser.add_argument('--max-age-days', type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options['evict']:
+            deleted = evict_resume_cache(max_bytes=options['max_bytes'], max_age_days=options['max_age_days'])
+            self.stdout.write(f"Evicted {deleted} entr{'y' if deleted == 1 else 'ies'}.")
+
+        totals = ParsedResumeCache.objects.aggregate(entries=Count('id'), size=Sum('size_bytes'))
+        stat = CacheStat.objects.filter(name=RESUME_CACHE).first() or CacheStat(name=RESUME_CACHE)
+
+        self.stdout.write(f"Entries:  {totals['entries']}")
+        self.stdout.write(f"Size:     {(totals['size'] or 0) / 1024:.1f} KiB")
+        self.stdout.write(f"Hits:     {stat.hits}")
+        self.stdout.write(f"Misses:   {stat.misses}")
+        self.stdout.write(f"Hit rate: {stat.hit_rate:.1%}")
@@ -0,0 +1,59 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def worker_main(index, poll_interval):
+    """Entry point of each spawned worker process."""
+    import django
+    django.setup()
+
+    from applicants.task import default_worker_name, run_worker_loop
+
+    stop_event = multiprocessing.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    try:
+        run_worker_loop(default_worker_name(index), poll_interval=poll_interval, stop_event=stop_event)
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = "Starts a pool of worker processes that run queued resume analysis jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.ANALYSIS_WORKER_PROCESSES)
+        parser.add_argument('--poll-interval', type=float, default=settings.ANALYSIS_WORKER_POLL_INTERVAL)
+
+    def handle(self, *args, **options):
+        from applicants.task import requeue_stale_jobs
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        # Children open their own DB connections
+        connections.close_all()
+
+        ctx = multiprocessing.get_context('spawn')
+        # Not daemonic: each worker owns a pool of PDF extraction processes
+        workers = [
+            ctx.Process(target=worker_main, args=(i, options['poll_interval']))
+            for i in range(options['processes'])
+        ]
+        for proc in workers:
+            proc.start()
+        self.stdout.write(self.style.SUCCESS(f"Started {len(workers)} worker process(es). Press Ctrl+C to stop."))
+
+        try:
+            for proc in workers:
+                proc.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping workers...")
+            for proc in workers:
+                proc.terminate()
+            for proc in workers:
+                proc.join()
@@ -0,0 +1,98 @@
+import hashlib
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+def normalize_job_description(text):
+    """Collapses whitespace and case so trivially different copies of a JD share one row."""
+    return " ".join(text.split()).casefold()
+
+
+def job_description_hash(text):
+    return hashlib.sha256(normalize_job_description(text).encode("utf-8")).hexdigest()
+
+
+class JobDescriptionManager(models.Manager):
+    def get_or_create_from_text(self, text):
+        text_hash = job_description_hash(text)
+        try:
+            job_posting, _ = self.get_or_create(text_hash=text_hash, defaults={"text": text.strip()})
+        except IntegrityError:
+            # Two uploads of the same JD raced on the unique hash
+            job_posting = self.get(text_hash=text_hash)
+        return job_posting
+
+
+class InterviewSessionManager(models.Manager):
+    def acquire_turn(self, session, turn_id, ttl_seconds):
+        """
+        Takes the session's turn lock for `turn_id`, so only one request per session runs a
+        turn at a time. One conditional UPDATE (free or expired -> ours), like claiming a job;
+        the expiry frees the session again if the process holding it dies. Returns True if taken.
+        """
+        now = timezone.now()
+        return bool(
+            self.filter(pk=session.pk)
+            .filter(Q(active_turn_id='') | Q(turn_lock_expires__lt=now))
+            .update(active_turn_id=turn_id, turn_lock_expires=now + timedelta(seconds=ttl_seconds))
+        )
+
+    async def aacquire_turn(self, session, turn_id, ttl_seconds):
+        return await sync_to_async(self.acquire_turn)(session, turn_id, ttl_seconds)
+
+    def renew_turn(self, session, turn_id, ttl_seconds):
+        """
+        Extends the lock held by `turn_id` to `ttl_seconds` from now, before a long step of the
+        turn (an LLM call). Returns False if the lock expired and another turn has taken it.
+        """
+        return bool(
+            self.filter(pk=session.pk, active_turn_id=turn_id)
+            .update(turn_lock_expires=timezone.now() + timedelta(seconds=ttl_seconds))
+        )
+
+    async def arenew_turn(self, session, turn_id, ttl_seconds):
+        return await sync_to_async(self.renew_turn)(session, turn_id, ttl_seconds)
+
+    def release_turn(self, session, turn_id):
+        """Releases the lock, unless it expired and another turn has taken it since."""
+        self.filter(pk=session.pk, active_turn_id=turn_id).update(active_turn_id='', turn_lock_expires=None)
+
+    async def arelease_turn(self, session, turn_id):
+        return await sync_to_async(self.release_turn)(session, turn_id)
+
+
+class InterviewMessageManager(models.Manager):
+    def append(self, session, messages):
+        """
+        Appends messages (dicts of role, content, token_count, latency_ms, turn_id) to the end of the
+        session's transcript in a single insert. The sequence numbers are reserved with one
+        conditional UPDATE on the session's counter, which row-locks it until the insert
+        commits, so concurrent turns get distinct, gap-free ranges and nothing is lost.
+        """
+        sessions = type(session).objects.filter(pk=session.pk)
+        with transaction.atomic():
+            sessions.update(last_message_seq=F('last_message_seq') + len(messages))
+            last_seq = sessions.values_list('last_message_seq', flat=True).get()
+            first_seq = last_seq - len(messages) + 1
+            rows = [
+                self.model(session=session, seq=first_seq + offset, **message)
+                for offset, message in enumerate(messages)
+            ]
+            created = self.bulk_create(rows)
+        session.last_message_seq = last_seq
+        return created
+
+    async def aappend(self, session, messages):
+        return await sync_to_async(self.append)(session, messages)
+
+    async def areply_for(self, session, turn_id):
+        """The stored interviewer reply to the client turn `turn_id`, or None if it has not been answered."""
+        return await self.filter(session=session, turn_id=turn_id, role=self.model.ROLE_AI).afirst()
+
+    def window(self, session, after_seq=0):
+        """Messages after `after_seq`, oldest first (the part of the transcript not yet summarized)."""
+        return self.filter(session=session, seq__gt=after_seq).order_by('seq')
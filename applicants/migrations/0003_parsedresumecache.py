@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0002_analysisjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('hits', models.PositiveBigIntegerField(default=0)),
+                ('misses', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ParsedResumeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(max_length=64)),
+                ('parser_version', models.CharField(max_length=32)),
+                ('parsed_data', models.JSONField()),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='applicants__last_us_98e42a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('file_hash', 'parser_version'), name='unique_parsed_resume_version')],
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:33
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _text_hash(text):
+    return hashlib.sha256(" ".join(text.split()).casefold().encode("utf-8")).hexdigest()
+
+
+def move_job_descriptions(apps, schema_editor):
+    JobDescription = apps.get_model('applicants', 'JobDescription')
+    ResumeAnalysis = apps.get_model('applicants', 'ResumeAnalysis')
+    for analysis in ResumeAnalysis.objects.all().only('id', 'job_description'):
+        job_posting, _ = JobDescription.objects.get_or_create(
+            text_hash=_text_hash(analysis.job_description),
+            defaults={'text': analysis.job_description.strip()},
+        )
+        ResumeAnalysis.objects.filter(pk=analysis.pk).update(job_posting=job_posting)
+
+
+def restore_job_descriptions(apps, schema_editor):
+    ResumeAnalysis = apps.get_model('applicants', 'ResumeAnalysis')
+    for analysis in ResumeAnalysis.objects.select_related('job_posting'):
+        ResumeAnalysis.objects.filter(pk=analysis.pk).update(job_description=analysis.job_posting.text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0003_parsedresumecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDescription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('parsed_data', models.JSONField(blank=True, null=True)),
+                ('parser_version', models.CharField(blank=True, default='', max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='job_posting',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='analyses', to='applicants.jobdescription'),
+        ),
+        migrations.RunPython(move_job_descriptions, restore_job_descriptions),
+        # Gives the column a default so the removal below can be reversed on populated tables
+        migrations.AlterField(
+            model_name='resumeanalysis',
+            name='job_description',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='resumeanalysis',
+            name='job_description',
+        ),
+        migrations.AlterField(
+            model_name='resumeanalysis',
+            name='job_posting',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='analyses', to='applicants.jobdescription'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0004_jobdescription'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_title', models.CharField(max_length=255)),
+                ('source_name', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='analysisjob',
+            name='applicants__status_2e4ff8_idx',
+        ),
+        migrations.AddField(
+            model_name='analysisjob',
+            name='priority',
+            field=models.SmallIntegerField(default=10),
+        ),
+        migrations.AddIndex(
+            model_name='analysisjob',
+            index=models.Index(fields=['status', '-priority', 'created_at'], name='applicants__status_28ce56_idx'),
+        ),
+        migrations.AddField(
+            model_name='analysisbatch',
+            name='job_posting',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='batches', to='applicants.jobdescription'),
+        ),
+        migrations.AddField(
+            model_name='analysisbatch',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analysis_batches', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='analyses', to='applicants.analysisbatch'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0005_analysisbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='impact_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='skill_details',
+            field=models.JSONField(default=list),
+        ),
+    ]
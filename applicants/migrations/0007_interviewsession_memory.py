@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0006_resumeanalysis_artifacts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='memory_summarized_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='memory_summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
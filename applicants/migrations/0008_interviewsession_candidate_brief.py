@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0007_interviewsession_memory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='candidate_brief',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
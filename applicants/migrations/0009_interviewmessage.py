@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _estimate_tokens(text):
+    # Same approximation as utils.interview_memory.count_tokens (~4 chars per token + overhead)
+    return len(text) // 4 + 3
+
+
+def move_chat_history(apps, schema_editor):
+    InterviewSession = apps.get_model('applicants', 'InterviewSession')
+    InterviewMessage = apps.get_model('applicants', 'InterviewMessage')
+    for session in InterviewSession.objects.all().only('id', 'chat_history'):
+        InterviewMessage.objects.bulk_create([
+            InterviewMessage(
+                session=session,
+                seq=seq,
+                role=msg.get('role', 'ai'),
+                content=msg.get('content', ''),
+                token_count=_estimate_tokens(msg.get('content', '')),
+            )
+            for seq, msg in enumerate(session.chat_history or [], start=1)
+        ])
+        InterviewSession.objects.filter(pk=session.pk).update(last_message_seq=len(session.chat_history or []))
+
+
+def restore_chat_history(apps, schema_editor):
+    InterviewSession = apps.get_model('applicants', 'InterviewSession')
+    InterviewMessage = apps.get_model('applicants', 'InterviewMessage')
+    for session in InterviewSession.objects.all().only('id'):
+        history = [
+            {'role': role, 'content': content}
+            for role, content in InterviewMessage.objects.filter(session=session).order_by('seq').values_list('role', 'content')
+        ]
+        InterviewSession.objects.filter(pk=session.pk).update(chat_history=history)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0008_interviewsession_candidate_brief'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('role', models.CharField(choices=[('user', 'Candidate'), ('ai', 'Interviewer')], max_length=10)),
+                ('content', models.TextField()),
+                ('token_count', models.PositiveIntegerField(default=0)),
+                ('latency_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='applicants.interviewsession')),
+            ],
+            options={
+                'ordering': ['seq'],
+                'constraints': [models.UniqueConstraint(fields=('session', 'seq'), name='unique_interview_message_seq')],
+            },
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='last_message_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(move_chat_history, restore_chat_history),
+        migrations.RemoveField(
+            model_name='interviewsession',
+            name='chat_history',
+        ),
+        # Same value: the count of summarized history entries is the seq of the last one
+        migrations.RenameField(
+            model_name='interviewsession',
+            old_name='memory_summarized_count',
+            new_name='memory_summarized_seq',
+        ),
+    ]
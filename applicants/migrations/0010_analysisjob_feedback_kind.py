@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0009_interviewmessage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysisjob',
+            name='kind',
+            field=models.CharField(choices=[('analyze_resume', 'Analyze Resume'), ('interview_feedback', 'Interview Feedback')], default='analyze_resume', max_length=50),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0011_graphcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewmessage',
+            name='turn_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='active_turn_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='turn_lock_expires',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='interviewmessage',
+            constraint=models.UniqueConstraint(condition=models.Q(('turn_id', ''), _negated=True), fields=('session', 'turn_id', 'role'), name='unique_interview_message_turn'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0013_analysisjob_greeting_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='needs_refinement',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0014_resumeanalysis_needs_refinement'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysisjob',
+            name='kind',
+            field=models.CharField(choices=[('analyze_resume', 'Analyze Resume'), ('interview_feedback', 'Interview Feedback'), ('interview_greeting', 'Interview Greeting'), ('refine_analysis', 'Refine Analysis')], default='analyze_resume', max_length=50),
+        ),
+    ]
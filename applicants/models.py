@@ -1,12 +1,48 @@
 from django.db import models
 from django.conf import settings  # <--- IMPORT SETTINGS INSTEAD OF USER
+from .manager import JobDescriptionManager, InterviewSessionManager, InterviewMessageManager
+
+class JobDescription(models.Model):
+    """
+    One row per distinct job posting, keyed by the hash of its normalized text.
+    The structured parse is stored once and shared by every applicant.
+    """
+    text_hash = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+
+    # JobDescriptionSchema as JSON + the parser version that produced it
+    parsed_data = models.JSONField(null=True, blank=True)
+    parser_version = models.CharField(max_length=32, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = JobDescriptionManager()
+
+    def __str__(self):
+        return f"{self.text[:50]} ({self.text_hash[:12]})"
+
+class AnalysisBatch(models.Model):
+    """
+    Recruiter batch: many resumes ranked against a single job posting.
+    Each resume is a regular ResumeAnalysis pointing back to the batch.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='analysis_batches')
+    job_title = models.CharField(max_length=255)
+    job_posting = models.ForeignKey(JobDescription, on_delete=models.PROTECT, related_name='batches')
+    source_name = models.CharField(max_length=255, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Batch #{self.pk} - {self.job_title}"
 
 class ResumeAnalysis(models.Model):
     # Use settings.AUTH_USER_MODEL to refer to your custom user safely
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='resume_analysis')
     
     job_title = models.CharField(max_length=255)
-    job_description = models.TextField()
+    job_posting = models.ForeignKey(JobDescription, on_delete=models.PROTECT, related_name='analyses')
+    batch = models.ForeignKey(AnalysisBatch, on_delete=models.CASCADE, null=True, blank=True, related_name='analyses')
     resume_file = models.FileField(upload_to='resume/pdf/')
     
     # Stores the clean JSON from the LLM (Skills, Experience, Projects)
@@ -17,22 +53,57 @@ class ResumeAnalysis(models.Model):
     section_match_score = models.JSONField(default=dict)
     retrieved_evidence = models.JSONField(default=dict)
     missing_keywords = models.JSONField(default=list)
+
+    # Intermediate artifacts, kept so scores can be recomputed without the LLM
+    # (see applicants/scoring.py): one {"requirement", "status", "evidence", "source"} per JD skill
+    skill_details = models.JSONField(default=list)
+    impact_score = models.FloatField(null=True, blank=True)
+    # Scored with heuristics only (LLM unavailable); an idle worker re-runs the analysis later
+    needs_refinement = models.BooleanField(default=False)
+
     analysis_summary = models.TextField(blank=True, null=True)
     improved_suggestion = models.JSONField(default=list)
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @property
+    def job_description(self):
+        return self.job_posting.text
+
+    def latest_job(self, kind=None):
+        jobs = self.jobs.order_by('-created_at')
+        if kind:
+            jobs = jobs.filter(kind=kind)
+        return jobs.first()
+
     def __str__(self):
         # We use string formatting because self.user might be an email or username depending on your custom model
         return f"{self.user} - {self.job_title}"
 
 class InterviewSession(models.Model):
+    # Set once the candidate's last answer is in: no more turns, the feedback job takes over
+    STAGE_FEEDBACK = 'feedback_agent'
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     analysis = models.ForeignKey(ResumeAnalysis, on_delete=models.CASCADE)
     
-    chat_history = models.JSONField(default=list)
+    # Compact resume context for the interview prompts (utils/candidate_brief.py), built once
+    candidate_brief = models.JSONField(default=dict, blank=True)
+
+    # Bounded prompt memory (utils/interview_memory.py): messages up to `memory_summarized_seq`
+    # are represented by `memory_summary`, later ones are sent verbatim
+    memory_summary = models.TextField(blank=True, default='')
+    memory_summarized_seq = models.PositiveIntegerField(default=0)
+    # Sequence number of the last InterviewMessage; bumped atomically to reserve new ones
+    last_message_seq = models.PositiveIntegerField(default=0)
+
+    # Turn lock (InterviewSessionManager.acquire_turn): the client turn being answered, until it expires
+    active_turn_id = models.CharField(max_length=64, blank=True, default='')
+    turn_lock_expires = models.DateTimeField(null=True, blank=True)
+
     current_stage = models.CharField(max_length=50, default="project_manager")
     
+    # Parsed report: {"report", "decision", "scores", "generated_at"} (see generate_interview_feedback)
     interview_feedback = models.JSONField(null=True, blank=True)
     verdict = models.CharField(
         max_length=20, 
@@ -40,4 +111,190 @@ class InterviewSession(models.Model):
         default='PENDING'
     )
     
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = InterviewSessionManager()
+
+class InterviewMessage(models.Model):
+    """
+    One message of an interview transcript. Append-only: each turn inserts its rows
+    instead of rewriting a JSON history, and `seq` (unique per session) fixes the order.
+    """
+    ROLE_USER = 'user'
+    ROLE_AI = 'ai'
+    ROLE_CHOICES = [(ROLE_USER, 'Candidate'), (ROLE_AI, 'Interviewer')]
+
+    session = models.ForeignKey(InterviewSession, on_delete=models.CASCADE, related_name='messages')
+    seq = models.PositiveIntegerField()
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    content = models.TextField()
+    # Client-generated id of the chat request that produced the row; a retried request with
+    # the same id is answered from the stored reply
+    turn_id = models.CharField(max_length=64, blank=True, default='')
+
+    token_count = models.PositiveIntegerField(default=0)
+    # LLM time for interviewer replies
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = InterviewMessageManager()
+
+    class Meta:
+        ordering = ['seq']
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'seq'], name='unique_interview_message_seq'),
+            models.UniqueConstraint(
+                fields=['session', 'turn_id', 'role'], condition=~models.Q(turn_id=''),
+                name='unique_interview_message_turn'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.session_id}#{self.seq} {self.role}"
+
+class GraphCheckpoint(models.Model):
+    """
+    LangGraph checkpoint of an interview thread (see applicants/checkpoint.py).
+    `checkpoint` holds the serialized state, channel values included; only the
+    latest few per thread are kept.
+    """
+    thread_id = models.CharField(max_length=100)
+    checkpoint_ns = models.CharField(max_length=255, blank=True, default='')
+    # uuid6 ids: they sort by creation time, so the latest checkpoint is the largest id
+    checkpoint_id = models.CharField(max_length=64)
+    parent_checkpoint_id = models.CharField(max_length=64, blank=True, default='')
+
+    type = models.CharField(max_length=32)
+    checkpoint = models.BinaryField()
+    metadata = models.JSONField(default=dict)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['thread_id', 'checkpoint_ns', 'checkpoint_id'], name='unique_graph_checkpoint')
+        ]
+
+    def __str__(self):
+        return f"{self.thread_id} @ {self.checkpoint_id}"
+
+class GraphCheckpointWrite(models.Model):
+    """Pending write of a graph task, stored against the checkpoint it will be applied to."""
+    thread_id = models.CharField(max_length=100)
+    checkpoint_ns = models.CharField(max_length=255, blank=True, default='')
+    checkpoint_id = models.CharField(max_length=64)
+    task_id = models.CharField(max_length=64)
+    task_path = models.CharField(max_length=255, blank=True, default='')
+    idx = models.IntegerField()
+
+    channel = models.CharField(max_length=255)
+    type = models.CharField(max_length=32)
+    value = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'],
+                name='unique_graph_checkpoint_write'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.thread_id} @ {self.checkpoint_id}: {self.channel}"
+
+class AnalysisJob(models.Model):
+    """
+    Database-backed background job. Workers started with `manage.py run_workers`
+    claim QUEUED rows and run the matching handler from applicants/task.py.
+    """
+    KIND_ANALYZE = 'analyze_resume'
+    KIND_FEEDBACK = 'interview_feedback'
+    KIND_GREETING = 'interview_greeting'
+    # Re-runs a heuristic-only analysis with the LLM; its result is already shown meanwhile
+    KIND_REFINE = 'refine_analysis'
+    # Parses a recruiter batch's shared JD before its resumes are analyzed
+    KIND_PARSE_JD = 'parse_job_description'
+    KIND_CHOICES = [
+        (KIND_ANALYZE, 'Analyze Resume'),
+        (KIND_FEEDBACK, 'Interview Feedback'),
+        (KIND_GREETING, 'Interview Greeting'),
+        (KIND_REFINE, 'Refine Analysis'),
+        (KIND_PARSE_JD, 'Parse Job Description'),
+    ]
+
+    # Higher runs first: a candidate waiting on the dashboard beats a recruiter batch
+    PRIORITY_BATCH = 0
+    PRIORITY_INTERACTIVE = 10
+
+    STATUS_QUEUED = 'QUEUED'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_DONE = 'DONE'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    analysis = models.ForeignKey(ResumeAnalysis, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES, default=KIND_ANALYZE)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    priority = models.SmallIntegerField(default=PRIORITY_INTERACTIVE)
+
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    worker = models.CharField(max_length=100, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', '-priority', 'created_at'])]
+
+    @property
+    def is_pending(self):
+        return self.status in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class ParsedResumeCache(models.Model):
+    """
+    Content-addressed cache of parsed resumes.
+    Keyed by the SHA-256 of the uploaded PDF bytes and the parser version.
+    """
+    file_hash = models.CharField(max_length=64)
+    parser_version = models.CharField(max_length=32)
+    parsed_data = models.JSONField()
+    size_bytes = models.PositiveIntegerField(default=0)
+
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['file_hash', 'parser_version'], name='unique_parsed_resume_version')
+        ]
+        indexes = [models.Index(fields=['last_used_at'])]
+
+    def __str__(self):
+        return f"{self.file_hash[:12]} ({self.parser_version})"
+
+
+class CacheStat(models.Model):
+    """Hit/miss counters per named cache."""
+    name = models.CharField(max_length=50, unique=True)
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+    def __str__(self):
+        return f"{self.name}: {self.hits} hits / {self.misses} misses"
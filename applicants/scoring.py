@@ -0,0 +1,95 @@
+from django.conf import settings
+
+from .models import ResumeAnalysis
+from .cache import get_cached_job_description, get_parsed_job_description
+from .task import interview_unlocked, unlock_interview
+from utils.resume_analysis import (
+    analyze_impact_heuristics, build_analysis_results, rematch_skill_details, summarize_skill_details,
+)
+
+RESCORED_FIELDS = [
+    'overall_match_score', 'section_match_score', 'missing_keywords',
+    'improved_suggestion', 'skill_details', 'impact_score',
+]
+
+
+def rescore_analysis(analysis, parsed_jd, weights=None, llm_fallback=True):
+    """
+    Recomputes the metrics of one analysis from its stored artifacts.
+    Only JD requirements that changed since the last run are matched again; the impact
+    score is reused (or, for rows saved before it was stored, recomputed locally).
+    Returns the number of requirements that had to be matched. Does not save.
+    """
+    resume = analysis.parsed_resume_data or {}
+    details, rematched = rematch_skill_details(
+        analysis.skill_details, resume.get('skills', []), parsed_jd.required_skills, llm_fallback=llm_fallback
+    )
+
+    if analysis.impact_score is None:
+        impact_result = analyze_impact_heuristics(resume.get('work_experience', []))
+    else:
+        impact_result = (analysis.impact_score, analysis.improved_suggestion)
+
+    results = build_analysis_results(summarize_skill_details(details), impact_result, weights)
+    analysis.skill_details = details
+    analysis.impact_score = impact_result[0]
+    analysis.overall_match_score = results["overall_match_score"]
+    analysis.section_match_score = results["section_match_score"]
+    analysis.missing_keywords = results["missing_keywords"]
+    analysis.improved_suggestion = results["improved_suggestion"]
+    return rematched
+
+
+def rescore_analyses(analyses=None, weights=None, llm_fallback=True, batch_size=500):
+    """
+    Re-scores analyses in bulk (all of them by default) with the current weights and
+    the current JD requirements. Rows without a parsed resume are skipped, and so are
+    rows whose JD has no current parse when `llm_fallback` is off.
+    Each JD is loaded once; results are written with bulk_update. Candidates whose new
+    score crosses the qualifying threshold get their interview unlocked, as after an upload.
+    """
+    if analyses is None:
+        analyses = ResumeAnalysis.objects.all()
+    weights = weights or settings.ANALYSIS_SCORE_WEIGHTS
+
+    stats = {"scored": 0, "skipped": 0, "rematched_requirements": 0, "unlocked": 0}
+    parsed_jds = {}
+    pending = []
+    crossed = []
+
+    queryset = analyses.select_related('job_posting').order_by('pk')
+    for analysis in queryset.iterator(chunk_size=batch_size):
+        if not analysis.parsed_resume_data:
+            stats["skipped"] += 1
+            continue
+
+        if analysis.job_posting_id not in parsed_jds:
+            if llm_fallback:
+                parsed_jds[analysis.job_posting_id] = get_parsed_job_description(analysis.job_posting)
+            else:
+                parsed_jds[analysis.job_posting_id] = get_cached_job_description(analysis.job_posting)
+        if parsed_jds[analysis.job_posting_id] is None:
+            stats["skipped"] += 1
+            continue
+
+        was_unlocked = analysis.overall_match_score is not None and interview_unlocked(analysis)
+        stats["rematched_requirements"] += rescore_analysis(
+            analysis, parsed_jds[analysis.job_posting_id], weights=weights, llm_fallback=llm_fallback
+        )
+        stats["scored"] += 1
+        if not was_unlocked and interview_unlocked(analysis):
+            crossed.append(analysis)
+
+        pending.append(analysis)
+        if len(pending) >= batch_size:
+            ResumeAnalysis.objects.bulk_update(pending, RESCORED_FIELDS)
+            pending = []
+
+    if pending:
+        ResumeAnalysis.objects.bulk_update(pending, RESCORED_FIELDS)
+
+    # Only after the new scores are saved, so the greeting job sees them
+    for analysis in crossed:
+        if unlock_interview(analysis) is not None:
+            stats["unlocked"] += 1
+    return stats
@@ -0,0 +1,393 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from .models import AnalysisJob, InterviewMessage, InterviewSession, ResumeAnalysis
+from .cache import (
+    file_sha256, get_cached_resume, store_parsed_resume,
+    get_cached_job_description, get_parsed_job_description, job_description_is_parsed,
+    store_parsed_job_description,
+)
+from utils.resilience import deadline
+from utils.resume_analysis import STAGE_TIMEOUTS, run_analysis_pipeline
+from utils.candidate_brief import build_candidate_brief, brief_is_current
+from utils.feedback_report import parse_feedback_report
+from utils.interview_memory import count_tokens, to_langchain_messages
+from utils.llm_governor import llm_priority
+
+# Score needed for a candidate to unlock the AI interview
+INTERVIEW_QUALIFYING_SCORE = 70.0
+
+# Hidden first message that makes the interviewer introduce itself; not stored in the transcript
+INTERVIEW_GREETING_TRIGGER = "Hello, I am ready for the interview. Please introduce yourself."
+# turn_id of the greeting row: the unique (session, turn_id, role) constraint keeps it single
+GREETING_TURN_ID = 'greeting'
+
+# Sent instead of an LLM reply once the interview reaches the feedback round
+INTERVIEW_CLOSING_MESSAGE = (
+    "That concludes the interview. Thank you for your time. "
+    "Your feedback report is being prepared and will be ready shortly."
+)
+
+
+# --- 1. Job Handlers ---
+
+def analyze_resume(analysis):
+    """
+    Runs the full upload pipeline for one ResumeAnalysis:
+    PDF extraction -> resume parsing -> JD comparison -> save results.
+    The resume and JD parses run concurrently, and each is skipped when already cached.
+    If the LLM is unavailable the result is heuristic-only and flagged `needs_refinement`;
+    idle workers re-run it later (enqueue_refinements).
+    """
+    # 1. Look up both parses (PDF hash / shared JD row)
+    file_hash = file_sha256(analysis.resume_file)
+    cached_resume = get_cached_resume(file_hash)
+    cached_jd = get_cached_job_description(analysis.job_posting)
+    if cached_resume is not None:
+        print(f"[analysis {analysis.pk}] Parsed resume served from cache")
+
+    # 2. Run the stage graph: extraction + parses + skill match + heuristics
+    print(f"[analysis {analysis.pk}] Running analysis pipeline...")
+    outputs = run_analysis_pipeline(
+        resume_path=analysis.resume_file.path,
+        jd_text=analysis.job_posting.text,
+        parsed_resume=cached_resume,
+        parsed_jd=cached_jd,
+        weights=settings.ANALYSIS_SCORE_WEIGHTS,
+    )
+    structured_data = outputs["parsed_resume"]
+    results = outputs["results"]
+    if outputs["degraded"]:
+        print(f"[analysis {analysis.pk}] Heuristic fallback used for: {outputs['degraded']}")
+
+    # 3. Fill the caches with anything parsed for the first time (heuristic parses are never cached)
+    if cached_resume is None and structured_data and "parsed_resume" not in outputs["degraded"]:
+        store_parsed_resume(file_hash, structured_data)
+    if cached_jd is None and "parsed_jd" not in outputs["degraded"]:
+        store_parsed_job_description(analysis.job_posting, outputs["parsed_jd"])
+
+    analysis.parsed_resume_data = structured_data
+
+    # 4. Save Results (and the artifacts they were computed from, for re-scoring)
+    analysis.skill_details = outputs["skill_details"]
+    analysis.impact_score = outputs["impact"][0]
+    analysis.overall_match_score = results["overall_match_score"]
+    analysis.section_match_score = results["section_match_score"]
+    analysis.missing_keywords = results["missing_keywords"]
+    analysis.improved_suggestion = results["improved_suggestion"]
+    analysis.needs_refinement = outputs["needs_refinement"]
+    analysis.save()
+
+    # 5. Unlock the interview for qualified candidates
+    unlock_interview(analysis)
+
+
+def parse_batch_job_description(analysis):
+    """
+    Parses the shared JD of a recruiter batch (run on its first analysis), then queues the
+    analyze jobs of the whole batch, which all reuse the stored parse. There is no heuristic
+    fallback here: if the LLM parse fails the job is retried and the batch keeps waiting.
+    """
+    batch = analysis.batch
+    print(f"[batch {batch.pk}] Parsing the job description...")
+    with deadline(STAGE_TIMEOUTS["parsed_jd"]):
+        get_parsed_job_description(batch.job_posting)
+    enqueue_batch_jobs(batch)
+
+
+def generate_interview_greeting(analysis):
+    """
+    Writes the interviewer's opening message of a new InterviewSession, so the interview
+    room is served straight from the database. Sessions that already have messages are skipped.
+    """
+    # The interview stack (LangGraph, LangChain) loads in the worker on the first interview job
+    from langchain_core.messages import AIMessage, HumanMessage
+    from utils.interview_agent import get_interview_graph
+
+    session = InterviewSession.objects.get(analysis=analysis)
+    if session.messages.exists():
+        return
+    brief = session.candidate_brief
+    if not brief_is_current(brief):
+        brief = build_candidate_brief(analysis.parsed_resume_data)
+
+    state = {
+        "messages": [HumanMessage(content=INTERVIEW_GREETING_TRIGGER)],
+        "turn_count": 0,
+        "full_name": brief["full_name"],
+        "job_description": analysis.job_description,
+        "workexperience": brief["workexperience"],
+        "projects": brief["projects"],
+    }
+    print(f"[analysis {analysis.pk}] Writing interview greeting...")
+    started = time.perf_counter()
+    # Stateless graph: the session's checkpointed thread is seeded from the transcript on the first answer
+    greeting = get_interview_graph().invoke(state)["messages"][-1].content
+
+    try:
+        InterviewMessage.objects.append(session, [{
+            "role": InterviewMessage.ROLE_AI,
+            "content": greeting,
+            "turn_id": GREETING_TURN_ID,
+            "token_count": count_tokens([AIMessage(content=greeting)]),
+            "latency_ms": round((time.perf_counter() - started) * 1000),
+        }])
+    except IntegrityError:
+        print(f"[analysis {analysis.pk}] Greeting already written by another worker")
+
+
+def generate_interview_feedback(analysis):
+    """
+    Writes the hiring manager report for a finished interview, then stores it with the
+    parsed SELECTED/REJECTED decision and round scores on the InterviewSession.
+    Uses the same bounded memory as the chat turns (summary + recent window).
+    """
+    from langchain_core.messages import HumanMessage
+    from utils.interview_agent import write_feedback_report
+    from .checkpoint import get_interview_checkpointer, interview_thread_id
+
+    session = InterviewSession.objects.get(analysis=analysis)
+    brief = session.candidate_brief or build_candidate_brief(analysis.parsed_resume_data)
+    window = InterviewMessage.objects.window(session, session.memory_summarized_seq).values('role', 'content')
+
+    messages = to_langchain_messages(window)
+    messages.append(HumanMessage(content="The interview is over. Write the feedback report now."))
+    state = {
+        "messages": messages,
+        "conversation_summary": session.memory_summary,
+        "turn_count": session.messages.filter(role=InterviewMessage.ROLE_USER).count(),
+        "full_name": brief["full_name"],
+        "job_description": analysis.job_description,
+        "workexperience": brief["workexperience"],
+        "projects": brief["projects"],
+    }
+
+    print(f"[analysis {analysis.pk}] Writing interview feedback...")
+    feedback = parse_feedback_report(write_feedback_report(state))
+    feedback["generated_at"] = timezone.now().isoformat()
+
+    session.interview_feedback = feedback
+    if feedback["decision"]:
+        session.verdict = feedback["decision"]
+    session.save(update_fields=['interview_feedback', 'verdict'])
+    # The interview is over: its graph state is no longer needed
+    get_interview_checkpointer().delete_thread(interview_thread_id(session))
+
+
+def interview_unlocked(analysis):
+    return not analysis.needs_refinement and analysis.overall_match_score >= INTERVIEW_QUALIFYING_SCORE
+
+
+def unlock_interview(analysis):
+    """
+    Opens the interview of a qualified candidate (not for recruiter batches, and not on a
+    provisional heuristic score) and has the greeting written before they open it.
+    Returns the InterviewSession, or None if the candidate does not qualify.
+    """
+    if analysis.batch_id is not None or not interview_unlocked(analysis):
+        return None
+    session, _ = InterviewSession.objects.get_or_create(
+        analysis=analysis,
+        defaults={
+            'user': analysis.user,
+            'candidate_brief': build_candidate_brief(analysis.parsed_resume_data),
+            'current_stage': 'hr_agent'
+        }
+    )
+    ensure_interview_greeting(session)
+    return session
+
+
+JOB_HANDLERS = {
+    AnalysisJob.KIND_ANALYZE: analyze_resume,
+    AnalysisJob.KIND_FEEDBACK: generate_interview_feedback,
+    AnalysisJob.KIND_GREETING: generate_interview_greeting,
+    # Same pipeline; a separate kind, so the pages keep showing the stored result meanwhile
+    AnalysisJob.KIND_REFINE: analyze_resume,
+    AnalysisJob.KIND_PARSE_JD: parse_batch_job_description,
+}
+
+
+# --- 2. Queue Operations ---
+
+def enqueue_job(analysis, kind=AnalysisJob.KIND_ANALYZE, priority=AnalysisJob.PRIORITY_INTERACTIVE):
+    return AnalysisJob.objects.create(analysis=analysis, kind=kind, priority=priority)
+
+
+def enqueue_batch_jobs(batch):
+    """
+    Queues a batch-priority analyze job for every analysis of `batch` without one, once the
+    batch's JD has a stored parse. Until then it only makes sure a JD parse job is pending,
+    so the JD is parsed once instead of by every analysis. Returns the number of jobs queued.
+    """
+    if not job_description_is_parsed(batch.job_posting):
+        parse_jobs = AnalysisJob.objects.filter(analysis__batch=batch, kind=AnalysisJob.KIND_PARSE_JD)
+        first = batch.analyses.order_by('pk').first()
+        if first is None or parse_jobs.filter(status__in=[AnalysisJob.STATUS_QUEUED, AnalysisJob.STATUS_RUNNING]).exists():
+            return 0
+        enqueue_job(first, kind=AnalysisJob.KIND_PARSE_JD, priority=AnalysisJob.PRIORITY_BATCH)
+        return 1
+
+    orphans = list(batch.analyses.exclude(jobs__kind=AnalysisJob.KIND_ANALYZE))
+    AnalysisJob.objects.bulk_create(
+        [AnalysisJob(analysis=analysis, priority=AnalysisJob.PRIORITY_BATCH) for analysis in orphans]
+    )
+    return len(orphans)
+
+
+def ensure_interview_greeting(session):
+    """
+    Queues the greeting job for a session without messages, unless one is already pending
+    (e.g. after a failed job, when the candidate opens the room). Returns the pending job, if any.
+    """
+    if session.messages.exists():
+        return None
+    job = session.analysis.latest_job(AnalysisJob.KIND_GREETING)
+    if job is not None and job.is_pending:
+        return job
+    return enqueue_job(session.analysis, kind=AnalysisJob.KIND_GREETING)
+
+
+def claim_next_job(worker_name):
+    """
+    Atomically moves the next QUEUED job (highest priority, then oldest) to RUNNING for this worker.
+    The conditional UPDATE guarantees only one worker wins each job,
+    without relying on SELECT ... FOR UPDATE (unsupported on SQLite).
+    """
+    candidate_ids = (
+        AnalysisJob.objects.filter(status=AnalysisJob.STATUS_QUEUED)
+        .order_by('-priority', 'created_at')
+        .values_list('id', flat=True)[:10]
+    )
+    for job_id in candidate_ids:
+        claimed = AnalysisJob.objects.filter(id=job_id, status=AnalysisJob.STATUS_QUEUED).update(
+            status=AnalysisJob.STATUS_RUNNING,
+            worker=worker_name,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return AnalysisJob.objects.select_related('analysis__job_posting').get(id=job_id)
+    return None
+
+
+def run_job(job):
+    """Executes a claimed job and records the outcome. Failed jobs are retried up to ANALYSIS_JOB_MAX_ATTEMPTS."""
+    handler = JOB_HANDLERS[job.kind]
+    try:
+        # LLM calls of the job queue behind live interview turns, batch jobs behind everything
+        with llm_priority(job.priority):
+            handler(job.analysis)
+    except Exception as e:
+        print(f"Job Error ({job}): {e}")
+        job.error = str(e)
+        # Errors flagged as non-retryable (e.g. an unreadable PDF) fail immediately
+        if job.attempts < settings.ANALYSIS_JOB_MAX_ATTEMPTS and getattr(e, 'retryable', True):
+            job.status = AnalysisJob.STATUS_QUEUED
+        else:
+            job.status = AnalysisJob.STATUS_FAILED
+            job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return False
+
+    job.status = AnalysisJob.STATUS_DONE
+    job.error = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return True
+
+
+def enqueue_refinements(limit=10):
+    """
+    Queues a batch-priority refine job for heuristic-only analyses (needs_refinement) whose
+    last analyze or refine job was queued more than ANALYSIS_REFINE_AFTER_SECONDS ago, at most
+    ANALYSIS_REFINE_MAX_JOBS refine jobs per analysis. Skipped while the LLM circuit is open.
+    Returns the number of jobs queued.
+    """
+    from utils.llm import llm_available
+
+    if not llm_available():
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=settings.ANALYSIS_REFINE_AFTER_SECONDS)
+    pipeline_jobs = AnalysisJob.objects.filter(
+        analysis=OuterRef('pk'), kind__in=[AnalysisJob.KIND_ANALYZE, AnalysisJob.KIND_REFINE]
+    )
+    analyses = (
+        ResumeAnalysis.objects.filter(needs_refinement=True)
+        .exclude(Exists(pipeline_jobs.filter(
+            Q(status__in=[AnalysisJob.STATUS_QUEUED, AnalysisJob.STATUS_RUNNING]) | Q(created_at__gte=cutoff)
+        )))
+        .alias(refine_count=Count('jobs', filter=Q(jobs__kind=AnalysisJob.KIND_REFINE)))
+        .filter(refine_count__lt=settings.ANALYSIS_REFINE_MAX_JOBS)
+        .order_by('created_at')[:limit]
+    )
+    queued = 0
+    for analysis in analyses:
+        enqueue_job(analysis, kind=AnalysisJob.KIND_REFINE, priority=AnalysisJob.PRIORITY_BATCH)
+        queued += 1
+    if queued:
+        print(f"Queued LLM refinement of {queued} heuristic-only analyses")
+    return queued
+
+
+def requeue_stale_jobs(max_age_seconds=None):
+    """
+    Puts RUNNING jobs whose worker died (started too long ago) back in the queue.
+    Jobs that already used all their attempts are failed instead, so a file that kills
+    every worker reading it is not retried forever. Returns the number of requeued jobs.
+    """
+    if max_age_seconds is None:
+        max_age_seconds = settings.ANALYSIS_JOB_STALE_SECONDS
+    max_attempts = settings.ANALYSIS_JOB_MAX_ATTEMPTS
+    now = timezone.now()
+    stale = AnalysisJob.objects.filter(
+        status=AnalysisJob.STATUS_RUNNING, started_at__lt=now - timedelta(seconds=max_age_seconds)
+    )
+    stale.filter(attempts__gte=max_attempts).update(
+        status=AnalysisJob.STATUS_FAILED, worker='', finished_at=now,
+        error=f"Worker died while running the job ({max_attempts} attempts)",
+    )
+    return stale.filter(attempts__lt=max_attempts).update(status=AnalysisJob.STATUS_QUEUED, worker='')
+
+
+# --- 3. Worker Loop ---
+
+def default_worker_name(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def run_worker_loop(worker_name, poll_interval=None, stop_event=None, max_jobs=None):
+    """
+    Claims and runs jobs until `stop_event` is set or `max_jobs` have been processed.
+    Sleeps `poll_interval` seconds whenever the queue is empty.
+    """
+    if poll_interval is None:
+        poll_interval = settings.ANALYSIS_WORKER_POLL_INTERVAL
+
+    processed = 0
+    while not (stop_event and stop_event.is_set()):
+        if max_jobs is not None and processed >= max_jobs:
+            break
+
+        close_old_connections()
+        job = claim_next_job(worker_name)
+        if job is None:
+            # Idle: use the spare capacity to redo heuristic-only analyses with the LLM
+            if enqueue_refinements():
+                continue
+            time.sleep(poll_interval)
+            continue
+
+        print(f"[{worker_name}] Running {job}")
+        run_job(job)
+        processed += 1
+
+    close_old_connections()
+    return processed
@@ -1,3 +1,1032 @@
-from django.test import TestCase
+import io
+import json
+import os
+import threading
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .batch import (
+    BatchUploadError, batch_progress, create_batch, iter_directory_resumes, iter_zip_resumes, resume_batch,
+)
+from .cache import evict_resume_cache, get_cached_resume, store_parsed_job_description, store_parsed_resume
+from .checkpoint import DjangoCheckpointSaver, ainterview_thread_started, interview_thread_config
+from .scoring import rescore_analyses
+from .models import (
+    AnalysisBatch, AnalysisJob, GraphCheckpoint, GraphCheckpointWrite, InterviewMessage, InterviewSession,
+    JobDescription, ParsedResumeCache, ResumeAnalysis,
+)
+from .task import analyze_resume, claim_next_job, enqueue_job, enqueue_refinements, requeue_stale_jobs, run_job
+from utils.llm_governor import (
+    PRIORITY_BATCH, PRIORITY_CHAT, PRIORITY_INTERACTIVE, LLMBudgetTimeout, LLMGovernor, current_priority,
+)
+from utils.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, call_with_retries, deadline
+from utils.resume_analysis import Stage, build_analysis_stages, heuristic_parse_job_description, run_stage_graph
+
+JD_TEXT = "Backend engineer. 3+ years of Python, Django and PostgreSQL. Nice to have: Redis."
+
+
+def make_user(email="recruiter@example.com", **fields):
+    return get_user_model().objects.create_user(email, "password", username=email, **fields)
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def make_session(user):
+    analysis = ResumeAnalysis.objects.create(
+        user=user,
+        job_title="Backend",
+        job_posting=JobDescription.objects.get_or_create_from_text(JD_TEXT),
+        resume_file="resume/pdf/jane.pdf",
+        overall_match_score=80.0,
+    )
+    return InterviewSession.objects.create(user=user, analysis=analysis, current_stage="hr_agent")
+
+
+def pipeline_outputs(score=80.0, degraded=()):
+    """Stand-in for run_analysis_pipeline() results, so job tests need no PDF or LLM."""
+    from utils.resume_analysis import heuristic_parse_job_description
+    return {
+        "parsed_resume": {"full_name": "Jane Doe", "skills": ["Python"], "work_experience": [], "projects": []},
+        "parsed_jd": heuristic_parse_job_description(JD_TEXT),
+        "skill_details": [],
+        "impact": (50, []),
+        "degraded": list(degraded),
+        "needs_refinement": bool(degraded),
+        "results": {
+            "overall_match_score": score,
+            "section_match_score": {"Skill_Match": score, "Impact_Score": 50},
+            "missing_keywords": [],
+            "improved_suggestion": [],
+        },
+    }
+
+
+class MediaRootMixin:
+    """Uploaded resumes go to a temporary MEDIA_ROOT that is removed after the test."""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+# --- 1. Background Jobs ---
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.analysis = make_session(make_user()).analysis
+
+    def test_each_job_is_claimed_by_one_worker(self):
+        batch_job = enqueue_job(self.analysis, priority=AnalysisJob.PRIORITY_BATCH)
+        interactive_job = enqueue_job(self.analysis)
+
+        first = claim_next_job("worker-a")
+        second = claim_next_job("worker-b")
+        self.assertEqual((first.pk, first.worker), (interactive_job.pk, "worker-a"))
+        self.assertEqual((second.pk, second.worker), (batch_job.pk, "worker-b"))
+        self.assertIsNone(claim_next_job("worker-c"))
+
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.worker, first.attempts), (AnalysisJob.STATUS_RUNNING, "worker-a", 1))
+
+    def test_claim_skips_a_job_taken_after_it_was_listed(self):
+        job = enqueue_job(self.analysis)
+        real_update = AnalysisJob.objects.filter(pk=job.pk).update
+
+        def taken_by_another_worker(name):
+            # Runs while the claim builds its UPDATE: another worker wins the job after the
+            # candidate SELECT, so the conditional UPDATE must match nothing
+            real_update(status=AnalysisJob.STATUS_RUNNING, worker="worker-b")
+            return F(name)
+
+        with mock.patch("applicants.task.F", side_effect=taken_by_another_worker):
+            self.assertIsNone(claim_next_job("worker-a"))
+        job.refresh_from_db()
+        self.assertEqual(job.worker, "worker-b")
+
+    def _run_failing(self, error):
+        job = claim_next_job("worker-a") or self.fail("no job claimed")
+        with mock.patch.dict("applicants.task.JOB_HANDLERS", {AnalysisJob.KIND_ANALYZE: mock.Mock(side_effect=error)}):
+            self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        return job
+
+    def test_non_retryable_error_fails_the_job_at_once(self):
+        from utils.pdf_pool import PDFExtractionError
+
+        enqueue_job(self.analysis)
+        job = self._run_failing(PDFExtractionError("invalid_pdf", "Could not read PDF"))
+        self.assertEqual((job.status, job.attempts), (AnalysisJob.STATUS_FAILED, 1))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(job.error, "Could not read PDF")
+
+    def test_retryable_error_requeues_until_max_attempts(self):
+        enqueue_job(self.analysis)
+        with self.settings(ANALYSIS_JOB_MAX_ATTEMPTS=2):
+            job = self._run_failing(RuntimeError("provider down"))
+            self.assertEqual(job.status, AnalysisJob.STATUS_QUEUED)
+            job = self._run_failing(RuntimeError("provider down"))
+            self.assertEqual((job.status, job.attempts), (AnalysisJob.STATUS_FAILED, 2))
+
+    def test_requeue_only_expired_running_jobs(self):
+        stale, fresh = enqueue_job(self.analysis), enqueue_job(self.analysis)
+        AnalysisJob.objects.filter(pk=stale.pk).update(
+            status=AnalysisJob.STATUS_RUNNING, worker="dead", started_at=timezone.now() - timedelta(hours=1)
+        )
+        AnalysisJob.objects.filter(pk=fresh.pk).update(
+            status=AnalysisJob.STATUS_RUNNING, worker="alive", started_at=timezone.now()
+        )
+        self.assertEqual(requeue_stale_jobs(max_age_seconds=600), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.worker), (AnalysisJob.STATUS_QUEUED, ""))
+        self.assertEqual((fresh.status, fresh.worker), (AnalysisJob.STATUS_RUNNING, "alive"))
+
+    def test_stale_job_out_of_attempts_is_failed(self):
+        job = enqueue_job(self.analysis)
+        AnalysisJob.objects.filter(pk=job.pk).update(
+            status=AnalysisJob.STATUS_RUNNING, worker="dead", attempts=2,
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+        with self.settings(ANALYSIS_JOB_MAX_ATTEMPTS=2):
+            self.assertEqual(requeue_stale_jobs(max_age_seconds=600), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (AnalysisJob.STATUS_FAILED, ""))
+        self.assertIsNotNone(job.finished_at)
+        self.assertIn("Worker died", job.error)
+
+
+class RefinementTests(TestCase):
+    def setUp(self):
+        self.user = make_user("candidate@example.com")
+        self.analysis = make_session(self.user).analysis
+        ResumeAnalysis.objects.filter(pk=self.analysis.pk).update(needs_refinement=True)
+        # Analyzed an hour ago with the heuristic fallback
+        AnalysisJob.objects.filter(pk=enqueue_job(self.analysis).pk).update(
+            status=AnalysisJob.STATUS_DONE, created_at=timezone.now() - timedelta(hours=1)
+        )
+        self.client.force_login(self.user)
+
+    def test_heuristic_result_gets_a_refine_job(self):
+        with mock.patch("utils.llm.llm_available", return_value=True):
+            self.assertEqual(enqueue_refinements(), 1)
+            # One pending refinement at a time
+            self.assertEqual(enqueue_refinements(), 0)
+        job = self.analysis.latest_job()
+        self.assertEqual((job.kind, job.priority), (AnalysisJob.KIND_REFINE, AnalysisJob.PRIORITY_BATCH))
+
+    def test_pending_or_failed_refinement_keeps_the_stored_result_on_screen(self):
+        refine = enqueue_job(self.analysis, kind=AnalysisJob.KIND_REFINE, priority=AnalysisJob.PRIORITY_BATCH)
+        for status in (AnalysisJob.STATUS_QUEUED, AnalysisJob.STATUS_FAILED):
+            AnalysisJob.objects.filter(pk=refine.pk).update(status=status, error="provider down")
+
+            response = self.client.get(reverse("dashboard"))
+            self.assertTemplateUsed(response, "applicants/dashboard.html")
+            status_json = self.client.get(reverse("analysis_status", args=[self.analysis.pk])).json()
+            self.assertEqual((status_json["status"], status_json["error"]), (AnalysisJob.STATUS_DONE, None))
+            self.assertTrue(status_json["needs_refinement"])
+
+
+# --- 2. Recruiter Batches ---
+
+class BatchUploadTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user(is_staff=True)
+
+    def test_invalid_zip_is_rejected_before_anything_is_created(self):
+        with self.assertRaises(BatchUploadError):
+            create_batch(self.user, "Backend", JD_TEXT, iter_zip_resumes(io.BytesIO(b"not a zip")))
+        self.assertFalse(AnalysisBatch.objects.exists())
+
+    def test_zip_without_pdfs_is_rejected_eagerly(self):
+        with self.assertRaises(BatchUploadError):
+            iter_zip_resumes(make_zip({"notes.txt": "hello"}))
+
+    @override_settings(BATCH_MAX_FILES=2)
+    def test_directory_over_the_file_limit_is_rejected(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            with open(f"{directory}/{name}", "wb") as f:
+                f.write(b"%PDF-1.4")
+        with self.assertRaises(BatchUploadError):
+            iter_directory_resumes(directory)
+
+    @override_settings(BATCH_MAX_FILE_BYTES=4)
+    def test_batch_of_only_oversized_resumes_is_rolled_back(self):
+        resumes = iter_zip_resumes(make_zip({"a.pdf": b"%PDF-1.4 big"}))
+        with self.assertRaises(BatchUploadError):
+            create_batch(self.user, "Backend", JD_TEXT, resumes)
+        self.assertFalse(AnalysisBatch.objects.exists())
+        self.assertFalse(ResumeAnalysis.objects.exists())
+
+    def store_jd_parse(self):
+        from utils.resume_analysis import heuristic_parse_job_description
+        from .cache import store_parsed_job_description
+
+        job_posting = JobDescription.objects.get_or_create_from_text(JD_TEXT)
+        store_parsed_job_description(job_posting, heuristic_parse_job_description(JD_TEXT))
+
+    def test_unparsed_jd_queues_only_a_jd_parse(self):
+        resumes = iter_zip_resumes(make_zip({"a.pdf": b"%PDF-1.4", "b.pdf": b"%PDF-1.4", "c.pdf": b"%PDF-1.4"}))
+        batch = create_batch(self.user, "Backend", JD_TEXT, resumes)
+        self.assertEqual(batch.analyses.count(), 3)
+        job = AnalysisJob.objects.get(analysis__batch=batch)
+        self.assertEqual((job.kind, job.priority), (AnalysisJob.KIND_PARSE_JD, AnalysisJob.PRIORITY_BATCH))
+        self.assertEqual(batch_progress(batch)["queued"], 3)
+
+    def test_parsed_jd_queues_every_analysis(self):
+        self.store_jd_parse()
+        resumes = iter_zip_resumes(make_zip({"a.pdf": b"%PDF-1.4", "b.pdf": b"%PDF-1.4"}))
+        batch = create_batch(self.user, "Backend", JD_TEXT, resumes)
+        kinds = AnalysisJob.objects.filter(analysis__batch=batch).values_list("kind", flat=True)
+        self.assertEqual(list(kinds), [AnalysisJob.KIND_ANALYZE] * 2)
+
+    def test_batch_status_ignores_a_malformed_limit(self):
+        resumes = iter_zip_resumes(make_zip({"a.pdf": b"%PDF-1.4"}))
+        batch = create_batch(self.user, "Backend", JD_TEXT, resumes)
+        self.client.force_login(self.user)
+        for limit in ("abc", "-5", "100000"):
+            response = self.client.get(reverse("batch_status", args=[batch.pk]), {"limit": limit})
+            self.assertEqual(response.status_code, 200)
+
+    def _unparsed_batch(self):
+        resumes = iter_zip_resumes(make_zip({"a.pdf": b"%PDF-1.4 a", "b.pdf": b"%PDF-1.4 b", "c.pdf": b"%PDF-1.4 c"}))
+        return create_batch(self.user, "Backend", JD_TEXT, resumes)
+
+    def test_jd_parse_job_stores_the_parse_then_releases_the_batch(self):
+        from utils.resume_analysis import heuristic_parse_job_description
+
+        batch = self._unparsed_batch()
+        parse = mock.Mock(return_value=heuristic_parse_job_description(JD_TEXT))
+        with mock.patch("applicants.cache.parse_job_description", parse):
+            self.assertTrue(run_job(claim_next_job("worker-a")))
+        parse.assert_called_once_with(JD_TEXT)
+        batch.job_posting.refresh_from_db()
+        self.assertIsNotNone(batch.job_posting.parsed_data)
+        analyze_jobs = AnalysisJob.objects.filter(analysis__batch=batch, kind=AnalysisJob.KIND_ANALYZE)
+        self.assertEqual(analyze_jobs.count(), 3)
+
+        # The analyze jobs reuse the stored parse
+        with mock.patch("applicants.task.run_analysis_pipeline", return_value=pipeline_outputs()) as pipeline:
+            analyze_resume(analyze_jobs.first().analysis)
+        self.assertIsNotNone(pipeline.call_args.kwargs["parsed_jd"])
+
+    @override_settings(ANALYSIS_JOB_MAX_ATTEMPTS=2)
+    def test_failed_jd_parse_holds_the_batch_back(self):
+        batch = self._unparsed_batch()
+        with mock.patch("applicants.cache.parse_job_description", side_effect=RuntimeError("provider down")):
+            while (job := claim_next_job("worker-a")) is not None:
+                self.assertFalse(run_job(job))
+        self.assertFalse(AnalysisJob.objects.filter(analysis__batch=batch, kind=AnalysisJob.KIND_ANALYZE).exists())
+        self.assertIsNone(batch.job_posting.parsed_data)
+        progress = batch_progress(batch)
+        self.assertEqual((progress["failed"], progress["finished"]), (3, True))
+
+        # Resuming retries the JD parse, not the analyses
+        self.assertEqual(resume_batch(batch, retry_failed=True), 1)
+        job = AnalysisJob.objects.get(analysis__batch=batch)
+        self.assertEqual((job.kind, job.status), (AnalysisJob.KIND_PARSE_JD, AnalysisJob.STATUS_QUEUED))
+
+    def test_progress_counts_each_analysis_once(self):
+        self.store_jd_parse()
+        resumes = iter_zip_resumes(make_zip({"a.pdf": b"%PDF-1.4", "b.pdf": b"%PDF-1.4"}))
+        batch = create_batch(self.user, "Backend", JD_TEXT, resumes)
+        first, second = batch.analyses.order_by("pk")
+        AnalysisJob.objects.filter(analysis=first).update(status=AnalysisJob.STATUS_FAILED)
+        # A later job of the same analysis (a retry) supersedes the failed one
+        AnalysisJob.objects.filter(pk=enqueue_job(first).pk).update(status=AnalysisJob.STATUS_DONE)
+        enqueue_job(second, priority=AnalysisJob.PRIORITY_BATCH)
+        enqueue_job(first, kind=AnalysisJob.KIND_REFINE, priority=AnalysisJob.PRIORITY_BATCH)
+
+        progress = batch_progress(batch)
+        self.assertEqual(
+            {key: progress[key] for key in ("total", "done", "failed", "queued", "finished", "percent")},
+            {"total": 2, "done": 1, "failed": 0, "queued": 1, "finished": False, "percent": 50.0},
+        )
+
+
+# --- 3. Interview Turns ---
+
+class ChatApiTests(TestCase):
+    def setUp(self):
+        self.user = make_user("candidate@example.com")
+        self.session = make_session(self.user)
+        self.client.force_login(self.user)
+
+    def test_empty_message_is_rejected_without_a_turn(self):
+        for message in (None, ""):
+            response = self.client.post(
+                reverse("chat_api", args=[self.session.analysis_id]),
+                json.dumps({"message": message, "turn_id": "t1"}),
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(InterviewMessage.objects.exists())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.active_turn_id, "")
+
+    def test_answered_turn_id_gets_the_stored_reply(self):
+        InterviewMessage.objects.append(self.session, [
+            {"role": InterviewMessage.ROLE_USER, "content": "My answer", "turn_id": "t1"},
+            {"role": InterviewMessage.ROLE_AI, "content": "Next question", "turn_id": "t1"},
+        ])
+        with mock.patch("applicants.checkpoint.get_persistent_interview_graph") as graph:
+            response = self.client.post(
+                reverse("chat_api", args=[self.session.analysis_id]),
+                json.dumps({"message": "My answer", "turn_id": "t1"}),
+                content_type="application/json",
+            )
+        self.assertEqual(response.json(), {"response": "Next question", "replayed": True})
+        graph.assert_not_called()
+        self.assertEqual(InterviewMessage.objects.count(), 2)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.active_turn_id, "")
+
+    def post_turn(self, graph):
+        with mock.patch("applicants.checkpoint.get_persistent_interview_graph", return_value=graph):
+            return self.client.post(
+                reverse("chat_api", args=[self.session.analysis_id]),
+                json.dumps({"message": "My answer", "turn_id": "t1"}),
+                content_type="application/json",
+            )
+
+    def test_graph_runs_at_chat_priority_with_the_lock_renewed(self):
+        from langchain_core.messages import AIMessage
+        seen = {}
+
+        async def ainvoke(graph_input, config):
+            seen["priority"] = current_priority()
+            seen["lock"] = await InterviewSession.objects.filter(pk=self.session.pk).values_list(
+                "active_turn_id", "turn_lock_expires"
+            ).aget()
+            return {"messages": graph_input["messages"] + [AIMessage(content="Next question", id="ai-1")]}
+
+        requested = timezone.now()
+        response = self.post_turn(mock.Mock(ainvoke=ainvoke))
+
+        self.assertEqual(response.json(), {"response": "Next question"})
+        self.assertEqual(seen["priority"], PRIORITY_CHAT)
+        self.assertEqual(seen["lock"][0], "t1")
+        self.assertGreaterEqual(seen["lock"][1], requested + timedelta(seconds=settings.INTERVIEW_TURN_LOCK_SECONDS))
+        self.assertEqual(current_priority(), PRIORITY_INTERACTIVE)
+
+    def test_turn_stops_when_its_lock_was_taken(self):
+        graph = mock.Mock()
+        with mock.patch.object(InterviewSession.objects, "arenew_turn", mock.AsyncMock(return_value=False)):
+            response = self.post_turn(graph)
+        self.assertEqual(response.status_code, 500)
+        graph.ainvoke.assert_not_called()
+        self.assertFalse(InterviewMessage.objects.exists())
+
+
+class TurnLockTests(TestCase):
+    def setUp(self):
+        self.session = make_session(make_user("candidate@example.com"))
+
+    def test_lock_is_exclusive_while_held(self):
+        self.assertTrue(InterviewSession.objects.acquire_turn(self.session, "t1", 60))
+        self.assertFalse(InterviewSession.objects.acquire_turn(self.session, "t2", 60))
+        self.assertFalse(InterviewSession.objects.acquire_turn(self.session, "t1", 60))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.active_turn_id, "t1")
+
+    def test_expired_lock_can_be_taken(self):
+        self.assertTrue(InterviewSession.objects.acquire_turn(self.session, "t1", 60))
+        InterviewSession.objects.filter(pk=self.session.pk).update(
+            turn_lock_expires=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertTrue(InterviewSession.objects.acquire_turn(self.session, "t2", 60))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.active_turn_id, "t2")
+
+    def test_only_the_owner_releases_the_lock(self):
+        InterviewSession.objects.acquire_turn(self.session, "t1", 60)
+        InterviewSession.objects.release_turn(self.session, "t2")
+        self.assertFalse(InterviewSession.objects.acquire_turn(self.session, "t3", 60))
+
+        InterviewSession.objects.release_turn(self.session, "t1")
+        self.session.refresh_from_db()
+        self.assertEqual((self.session.active_turn_id, self.session.turn_lock_expires), ("", None))
+        self.assertTrue(InterviewSession.objects.acquire_turn(self.session, "t3", 60))
+
+    def test_only_the_owner_renews_the_lock(self):
+        InterviewSession.objects.acquire_turn(self.session, "t1", 5)
+        self.assertFalse(InterviewSession.objects.renew_turn(self.session, "t2", 60))
+        self.session.refresh_from_db()
+        self.assertLess(self.session.turn_lock_expires, timezone.now() + timedelta(seconds=10))
+
+        self.assertTrue(InterviewSession.objects.renew_turn(self.session, "t1", 60))
+        self.session.refresh_from_db()
+        self.assertGreater(self.session.turn_lock_expires, timezone.now() + timedelta(seconds=50))
+
+    def test_append_numbers_messages_after_the_last_one(self):
+        InterviewMessage.objects.append(self.session, [{"role": InterviewMessage.ROLE_AI, "content": "Hi"}])
+        rows = InterviewMessage.objects.append(self.session, [
+            {"role": InterviewMessage.ROLE_USER, "content": "A1", "turn_id": "t1"},
+            {"role": InterviewMessage.ROLE_AI, "content": "Q1", "turn_id": "t1"},
+        ])
+        self.assertEqual([row.seq for row in rows], [2, 3])
+        self.assertEqual(self.session.last_message_seq, 3)
+
+    def test_interleaved_appends_get_distinct_ranges(self):
+        # A second turn appends after the first has reserved its range but before it inserts
+        bulk_create = InterviewMessage.objects.bulk_create
+        other = InterviewSession.objects.get(pk=self.session.pk)
+
+        def interleaved(rows):
+            if rows[0].content == "first":
+                InterviewMessage.objects.append(other, [
+                    {"role": InterviewMessage.ROLE_USER, "content": "second"},
+                    {"role": InterviewMessage.ROLE_AI, "content": "second"},
+                ])
+            return bulk_create(rows)
+
+        with mock.patch.object(InterviewMessage.objects, "bulk_create", side_effect=interleaved):
+            InterviewMessage.objects.append(self.session, [
+                {"role": InterviewMessage.ROLE_USER, "content": "first"},
+                {"role": InterviewMessage.ROLE_AI, "content": "first"},
+            ])
+
+        rows = InterviewMessage.objects.filter(session=self.session).order_by("seq")
+        self.assertEqual(
+            [(row.seq, row.content) for row in rows],
+            [(1, "first"), (2, "first"), (3, "second"), (4, "second")],
+        )
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.last_message_seq, 4)
+
+
+# --- 4. Interview Checkpoints ---
+
+class CheckpointSaverTests(TestCase):
+    def setUp(self):
+        self.session = make_session(make_user("candidate@example.com"))
+        self.config = interview_thread_config(self.session)
+
+    def _put(self, saver, config, step, messages):
+        from langgraph.checkpoint.base import empty_checkpoint
+        from langgraph.checkpoint.base.id import uuid6
+
+        checkpoint = empty_checkpoint()
+        checkpoint["id"] = str(uuid6(clock_seq=step))
+        checkpoint["channel_values"] = {"messages": messages, "turn_count": step}
+        return saver.put(config, checkpoint, {"source": "loop", "step": step}, {})
+
+    def test_put_get_list_and_writes_round_trip(self):
+        saver = DjangoCheckpointSaver(keep_last=0)
+        first = self._put(saver, self.config, 0, ["hi"])
+        second = self._put(saver, first, 1, ["hi", "there"])
+        saver.put_writes(second, [("messages", ["next"]), ("turn_count", 2)], task_id="task-1")
+
+        latest = saver.get_tuple(self.config)
+        self.assertEqual(latest.config, second)
+        self.assertEqual(latest.parent_config, first)
+        self.assertEqual(latest.checkpoint["channel_values"], {"messages": ["hi", "there"], "turn_count": 1})
+        self.assertEqual(latest.metadata["step"], 1)
+        self.assertEqual(latest.pending_writes, [("task-1", "messages", ["next"]), ("task-1", "turn_count", 2)])
+
+        self.assertEqual(saver.get_tuple(first).checkpoint["channel_values"]["messages"], ["hi"])
+        self.assertEqual([t.config for t in saver.list(self.config)], [second, first])
+        self.assertEqual([t.config for t in saver.list(self.config, limit=1)], [second])
+        self.assertEqual([t.config for t in saver.list(self.config, before=second)], [first])
+        self.assertEqual([t.config for t in saver.list(self.config, filter={"step": 0})], [first])
+
+    def test_put_twice_updates_the_checkpoint_in_place(self):
+        saver = DjangoCheckpointSaver(keep_last=0)
+        config = self._put(saver, self.config, 0, ["hi"])
+        checkpoint = saver.get_tuple(config).checkpoint
+        checkpoint["channel_values"] = {"messages": ["changed"]}
+        saver.put(self.config, checkpoint, {"source": "update", "step": 0}, {})
+        self.assertEqual(GraphCheckpoint.objects.count(), 1)
+        self.assertEqual(saver.get_tuple(self.config).checkpoint["channel_values"], {"messages": ["changed"]})
+
+    def test_special_writes_replace_the_previous_one(self):
+        from langgraph.constants import ERROR
+
+        saver = DjangoCheckpointSaver(keep_last=0)
+        config = self._put(saver, self.config, 0, ["hi"])
+        saver.put_writes(config, [(ERROR, "first failure")], task_id="task-1")
+        saver.put_writes(config, [(ERROR, "second failure")], task_id="task-1")
+        self.assertEqual(saver.get_tuple(config).pending_writes, [("task-1", ERROR, "second failure")])
+
+    def test_only_the_newest_checkpoints_are_kept(self):
+        saver = DjangoCheckpointSaver(keep_last=2)
+        configs, config = [], self.config
+        for step in range(4):
+            config = self._put(saver, config, step, [f"m{step}"])
+            saver.put_writes(config, [("messages", [f"w{step}"])], task_id=f"task-{step}")
+            configs.append(config)
+
+        self.assertEqual([t.config for t in saver.list(self.config)], [configs[3], configs[2]])
+        kept_ids = {c["configurable"]["checkpoint_id"] for c in configs[2:]}
+        self.assertEqual(set(GraphCheckpointWrite.objects.values_list("checkpoint_id", flat=True)), kept_ids)
+        # Another thread is not pruned by this one
+        other = {"configurable": {"thread_id": "interview-other"}}
+        self._put(saver, other, 0, ["x"])
+        self._put(saver, configs[3], 4, ["m4"])
+        self.assertEqual(len(list(saver.list(other))), 1)
+
+    async def test_thread_started_after_its_first_step(self):
+        saver = DjangoCheckpointSaver(keep_last=0)
+        await sync_to_async(self._put)(saver, self.config, -1, [])
+        self.assertFalse(await ainterview_thread_started(self.session))
+        await sync_to_async(self._put)(saver, self.config, 0, ["hi"])
+        self.assertTrue(await ainterview_thread_started(self.session))
+
+    def test_delete_thread(self):
+        saver = DjangoCheckpointSaver(keep_last=0)
+        config = self._put(saver, self.config, 0, ["hi"])
+        saver.put_writes(config, [("messages", ["w"])], task_id="task-1")
+        saver.delete_thread(self.config["configurable"]["thread_id"])
+        self.assertIsNone(saver.get_tuple(self.config))
+        self.assertFalse(GraphCheckpointWrite.objects.exists())
+
+
+# --- 5. LLM Rate Governor ---
+
+class LLMGovernorTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # One request per minute: after the first call the next one needs a 60 s wait
+        self.governor = LLMGovernor(f"{directory}/governor.sqlite3", rpm=1, tpm=0, reserve=0.0,
+                                    max_wait=120.0, chat_max_wait=0.5)
+        self.governor.acquire(100, priority=PRIORITY_BATCH)
+
+    def test_chat_calls_give_up_after_the_chat_max_wait(self):
+        started = time.monotonic()
+        with self.assertRaises(LLMBudgetTimeout):
+            self.governor.acquire(100, priority=PRIORITY_CHAT)
+        self.assertLess(time.monotonic() - started, 1.0)
+        # The timed-out call left the waiter queue
+        self.assertFalse(any(self.governor.metrics()["queue_depth"].values()))
+
+    def test_other_calls_wait_up_to_the_governor_max_wait(self):
+        # The 60 s refill is within LLM_GOVERNOR_MAX_WAIT_SECONDS, so the call would queue and sleep
+        with mock.patch("utils.llm_governor.time.sleep", side_effect=InterruptedError) as sleep:
+            with self.assertRaises(InterruptedError):
+                self.governor.acquire(100, priority=PRIORITY_INTERACTIVE)
+        sleep.assert_called_once()
+        with self.assertRaises(LLMBudgetTimeout):
+            self.governor.acquire(100, priority=PRIORITY_INTERACTIVE, timeout=30)
+
+
+# --- 6. LLM Failure Handling ---
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+
+    def open_circuit(self):
+        for _ in range(2):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_consecutive_failures_open_the_circuit(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_lets_one_trial_through_and_its_success_closes(self):
+        self.open_circuit()
+        time.sleep(0.06)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()
+        self.assertTrue(self.breaker.is_open)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_trial_reopens_the_circuit(self):
+        self.open_circuit()
+        time.sleep(0.06)
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+
+class RetryTests(SimpleTestCase):
+    def failing_call(self, calls):
+        def call():
+            calls.append(time.monotonic())
+            raise ConnectionError("connection reset")
+        return call
+
+    def test_retries_stop_at_the_deadline(self):
+        calls = []
+        started = time.monotonic()
+        # The backoff would end after the deadline, so the error is raised at once
+        with mock.patch("utils.resilience.random.uniform", return_value=0.5), deadline(0.2):
+            with self.assertRaises(ConnectionError):
+                call_with_retries(self.failing_call(calls), attempts=5)
+        self.assertEqual(len(calls), 1)
+        self.assertLess(time.monotonic() - started, 0.2)
+
+    def test_no_attempt_after_the_deadline_passed(self):
+        calls = []
+        with deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                call_with_retries(self.failing_call(calls), attempts=5)
+        self.assertEqual(calls, [])
+
+    def test_non_retryable_errors_are_raised_at_once(self):
+        calls = []
+        with self.assertRaises(ConnectionError):
+            call_with_retries(self.failing_call(calls), attempts=5, base_delay=0, retry_if=lambda error: False)
+        self.assertEqual(len(calls), 1)
+
+    def test_transient_errors_are_retried_up_to_the_attempts(self):
+        calls = []
+        with self.assertRaises(ConnectionError):
+            call_with_retries(self.failing_call(calls), attempts=3, base_delay=0)
+        self.assertEqual(len(calls), 3)
+
+
+class StageFallbackTests(SimpleTestCase):
+    def test_jd_parse_falls_back_to_the_heuristic_parse(self):
+        chain = mock.Mock()
+        chain.invoke.side_effect = RuntimeError("provider down")
+        with mock.patch("utils.resume_analysis.get_jd_parser_chain", return_value=chain):
+            results = run_stage_graph(build_analysis_stages(jd_text=JD_TEXT), targets=["parsed_jd"])
+        chain.invoke.assert_called_once()
+        self.assertEqual(results["parsed_jd"], heuristic_parse_job_description(JD_TEXT))
+        self.assertEqual(results["degraded"], ["parsed_jd"])
+
+    def test_slow_stage_falls_back_at_its_timeout(self):
+        stages = [
+            Stage("slow", lambda results: time.sleep(1) or "llm", timeout=0.05, fallback=lambda results: "heuristic"),
+            Stage("after", lambda results: results["slow"].upper(), ("slow",)),
+        ]
+        started = time.monotonic()
+        results = run_stage_graph(stages)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual((results["slow"], results["after"]), ("heuristic", "HEURISTIC"))
+        self.assertEqual(results["degraded"], ["slow"])
+
+    def test_stage_without_fallback_raises(self):
+        stages = [Stage("broken", mock.Mock(side_effect=ValueError("bad input")))]
+        with self.assertRaises(ValueError):
+            run_stage_graph(stages)
+
+
+# --- 7. LLM Client ---
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """Answers every chat completion request; HTTP/1.1, so clients keep the connection alive."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "test",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(LLM_RETRY_ATTEMPTS=1)
+class GroqClientTests(SimpleTestCase):
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroqHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        environ = {"GROQ_API_BASE": f"http://127.0.0.1:{server.server_port}", "GROQ_API_KEY": "test"}
+        patcher = mock.patch.dict(os.environ, environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_async_turns_on_separate_event_loops(self):
+        from utils.llm import groq_backend
+        model = groq_backend(0)
+        # Under WSGI every async view call runs on a new event loop (async_to_sync)
+        for _ in range(2):
+            self.assertEqual(async_to_sync(model.ainvoke)("Hi").content, "Hello")
+
+    def test_connection_pool_per_event_loop(self):
+        from utils.llm import get_async_http_client
+
+        async def pools():
+            return get_async_http_client(), get_async_http_client()
+
+        first, again = async_to_sync(pools)()
+        self.assertIs(first, again)
+        self.assertIsNot(async_to_sync(pools)()[0], first)
+
+
+class RecordReplayTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def model(self, mode, **fields):
+        from utils.llm import FakeChatModel, RecordReplayChatModel
+        inner = FakeChatModel() if mode == "record" else None
+        return RecordReplayChatModel(mode=mode, directory=self.directory, inner=inner, **fields)
+
+    def test_request_key_ignores_message_ids(self):
+        from langchain_core.messages import HumanMessage, SystemMessage
+        from utils.llm import request_key
+        first = [SystemMessage(content="Be brief", id="a"), HumanMessage(content="Hi", id="b")]
+        again = [SystemMessage(content="Be brief", id="c"), HumanMessage(content="Hi", id="d")]
+        self.assertEqual(request_key(first), request_key(again))
+        self.assertNotEqual(request_key(first), request_key(first[:1]))
+        self.assertNotEqual(request_key(first), request_key(first, stop=["\n"]))
+        self.assertNotEqual(request_key(first), request_key(first, tool_choice="required"))
+
+    def test_replays_what_was_recorded(self):
+        from utils.llm import ReplayMissError
+        recorded = self.model("record").invoke("Tell me about your last project")
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+        replay = self.model("replay", latency_ms=0)
+        self.assertEqual(replay.invoke("Tell me about your last project").content, recorded.content)
+        self.assertEqual(async_to_sync(replay.ainvoke)("Tell me about your last project").content, recorded.content)
+        with self.assertRaises(ReplayMissError):
+            replay.invoke("A question never recorded")
+
+
+# --- 8. Skill Matching ---
+
+class SkillMatcherTests(SimpleTestCase):
+    def setUp(self):
+        from utils.skill_matcher import get_skill_matcher
+        self.matcher = get_skill_matcher()
+
+    def statuses(self, resume_skills, jd_skills):
+        return {d["requirement"]: (d["status"], d["source"])
+                for d in self.matcher.resolve(resume_skills, jd_skills)}
+
+    def test_resolves_synonyms_implied_and_fuzzy_skills(self):
+        statuses = self.statuses(
+            ["PyTorch", "Postgres", "Kubernetes Operators", "ReactJS"],
+            ["Python", "PostgreSQL", "Kubernetes operator", "React.js", "Go", "Quantum Basket Weaving"],
+        )
+        self.assertEqual(statuses["Python"], ("matched", "taxonomy"))
+        self.assertEqual(statuses["PostgreSQL"], ("matched", "taxonomy"))
+        self.assertEqual(statuses["Kubernetes operator"], ("matched", "fuzzy"))
+        self.assertEqual(statuses["React.js"], ("matched", "taxonomy"))
+        self.assertEqual(statuses["Go"][0], "missing")
+        self.assertEqual(statuses["Quantum Basket Weaving"][0], "unresolved")
+
+    def test_distinct_known_skills_never_fuzzy_match(self):
+        statuses = self.statuses(["Programming"], ["R programming"])
+        self.assertEqual(statuses["R programming"][0], "missing")
+
+    def test_canonicalize(self):
+        self.assertEqual(self.matcher.canonicalize("Tensorflow 2"), "TensorFlow")
+        self.assertEqual(self.matcher.canonicalize("tensor flow"), "TensorFlow")
+        self.assertIsNone(self.matcher.canonicalize(""))
+        self.assertIsNone(self.matcher.canonicalize("zzzz"))
+
+
+class SkillIndexTests(SimpleTestCase):
+    def setUp(self):
+        from utils.skill_index import get_skill_index
+        self.index = get_skill_index()
+
+    def test_compact_key_keeps_plus_and_hash(self):
+        from utils.skill_index import compact_key
+        self.assertEqual(compact_key(" Node.JS "), "nodejs")
+        self.assertEqual(compact_key("C++"), "c++")
+        self.assertEqual(compact_key("C#"), "c#")
+
+    def test_lookup_aliases(self):
+        self.assertEqual(self.index.lookup("postgres"), "PostgreSQL")
+        self.assertEqual(self.index.lookup("Node JS"), "Node.js")
+        self.assertIsNone(self.index.lookup("Quantum Basket Weaving"))
+
+    def test_normalize_list_dedupes_and_drops_blanks(self):
+        normalized = self.index.normalize_list(["postgres", "PostgreSQL", "Foo Bar", "  ", "k8s"])
+        self.assertEqual(normalized, ["PostgreSQL", "Foo Bar", "Kubernetes"])
+
+    def test_scan_skips_common_words_when_strict(self):
+        self.assertEqual(self.index.scan("Scheduled jobs in Airflow and wrote Go services"), ["Airflow"])
+        self.assertEqual(self.index.scan("Built in Go", strict=False), ["Go"])
+
+
+# --- 9. Parsed Resume Cache ---
+
+@override_settings(RESUME_CACHE_MAX_BYTES=10 ** 6, RESUME_CACHE_MAX_AGE_DAYS=30)
+class ResumeCacheEvictionTests(TestCase):
+    def add_entry(self, file_hash, size_bytes=100, days_unused=0, parser_version=None):
+        from utils.resume_parser import PARSER_VERSION
+        entry = ParsedResumeCache.objects.create(
+            file_hash=file_hash, parser_version=parser_version or PARSER_VERSION,
+            parsed_data={"skills": []}, size_bytes=size_bytes,
+        )
+        ParsedResumeCache.objects.filter(pk=entry.pk).update(
+            last_used_at=timezone.now() - timedelta(days=days_unused)
+        )
+        return entry
+
+    def test_store_then_hit(self):
+        store_parsed_resume("a" * 64, {"skills": ["Python"]})
+        self.assertEqual(get_cached_resume("a" * 64), {"skills": ["Python"]})
+        self.assertIsNone(get_cached_resume("b" * 64))
+        self.assertEqual(ParsedResumeCache.objects.get().hit_count, 1)
+
+    def test_drops_old_parser_versions_and_stale_entries(self):
+        self.add_entry("old-version", parser_version="resume-v0")
+        self.add_entry("stale", days_unused=31)
+        self.add_entry("fresh", days_unused=29)
+        self.assertEqual(evict_resume_cache(), 2)
+        self.assertEqual(list(ParsedResumeCache.objects.values_list("file_hash", flat=True)), ["fresh"])
+
+    def test_evicts_least_recently_used_above_byte_budget(self):
+        for days_unused, file_hash in enumerate(["newest", "middle", "oldest"]):
+            self.add_entry(file_hash, size_bytes=100, days_unused=days_unused)
+        self.assertEqual(evict_resume_cache(max_bytes=150), 2)
+        self.assertEqual(list(ParsedResumeCache.objects.values_list("file_hash", flat=True)), ["newest"])
+        self.assertEqual(evict_resume_cache(max_bytes=150), 0)
+
+
+# --- 10. Re-scoring ---
+
+class RescoreTests(TestCase):
+    def setUp(self):
+        from utils.resume_analysis import match_skill_details
+        self.analysis = make_session(make_user("candidate@example.com")).analysis
+        InterviewSession.objects.filter(analysis=self.analysis).delete()
+        parsed_jd = heuristic_parse_job_description(JD_TEXT)
+        store_parsed_job_description(self.analysis.job_posting, parsed_jd)
+        skills = ["Python", "Django"]
+        # PostgreSQL is the one missing requirement of four: Skill_Match 75, Impact_Score 50
+        ResumeAnalysis.objects.filter(pk=self.analysis.pk).update(
+            parsed_resume_data={"skills": skills, "work_experience": []},
+            skill_details=match_skill_details(skills, parsed_jd.required_skills, llm_fallback=False),
+            impact_score=50,
+            overall_match_score=60.0,
+        )
+
+    def rescore(self, **weights):
+        stats = rescore_analyses(ResumeAnalysis.objects.all(), weights=weights, llm_fallback=False)
+        self.analysis.refresh_from_db()
+        return stats
+
+    def test_weights_are_normalized_and_matches_reused(self):
+        stats = self.rescore(skills=1, impact=1)
+        self.assertEqual((stats["scored"], stats["rematched_requirements"]), (1, 0))
+        self.assertEqual(self.analysis.overall_match_score, 62.5)
+        self.assertEqual(self.analysis.section_match_score, {"Skill_Match": 75.0, "Impact_Score": 50.0})
+        self.assertEqual(self.analysis.missing_keywords, ["PostgreSQL"])
+
+    def test_crossing_the_threshold_unlocks_the_interview(self):
+        self.assertEqual(self.rescore(skills=1, impact=0)["unlocked"], 1)
+        self.assertEqual(self.analysis.overall_match_score, 75.0)
+        self.assertTrue(InterviewSession.objects.filter(analysis=self.analysis).exists())
+        self.assertEqual(self.analysis.latest_job(AnalysisJob.KIND_GREETING).status, AnalysisJob.STATUS_QUEUED)
+        # Already unlocked: nothing new on the next run
+        self.assertEqual(self.rescore(skills=1, impact=0)["unlocked"], 0)
+        self.assertEqual(AnalysisJob.objects.filter(kind=AnalysisJob.KIND_GREETING).count(), 1)
+
+    def test_batch_analyses_stay_locked(self):
+        batch = AnalysisBatch.objects.create(
+            user=self.analysis.user, job_title="Backend", job_posting=self.analysis.job_posting
+        )
+        ResumeAnalysis.objects.filter(pk=self.analysis.pk).update(batch=batch)
+        self.assertEqual(self.rescore(skills=1, impact=0)["unlocked"], 0)
+        self.assertFalse(InterviewSession.objects.exists())
+
+
+# --- 11. Interview Memory ---
+
+class InterviewMemoryTests(SimpleTestCase):
+    def window(self, count, chars=2000):
+        return [{"role": "user" if i % 2 else "ai", "content": f"{i}" * chars} for i in range(count)]
+
+    def test_window_within_budget_is_not_folded(self):
+        from utils.interview_memory import fold_point, update_memory
+        self.assertEqual(fold_point(self.window(2), budget=1500), 0)
+        chain = mock.Mock()
+        self.assertEqual(update_memory(self.window(2), "notes", chain=chain), ("notes", 0))
+        chain.invoke.assert_not_called()
+
+    def test_overflow_folds_down_to_the_ratio_but_keeps_the_last_exchange(self):
+        from utils.interview_memory import count_tokens, fold_point, to_langchain_messages
+        window = self.window(5)  # about 500 tokens per message
+        folded = fold_point(window, budget=1500, fold_ratio=0.5)
+        self.assertEqual(folded, 3)
+        self.assertLessEqual(count_tokens(to_langchain_messages(window[folded:])), 1500)
+        self.assertEqual(fold_point(window, budget=100, fold_ratio=0.5), 3)
+
+    def test_only_folded_messages_are_summarized(self):
+        from utils.interview_memory import aupdate_memory, update_memory
+        window = self.window(5)
+        chain = mock.Mock(**{"invoke.return_value": " new notes \n", "ainvoke": mock.AsyncMock(return_value="async notes")})
+        self.assertEqual(update_memory(window, None, chain=chain), ("new notes", 3))
+        prompt_input = chain.invoke.call_args.args[0]
+        self.assertEqual(prompt_input["summary"], "(none yet)")
+        self.assertIn("Interviewer: " + "2" * 2000, prompt_input["transcript"])
+        self.assertNotIn("3" * 2000, prompt_input["transcript"])
+        self.assertEqual(async_to_sync(aupdate_memory)(window, "old notes", chain=chain), ("async notes", 3))
+        self.assertEqual(chain.ainvoke.call_args.args[0]["summary"], "old notes")
+
+
+# --- 12. Feedback Reports ---
+
+class FeedbackReportTests(SimpleTestCase):
+    REPORT = (
+        "# FEEDBACK REPORT\n**Candidate:** Jane Doe | **Role:** Backend\n\n"
+        "## **DECISION:** Selected\n\n---\n\n"
+        "## ROUND 1: TECHNICAL (6.5/10)\n\n**Strong:** ...\n\n---\n\n"
+        "## ROUND 2: DSA ( 12 / 10 )\n\n**Problem:** Two sum\n"
+    )
+
+    def test_parses_decision_and_round_scores(self):
+        from utils.feedback_report import parse_feedback_report
+        feedback = parse_feedback_report(self.REPORT)
+        self.assertEqual(feedback["report"], self.REPORT)
+        self.assertEqual(feedback["decision"], "SELECTED")
+        # Scores are capped at 10
+        self.assertEqual(feedback["scores"], {"technical": 6.5, "dsa": 10.0})
+
+    def test_ambiguous_or_missing_parts_are_left_out(self):
+        from utils.feedback_report import parse_feedback_report
+        feedback = parse_feedback_report("## DECISION: SELECTED / REJECTED\n## ROUND 1: TECHNICAL (X/10)")
+        self.assertEqual((feedback["decision"], feedback["scores"]), (None, {}))
+        self.assertIsNone(parse_feedback_report(None)["decision"])
+
+
+# --- 13. PDF Extraction Pool ---
+
+class PDFPoolTests(SimpleTestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".pdf")
+        os.write(handle, b"not a pdf")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def pool(self, **options):
+        from utils.pdf_pool import PDFProcessPool
+        pool = PDFProcessPool(size=1, **options)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def assert_worker_killed(self, pool, code):
+        from utils.pdf_pool import PDFExtractionError
+        with self.assertRaises(PDFExtractionError) as failure:
+            pool.extract(self.path)
+        self.assertEqual(failure.exception.code, code)
+        killed = pool._slots.get_nowait()
+        self.assertFalse(killed.process.is_alive())
+        pool._slots.put(killed)
+
+    def test_timeout_kills_the_worker(self):
+        pool = self.pool(timeout=0.01)
+        self.assert_worker_killed(pool, "timeout")
+
+    def test_rss_limit_kills_the_worker(self):
+        from utils.pdf_pool import PDFExtractionError
+        pool = self.pool(rss_limit_mb=1)
+        self.assert_worker_killed(pool, "memory")
+        # The next job gets a fresh worker, which reports the unreadable file itself
+        pool.rss_limit_mb, pool.timeout = 10 ** 6, 60
+        with self.assertRaises(PDFExtractionError) as failure:
+            pool.extract(self.path)
+        self.assertEqual(failure.exception.code, "invalid_pdf")
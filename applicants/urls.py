@@ -1,8 +1,17 @@
 from django.urls import path,include
-from .views import dashboard, resumeanalysis, chat_api, interview_room
+from .views import dashboard, resumeanalysis, analysis_status, batch_upload, batch_detail, batch_status, chat_api, chat_stream, interview_room, interview_greeting_status, interview_feedback, interview_feedback_status, llm_governor_status
 urlpatterns = [
     path('',dashboard,name='dashboard'),
     path('uploaddocument/',resumeanalysis,name='upload'),
+    path('analysis/<int:analysis_id>/status/',analysis_status,name='analysis_status'),
+    path('batch/',batch_upload,name='batch_upload'),
+    path('batch/<int:batch_id>/',batch_detail,name='batch_detail'),
+    path('batch/<int:batch_id>/status/',batch_status,name='batch_status'),
+    path('llm/status/',llm_governor_status,name='llm_governor_status'),
     path('interview/api/<int:analysis_id>/',chat_api, name='chat_api'),
+    path('interview/api/<int:analysis_id>/stream/',chat_stream, name='chat_stream'),
     path('interview/<int:analysis_id>/', interview_room, name='interview_room'),
+    path('interview/<int:analysis_id>/greeting/status/', interview_greeting_status, name='interview_greeting_status'),
+    path('interview/<int:analysis_id>/feedback/', interview_feedback, name='interview_feedback'),
+    path('interview/<int:analysis_id>/feedback/status/', interview_feedback_status, name='interview_feedback_status'),
 ]
\ No newline at end of file
@@ -1,24 +1,35 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.contrib.auth.decorators import login_required
+from django.urls import reverse
+from django.http import JsonResponse, StreamingHttpResponse, Http404
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from .models import ResumeAnalysis, InterviewSession
-# Importing your existing utility functions
-from utils.resume_analysis import extract_text_from_pdf, analyze_resume_compatibility, parse_job_description
-from utils.resume_parser import parse_resume_content
+from asgiref.sync import sync_to_async
+from .models import ResumeAnalysis, InterviewSession, InterviewMessage, AnalysisJob, JobDescription, AnalysisBatch
+from .task import enqueue_job, ensure_interview_greeting, interview_unlocked, INTERVIEW_CLOSING_MESSAGE
+from .batch import BatchUploadError, create_batch, iter_zip_resumes, batch_progress, ranked_results
 # Import the new agent builder from Step 1
-from utils.interview_agent import build_interview_graph
-from langchain_core.messages import HumanMessage, AIMessage
+from utils.interview_memory import aupdate_memory, count_tokens, to_langchain_messages, from_langchain_messages
+from utils.candidate_brief import build_candidate_brief, brief_is_current
+from utils.llm_governor import PRIORITY_CHAT, get_llm_governor, llm_priority
+import asyncio
+import contextlib
 import json
+import time
+import uuid
 
 @login_required(login_url='login')
 def dashboard(request):
     """
     Existing dashboard view to show the latest analysis.
     """
-    latest_analysis = request.user.resume_analysis.last()
+    latest_analysis = request.user.resume_analysis.filter(batch__isnull=True).last()
     if latest_analysis:
+        # Show a "processing" screen until the background job has finished
+        job = latest_analysis.latest_job(AnalysisJob.KIND_ANALYZE)
+        if job and job.status != AnalysisJob.STATUS_DONE:
+            return render(request, "applicants/processing.html", {"analysis": latest_analysis, "job": job})
+
         context = {
             "analysis": latest_analysis,
             "resume": latest_analysis.parsed_resume_data 
@@ -30,7 +41,8 @@ def dashboard(request):
 @login_required(login_url='login') 
 def resumeanalysis(request):
     """
-    Handles Resume Upload, Analysis, and triggers Interview if qualified.
+    Handles Resume Upload and queues the Analysis job.
+    The job triggers the Interview if the candidate qualifies.
     """
     if request.method == "POST":
         job_title = request.POST.get("job_title")
@@ -45,160 +57,514 @@ def resumeanalysis(request):
         analysis = ResumeAnalysis.objects.create(
             user=request.user,
             job_title=job_title,
-            job_description=job_description,
+            job_posting=JobDescription.objects.get_or_create_from_text(job_description),
             resume_file=resume_file
         )
 
-        try:
-            # 2. Extract Text
-            raw_text = extract_text_from_pdf(analysis.resume_file.path)
-            
-            # 3. Parse Resume (AI Extraction)
-            print("Parsing Resume...")
-            structured_data = parse_resume_content(raw_text)
-            analysis.parsed_resume_data = structured_data
-            
-            # 4. Analyze (Comparison & Heuristics)
-            print("Analyzing Compatibility...")
-            results = analyze_resume_compatibility(structured_data, analysis.job_description)
-            
-            # 5. Save Results
-            analysis.overall_match_score = results["overall_match_score"]
-            analysis.section_match_score = results["section_match_score"]
-            analysis.missing_keywords = results["missing_keywords"]
-            analysis.improved_suggestion = results["improved_suggestion"]
-            
-            analysis.save()
-
-            # --- NEW: Check Score & Trigger Simulation ---
-            if analysis.overall_match_score >= 70.0:
-                # Create an Interview Session
-                InterviewSession.objects.create(
-                    user=request.user,
-                    analysis=analysis,
-                    chat_history=[], # Start empty
-                    current_stage="hr_agent"
-                )
-                messages.success(request, f"Great Score ({analysis.overall_match_score}%)! You've qualified for the AI Interview.")
-                return redirect('dashboard')
-            
-            messages.success(request, "Analysis Successful!")
-            return redirect('dashboard')
-            
-        except Exception as e:
-            print(f"Error: {e}")
-            messages.error(request, f"An error occurred: {str(e)}")
-            return redirect('upload')
+        # 2. Hand the heavy lifting (PDF extraction + LLM calls) to the background workers
+        enqueue_job(analysis)
+        messages.success(request, "Resume uploaded! Your analysis is being processed.")
+        return redirect('dashboard')
         
     else:
         return render(request, "applicants/upload.html")
 
-# ... imports ...
-
 @login_required(login_url='login')
-def interview_room(request, analysis_id):
+def analysis_status(request, analysis_id):
+    """
+    Polling endpoint used by the processing screen.
+    """
     analysis = get_object_or_404(ResumeAnalysis, id=analysis_id, user=request.user)
+    job = analysis.latest_job(AnalysisJob.KIND_ANALYZE)
+
+    return JsonResponse({
+        "status": job.status if job else AnalysisJob.STATUS_DONE,
+        "error": job.error if job else None,
+        "overall_match_score": analysis.overall_match_score,
+        "interview_unlocked": interview_unlocked(analysis),
+        # Heuristic-only score, re-run with the LLM once it is available again
+        "needs_refinement": analysis.needs_refinement,
+    })
+
+@login_required(login_url='login')
+def interview_feedback(request, analysis_id):
+    """
+    Feedback report page. Shows a waiting screen that polls interview_feedback_status
+    until the background job has written the report.
+    """
+    session = get_object_or_404(
+        InterviewSession.objects.select_related('analysis'), analysis_id=analysis_id, analysis__user=request.user
+    )
+    return render(request, "applicants/feedback.html", {
+        "analysis": session.analysis,
+        "session": session,
+        "job": session.analysis.latest_job(AnalysisJob.KIND_FEEDBACK),
+    })
+
+@login_required(login_url='login')
+def interview_feedback_status(request, analysis_id):
+    """Polling endpoint for the feedback report."""
+    session = get_object_or_404(InterviewSession, analysis_id=analysis_id, analysis__user=request.user)
+    job = session.analysis.latest_job(AnalysisJob.KIND_FEEDBACK)
+    feedback = session.interview_feedback or {}
+
+    return JsonResponse({
+        "status": job.status if job else None,
+        "error": job.error if job else None,
+        "verdict": session.verdict,
+        "scores": feedback.get("scores", {}),
+        "report": feedback.get("report"),
+    })
+
+@login_required(login_url='login')
+@user_passes_test(lambda user: user.is_staff, login_url='login')
+def batch_upload(request):
+    """
+    Recruiter batch mode: a ZIP of resumes ranked against one job description.
+    """
+    if request.method == "POST":
+        job_title = request.POST.get("job_title")
+        job_description = request.POST.get("job_description")
+        resume_zip = request.FILES.get("resume_zip")
+
+        if not job_description or not resume_zip or not job_title:
+            messages.error(request, "All fields are required")
+            return redirect('batch_upload')
+
+        try:
+            batch = create_batch(
+                request.user, job_title, job_description,
+                iter_zip_resumes(resume_zip), source_name=resume_zip.name
+            )
+        except BatchUploadError as e:
+            messages.error(request, str(e))
+            return redirect('batch_upload')
+
+        messages.success(request, f"Batch created with {batch.analyses.count()} resumes.")
+        return redirect('batch_detail', batch_id=batch.id)
+
+    return render(request, "applicants/batch_upload.html")
+
+@login_required(login_url='login')
+@user_passes_test(lambda user: user.is_staff, login_url='login')
+def batch_detail(request, batch_id):
+    batch = get_object_or_404(AnalysisBatch, id=batch_id, user=request.user)
+    return render(request, "applicants/batch_detail.html", {
+        "batch": batch,
+        "progress": batch_progress(batch),
+        "results": ranked_results(batch),
+    })
+
+# Rows of the ranking returned by batch_status (?limit=, clamped to 1..BATCH_STATUS_MAX_LIMIT)
+BATCH_STATUS_DEFAULT_LIMIT = 50
+BATCH_STATUS_MAX_LIMIT = 500
+
+@login_required(login_url='login')
+@user_passes_test(lambda user: user.is_staff, login_url='login')
+def batch_status(request, batch_id):
+    """
+    Polling endpoint: progress counters plus the current top of the ranking.
+    """
+    batch = get_object_or_404(AnalysisBatch, id=batch_id, user=request.user)
+    try:
+        limit = int(request.GET.get("limit", BATCH_STATUS_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = BATCH_STATUS_DEFAULT_LIMIT
+    return JsonResponse({
+        "progress": batch_progress(batch),
+        "results": ranked_results(batch, limit=min(max(limit, 1), BATCH_STATUS_MAX_LIMIT)),
+    })
+
+@login_required(login_url='login')
+@user_passes_test(lambda user: user.is_staff, login_url='login')
+def llm_governor_status(request):
+    """LLM rate budgets, queue depth and wait times per priority (see utils/llm_governor.py)."""
+    governor = get_llm_governor()
+    return JsonResponse(governor.metrics() if governor else {"enabled": False})
+
+@login_required(login_url='login')
+async def interview_room(request, analysis_id):
+    """
+    Served from the database only: the greeting is written by a background job queued when
+    the session was created (generate_interview_greeting). Until it is there, the page
+    polls interview_greeting_status.
+    """
+    user = await request.auser()
+    try:
+        analysis = await ResumeAnalysis.objects.select_related('job_posting').aget(id=analysis_id, user=user)
+    except ResumeAnalysis.DoesNotExist:
+        raise Http404("Analysis not found")
     
     if analysis.overall_match_score < 40.0:
         messages.error(request, "Interview locked. Score must be >= 70%.")
         return redirect('dashboard')
 
     # Get or Create Session
-    session, created = InterviewSession.objects.get_or_create(
+    session, created = await InterviewSession.objects.select_related('analysis').aget_or_create(
         analysis=analysis,
         defaults={
-            'user': request.user,
-            'chat_history': [],
+            'user': user,
+            'candidate_brief': build_candidate_brief(analysis.parsed_resume_data),
             'current_stage': 'hr_agent'
         }
     )
 
-    # --- NEW: TRIGGER AGENT GREETING IF HISTORY IS EMPTY ---
-    if not session.chat_history:
-        # 1. Prepare State with a hidden system trigger
-        resume_data = analysis.parsed_resume_data or {}
-        
-        # We send a hidden message "Start Interview" to wake up the agent
-        # But we WON'T save this "Start Interview" text to the DB, so the user only sees the greeting.
-        lc_messages = [HumanMessage(content="Hello, I am ready for the interview. Please introduce yourself.")]
-
-        initial_state = {
-            "messages": lc_messages,
-            "full_name": resume_data.get("full_name", "Candidate"),
-            "job_description": analysis.job_description,
-            "workexperience": resume_data.get("work_experience", []),
-            "projects": resume_data.get("projects", [])
-        }
-
-        # 2. Run Graph
-        app = build_interview_graph()
-        result_state = app.invoke(initial_state)
-        ai_response = result_state["messages"][-1].content
-
-        # 3. Save ONLY the AI's greeting to DB
-        session.chat_history.append({"role": "ai", "content": ai_response})
-        session.save()
+    chat_history = [msg async for msg in session.messages.values('role', 'content')]
+    if not chat_history:
+        # Sessions created here (or whose greeting job failed) get it queued now
+        await sync_to_async(ensure_interview_greeting)(session)
     
-    return render(request, "applicants/interview_room.html", {
+    # Templates read request.user (lazy, sync DB access), so render in a thread
+    return await sync_to_async(render)(request, "applicants/interview_room.html", {
         "analysis": analysis,
-        "chat_history": session.chat_history
+        "chat_history": chat_history,
+        "greeting_pending": not chat_history,
     })  
+
+@login_required(login_url='login')
+def interview_greeting_status(request, analysis_id):
+    """Polling endpoint for the interviewer's first message."""
+    session = get_object_or_404(InterviewSession, analysis_id=analysis_id, analysis__user=request.user)
+    greeting = session.messages.filter(role=InterviewMessage.ROLE_AI).values_list('content', flat=True).first()
+    job = session.analysis.latest_job(AnalysisJob.KIND_GREETING)
+
+    return JsonResponse({
+        "status": job.status if job else None,
+        "error": job.error if job else None,
+        "greeting": greeting,
+    })
     
-@csrf_exempt
+async def _candidate_brief(analysis, session):
+    """The session's compact resume context; built and stored on first use for older sessions."""
+    if not brief_is_current(session.candidate_brief):
+        session.candidate_brief = build_candidate_brief(analysis.parsed_resume_data)
+        await session.asave(update_fields=['candidate_brief'])
+    return session.candidate_brief
+
+async def _interview_input(analysis, session, user_message):
+    """
+    Graph input for one interview turn, run on the session's checkpointed thread
+    (applicants/checkpoint.py). Normally just the new message and the turn number: the rest
+    of the state is loaded from the latest checkpoint. The first turn of a thread also seeds
+    it with the candidate brief, the rolling summary and the unsummarized message window.
+    Call _candidate_brief() first.
+    """
+    # The interview stack (LangGraph, LangChain) is imported on the first turn, not at URLconf load
+    from langchain_core.messages import HumanMessage
+    from .checkpoint import ainterview_thread_started
+
+    answered = await session.messages.filter(role=InterviewMessage.ROLE_USER).acount()
+    turn = answered + 1
+    # Stable id: if a turn fails and is retried, the retry replaces the stranded message
+    message = HumanMessage(content=user_message, id=f"turn-{turn}")
+    if await ainterview_thread_started(session):
+        return {"messages": [message], "turn_count": turn}
+
+    window = [
+        msg async for msg in
+        InterviewMessage.objects.window(session, session.memory_summarized_seq).values('role', 'content')
+    ]
+    brief = session.candidate_brief
+    return {
+        "messages": to_langchain_messages(window) + [message],
+        "conversation_summary": session.memory_summary,
+        "turn_count": turn,
+        "full_name": brief["full_name"],
+        "job_description": analysis.job_description,
+        "workexperience": brief["workexperience"],
+        "projects": brief["projects"]
+    }
+
+def _user_row(content, turn_id):
+    return {
+        "role": InterviewMessage.ROLE_USER,
+        "content": content,
+        "turn_id": turn_id,
+        "token_count": count_tokens([("human", content)]),
+    }
+
+def _ai_row(content, started, turn_id):
+    """Row for an interviewer reply; `started` is the perf_counter() value before the LLM call."""
+    return {
+        "role": InterviewMessage.ROLE_AI,
+        "content": content,
+        "turn_id": turn_id,
+        "token_count": count_tokens([("ai", content)]),
+        "latency_ms": round((time.perf_counter() - started) * 1000),
+    }
+
+# How often a request waiting for the session's turn lock checks it again
+TURN_LOCK_POLL_SECONDS = 0.25
+
+def _turn_id(data):
+    """The client's id for this chat turn; requests without one get a fresh id (no deduplication)."""
+    turn_id = data.get("turn_id")
+    if not isinstance(turn_id, str) or not turn_id.strip() or len(turn_id) > 64:
+        return uuid.uuid4().hex
+    return turn_id.strip()
+
+async def _claim_turn(session, turn_id):
+    """
+    Serializes the turns of a session: waits (up to INTERVIEW_TURN_LOCK_SECONDS) for its
+    turn lock. Returns (reply, locked):
+    * (InterviewMessage, False): `turn_id` was already answered, e.g. a double click or a
+      client retry. Nothing to run; send the stored reply again.
+    * (None, True): the lock is held for this turn. Release it with arelease_turn().
+    * (None, False): another turn kept the session busy for too long.
+    """
+    deadline = time.monotonic() + settings.INTERVIEW_TURN_LOCK_SECONDS
+    while True:
+        if await InterviewSession.objects.aacquire_turn(session, turn_id, settings.INTERVIEW_TURN_LOCK_SECONDS):
+            # The turn may have finished between the previous check and the claim
+            reply = await InterviewMessage.objects.areply_for(session, turn_id)
+            if reply is None:
+                return None, True
+            await InterviewSession.objects.arelease_turn(session, turn_id)
+            return reply, False
+
+        reply = await InterviewMessage.objects.areply_for(session, turn_id)
+        if reply is not None:
+            return reply, False
+        if time.monotonic() >= deadline:
+            return None, False
+        await asyncio.sleep(TURN_LOCK_POLL_SECONDS)
+
+def _replayed(analysis, session, reply):
+    """JSON payload for a turn that was already answered."""
+    payload = {"response": reply.content, "replayed": True}
+    if session.current_stage == InterviewSession.STAGE_FEEDBACK:
+        payload["feedback_url"] = reverse('interview_feedback', args=[analysis.id])
+    return payload
+
+TURN_BUSY_ERROR = "The previous message is still being answered. Please try again."
+
+class TurnLockLost(RuntimeError):
+    """The turn's lock expired and another request took the session before the turn was done."""
+
+@contextlib.asynccontextmanager
+async def _turn_llm_calls(session, turn_id):
+    """
+    Wraps the LLM calls of a turn (the graph run, the memory update). Renews the turn lock
+    first, so a turn that waits for the rate budget or a slow provider keeps its session,
+    and runs the calls at PRIORITY_CHAT, ahead of queued analyses in the LLM governor.
+    """
+    if not await InterviewSession.objects.arenew_turn(session, turn_id, settings.INTERVIEW_TURN_LOCK_SECONDS):
+        raise TurnLockLost("The turn lock expired before the reply was ready")
+    with llm_priority(PRIORITY_CHAT):
+        yield
+
+async def _advance_memory(session, state, turn_id):
+    """
+    Folds old messages into the summary once the window outgrows its budget. `state` is the
+    graph state after the turn; the folded messages are removed from the thread's checkpoint
+    and the summary is mirrored on the session (read by the feedback job).
+    """
+    from langchain_core.messages import RemoveMessage
+    from utils.interview_agent import supervisor_node
+    from .checkpoint import get_persistent_interview_graph, interview_thread_config
+
+    messages = state["messages"]
+    try:
+        async with _turn_llm_calls(session, turn_id):
+            summary, folded = await aupdate_memory(from_langchain_messages(messages), state.get("conversation_summary"))
+    except Exception as e:
+        # The window just keeps growing until the next successful update
+        print(f"Memory Update Error: {e}")
+        return
+    if folded:
+        await get_persistent_interview_graph().aupdate_state(
+            interview_thread_config(session),
+            {"messages": [RemoveMessage(id=msg.id) for msg in messages[:folded]], "conversation_summary": summary},
+            as_node=supervisor_node(state),
+        )
+        # The checkpoint window and the transcript after memory_summarized_seq hold the same messages
+        session.memory_summary = summary
+        session.memory_summarized_seq += folded
+        await session.asave(update_fields=['memory_summary', 'memory_summarized_seq'])
+
+async def _finish_interview(analysis, session, user_message, turn_id):
+    """
+    Called instead of the feedback agent: stores the final answer with a fixed closing
+    message and queues the report as a background job. Repeated calls are no-ops.
+    Returns the JSON payload for the client.
+    """
+    if session.current_stage != InterviewSession.STAGE_FEEDBACK:
+        await InterviewMessage.objects.aappend(session, [
+            _user_row(user_message, turn_id),
+            {"role": InterviewMessage.ROLE_AI, "content": INTERVIEW_CLOSING_MESSAGE, "turn_id": turn_id,
+             "token_count": count_tokens([("ai", INTERVIEW_CLOSING_MESSAGE)])},
+        ])
+        session.current_stage = InterviewSession.STAGE_FEEDBACK
+        await session.asave(update_fields=['current_stage'])
+        await sync_to_async(enqueue_job)(analysis, kind=AnalysisJob.KIND_FEEDBACK)
+
+    return {
+        "response": INTERVIEW_CLOSING_MESSAGE,
+        "feedback_url": reverse('interview_feedback', args=[analysis.id]),
+    }
+
 @login_required(login_url='login')
-def chat_api(request, analysis_id):
+async def chat_api(request, analysis_id):
     """
     API to handle chat messages.
     Receives user message -> Updates State -> Runs Agent -> Returns AI Response.
+    Async: while the LLM call is in flight no thread is pinned (under ASGI).
+    Each request carries a client `turn_id`: turns of a session run one at a time, and a
+    repeated turn_id gets the stored reply instead of a second LLM call.
     """
+    from utils.interview_agent import supervisor_node
+    from .checkpoint import get_persistent_interview_graph, interview_thread_config
+
     if request.method == "POST":
         try:
             data = json.loads(request.body)
             user_message = data.get("message")
+            turn_id = _turn_id(data)
             
-            analysis = get_object_or_404(ResumeAnalysis, id=analysis_id, user=request.user)
-            session = get_object_or_404(InterviewSession, analysis=analysis)
-            
-            # 1. Reconstruct Chat History for LangChain
-            lc_messages = []
-            for msg in session.chat_history:
-                if msg['role'] == 'user':
-                    lc_messages.append(HumanMessage(content=msg['content']))
-                else:
-                    lc_messages.append(AIMessage(content=msg['content']))
-            
-            # Add new user message to the history used for the agent
-            lc_messages.append(HumanMessage(content=user_message))
-            
-            # 2. Prepare State for the Graph
-            resume_data = analysis.parsed_resume_data or {}
-            
-            initial_state = {
-                "messages": lc_messages,
-                "full_name": resume_data.get("full_name", "Candidate"),
-                "job_description": analysis.job_description,
-                "workexperience": resume_data.get("work_experience", []),
-                "projects": resume_data.get("projects", [])
-            }
+            user = await request.auser()
+            analysis = await ResumeAnalysis.objects.select_related('job_posting').aget(id=analysis_id, user=user)
+            session = await InterviewSession.objects.aget(analysis=analysis)
+        except (ResumeAnalysis.DoesNotExist, InterviewSession.DoesNotExist):
+            return JsonResponse({"error": "Interview not found"}, status=404)
+        except ValueError:
+            return JsonResponse({"error": "Invalid request"}, status=400)
+        if not user_message:
+            return JsonResponse({"error": "Empty message"}, status=400)
+
+        reply, locked = await _claim_turn(session, turn_id)
+        if reply is not None:
+            await session.arefresh_from_db(fields=['current_stage'])
+            return JsonResponse(_replayed(analysis, session, reply))
+        if not locked:
+            return JsonResponse({"error": TURN_BUSY_ERROR}, status=409)
+
+        try:
+            # 1. Only the new message: the graph loads the rest from the session's checkpoint
+            await session.arefresh_from_db()
+            await _candidate_brief(analysis, session)
+            graph_input = await _interview_input(analysis, session, user_message)
+
+            # The feedback round runs as a background job, not inside this request
+            if session.current_stage == InterviewSession.STAGE_FEEDBACK or supervisor_node(graph_input) == "feedback_agent":
+                return JsonResponse(await _finish_interview(analysis, session, user_message, turn_id))
             
-            # 3. Run Graph
+            # 2. Run Graph
             # This calls the supervisor -> specific agent -> generates ONE response -> END
-            app = build_interview_graph()
-            result_state = app.invoke(initial_state)
+            app = get_persistent_interview_graph()
+            started = time.perf_counter()
+            async with _turn_llm_calls(session, turn_id):
+                result_state = await app.ainvoke(graph_input, interview_thread_config(session))
             
-            # 4. Get AI Response (Last message in the returned state)
+            # 3. Get AI Response (Last message in the returned state)
             ai_message_obj = result_state["messages"][-1]
             ai_response = ai_message_obj.content
             
-            # 5. Update Database with User Input and AI Response
-            session.chat_history.append({"role": "user", "content": user_message})
-            session.chat_history.append({"role": "ai", "content": ai_response})
-            session.save()
+            # 4. Append User Input and AI Response to the transcript (one insert)
+            await InterviewMessage.objects.aappend(
+                session, [_user_row(user_message, turn_id), _ai_row(ai_response, started, turn_id)]
+            )
+            await _advance_memory(session, result_state, turn_id)
             
             return JsonResponse({"response": ai_response})
 
         except Exception as e:
             print(f"Chat Error: {e}")
             return JsonResponse({"error": str(e)}, status=500)
+        finally:
+            await InterviewSession.objects.arelease_turn(session, turn_id)
         
-    return JsonResponse({"error": "Invalid request"}, status=400)
\ No newline at end of file
+    return JsonResponse({"error": "Invalid request"}, status=400)
+
+def _sse(event, data):
+    """Formats one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@login_required(login_url='login')
+async def chat_stream(request, analysis_id):
+    """
+    Streaming variant of chat_api. Sends the reply as Server-Sent Events while the LLM
+    generates it: `token` events with text deltas, then one `done` event with the full
+    response (saved to the session first) and timings, or an `error` event.
+    Async so that under ASGI (config/asgi.py) each chunk is flushed as soon as it arrives.
+    Same turn lock and `turn_id` replay as chat_api; the lock is held until the stream ends.
+    """
+    from langchain_core.messages import AIMessageChunk
+    from utils.interview_agent import supervisor_node
+    from .checkpoint import get_persistent_interview_graph, interview_thread_config
+
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request"}, status=400)
+
+    user = await request.auser()
+    try:
+        data = json.loads(request.body)
+        user_message = data.get("message")
+        turn_id = _turn_id(data)
+        analysis = await ResumeAnalysis.objects.select_related('job_posting').aget(id=analysis_id, user=user)
+        session = await InterviewSession.objects.aget(analysis=analysis)
+    except (ResumeAnalysis.DoesNotExist, InterviewSession.DoesNotExist):
+        raise Http404("Interview not found")
+    except ValueError:
+        return JsonResponse({"error": "Invalid request"}, status=400)
+    if not user_message:
+        return JsonResponse({"error": "Empty message"}, status=400)
+
+    reply, locked = await _claim_turn(session, turn_id)
+    if not locked and reply is None:
+        return JsonResponse({"error": TURN_BUSY_ERROR}, status=409)
+
+    async def replay_stream():
+        await session.arefresh_from_db(fields=['current_stage'])
+        yield _sse("done", _replayed(analysis, session, reply))
+
+    async def event_stream():
+        try:
+            await session.arefresh_from_db()
+            await _candidate_brief(analysis, session)
+            graph_input = await _interview_input(analysis, session, user_message)
+            if session.current_stage == InterviewSession.STAGE_FEEDBACK or supervisor_node(graph_input) == "feedback_agent":
+                # The feedback round runs as a background job, not inside this request
+                yield _sse("done", await _finish_interview(analysis, session, user_message, turn_id))
+                return
+
+            started = time.perf_counter()
+            first_token_ms = None
+            final_state = None
+            try:
+                async with _turn_llm_calls(session, turn_id):
+                    async for mode, payload in get_persistent_interview_graph().astream(
+                        graph_input, interview_thread_config(session), stream_mode=["messages", "values"]
+                    ):
+                        if mode == "values":
+                            final_state = payload
+                            continue
+                        chunk = payload[0]
+                        # Only LLM token chunks; the node's complete AIMessage arrives via "values"
+                        if isinstance(chunk, AIMessageChunk) and chunk.content:
+                            if first_token_ms is None:
+                                first_token_ms = round((time.perf_counter() - started) * 1000)
+                            yield _sse("token", {"text": chunk.content})
+
+                ai_response = final_state["messages"][-1].content
+                await InterviewMessage.objects.aappend(
+                    session, [_user_row(user_message, turn_id), _ai_row(ai_response, started, turn_id)]
+                )
+            except Exception as e:
+                print(f"Chat Stream Error: {e}")
+                yield _sse("error", {"error": str(e)})
+                return
+
+            total_ms = round((time.perf_counter() - started) * 1000)
+            print(f"[interview {analysis.pk}] first token {first_token_ms} ms, full reply {total_ms} ms")
+            yield _sse("done", {"response": ai_response, "ttft_ms": first_token_ms, "total_ms": total_ms})
+            # After the reply is out, so the summary update never delays the candidate
+            await _advance_memory(session, final_state, turn_id)
+        finally:
+            # Also runs when the client disconnects mid-stream; an abandoned response falls back to the lock expiry
+            await InterviewSession.objects.arelease_turn(session, turn_id)
+
+    response = StreamingHttpResponse(replay_stream() if reply is not None else event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -140,4 +140,71 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_PASSWORD')
 
 
 MEDIA_URL='/media/'
-MEDIA_ROOT=BASE_DIR/'media'
\ No newline at end of file
+MEDIA_ROOT=BASE_DIR/'media'
+
+# Background analysis workers (see `python manage.py run_workers`)
+ANALYSIS_WORKER_PROCESSES = int(os.getenv('ANALYSIS_WORKER_PROCESSES', 2))
+ANALYSIS_WORKER_POLL_INTERVAL = float(os.getenv('ANALYSIS_WORKER_POLL_INTERVAL', 1.0))
+ANALYSIS_JOB_MAX_ATTEMPTS = 3
+# RUNNING jobs older than this are assumed to belong to a dead worker and are requeued
+ANALYSIS_JOB_STALE_SECONDS = 15 * 60
+
+# Weights of the overall match score. Change them and run `manage.py rescore_analyses`
+ANALYSIS_SCORE_WEIGHTS = {
+    'skills': float(os.getenv('ANALYSIS_SKILL_WEIGHT', 0.6)),
+    'impact': float(os.getenv('ANALYSIS_IMPACT_WEIGHT', 0.4)),
+}
+
+# Parsed resume cache (keyed by PDF SHA-256 + parser version)
+RESUME_CACHE_MAX_BYTES = int(os.getenv('RESUME_CACHE_MAX_BYTES', 50 * 1024 * 1024))
+RESUME_CACHE_MAX_AGE_DAYS = int(os.getenv('RESUME_CACHE_MAX_AGE_DAYS', 90))
+
+# Recruiter batch uploads
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', 1000))
+BATCH_MAX_FILE_BYTES = int(os.getenv('BATCH_MAX_FILE_BYTES', 10 * 1024 * 1024))
+
+# LangGraph checkpoints of interview sessions (applicants/checkpoint.py); older ones are pruned
+INTERVIEW_CHECKPOINTS_KEPT = int(os.getenv('INTERVIEW_CHECKPOINTS_KEPT', 4))
+# Interview turns run one at a time per session; a crashed turn frees the session after this long
+INTERVIEW_TURN_LOCK_SECONDS = int(os.getenv('INTERVIEW_TURN_LOCK_SECONDS', 120))
+
+# Chat model provider (utils/llm.py): groq, record, replay or fake.
+# record saves request/response pairs to LLM_RECORDINGS_DIR; replay serves them offline
+# with LLM_REPLAY_LATENCY_MS of delay per call ("recorded" = the latency seen when recording)
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'groq')
+LLM_MODEL = os.getenv('LLM_MODEL', 'llama-3.3-70b-versatile')
+LLM_RECORDINGS_DIR = os.getenv('LLM_RECORDINGS_DIR', str(BASE_DIR / 'llm_recordings'))
+LLM_REPLAY_LATENCY_MS = os.getenv('LLM_REPLAY_LATENCY_MS', 'recorded')
+
+# Shared HTTP connection pool of the Groq client (utils/llm.py)
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', 20))
+LLM_HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv('LLM_HTTP_KEEPALIVE_CONNECTIONS', 10))
+LLM_HTTP_KEEPALIVE_SECONDS = float(os.getenv('LLM_HTTP_KEEPALIVE_SECONDS', 120))
+LLM_HTTP_TIMEOUT_SECONDS = float(os.getenv('LLM_HTTP_TIMEOUT_SECONDS', 60))
+
+# LLM rate governor (utils/llm_governor.py): every provider call waits for these per-minute
+# budgets, shared by all processes using the same LLM_GOVERNOR_DB. Off by default (0); set
+# them to the provider account's limits (e.g. 30 RPM / 12000 TPM on Groq's free tier) to opt in.
+LLM_RPM_LIMIT = float(os.getenv('LLM_RPM_LIMIT', 0))
+LLM_TPM_LIMIT = float(os.getenv('LLM_TPM_LIMIT', 0))
+LLM_GOVERNOR_DB = os.getenv('LLM_GOVERNOR_DB', str(BASE_DIR / 'llm_governor.sqlite3'))
+# Share of each budget that analyses may not use, kept free for live interview turns
+LLM_LOW_PRIORITY_RESERVE = float(os.getenv('LLM_LOW_PRIORITY_RESERVE', 0.2))
+LLM_GOVERNOR_MAX_WAIT_SECONDS = float(os.getenv('LLM_GOVERNOR_MAX_WAIT_SECONDS', 120))
+# Interview turns hold their session's lock (INTERVIEW_TURN_LOCK_SECONDS) while waiting: keep this well below it
+LLM_CHAT_MAX_WAIT_SECONDS = float(os.getenv('LLM_CHAT_MAX_WAIT_SECONDS', 15))
+# Completion length assumed before a call; corrected with the reported usage afterwards
+LLM_COMPLETION_TOKENS_ESTIMATE = int(os.getenv('LLM_COMPLETION_TOKENS_ESTIMATE', 512))
+
+# Failure handling of provider calls (utils/llm.py, utils/resilience.py): transient errors are
+# retried with jittered backoff inside the stage deadline; after LLM_BREAKER_FAILURES failures
+# in a row calls fail fast for LLM_BREAKER_RESET_SECONDS and analyses use heuristics instead
+LLM_RETRY_ATTEMPTS = int(os.getenv('LLM_RETRY_ATTEMPTS', 3))
+LLM_RETRY_BASE_SECONDS = float(os.getenv('LLM_RETRY_BASE_SECONDS', 0.5))
+LLM_RETRY_MAX_SECONDS = float(os.getenv('LLM_RETRY_MAX_SECONDS', 8))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', 5))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv('LLM_BREAKER_RESET_SECONDS', 30))
+# Heuristic-only analyses are re-run with the LLM by idle workers this long after their last
+# attempt, at batch priority, up to ANALYSIS_REFINE_MAX_JOBS refinement jobs per analysis
+ANALYSIS_REFINE_AFTER_SECONDS = int(os.getenv('ANALYSIS_REFINE_AFTER_SECONDS', 300))
+ANALYSIS_REFINE_MAX_JOBS = int(os.getenv('ANALYSIS_REFINE_MAX_JOBS', 4))
@@ -0,0 +1,69 @@
+# utils/candidate_brief.py
+# Compact, deterministic rendering of the parsed resume for the interview prompts.
+# Replaces the Python repr of whole dicts (quotes, keys, empty fields) with short lines.
+
+# Keeps prompts bounded for very long resumes
+MAX_ROLES = 6
+MAX_PROJECTS = 6
+MAX_ACHIEVEMENTS_PER_ROLE = 4
+MAX_LINE_CHARS = 220
+
+BRIEF_FORMAT = "1"
+
+def _clip(text):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= MAX_LINE_CHARS else text[:MAX_LINE_CHARS - 3].rstrip() + "..."
+
+def _join(items):
+    return ", ".join(item.strip() for item in items or [] if item and item.strip())
+
+def render_work_experience(work_experience):
+    """
+    '- Software Engineer @ Acme (2021-2023) [Python, Django]
+       * Reduced API latency by 40%'
+    """
+    lines = []
+    for role in (work_experience or [])[:MAX_ROLES]:
+        header = role.get("role") or "Role"
+        if role.get("company"):
+            header += f" @ {role['company']}"
+        if role.get("duration"):
+            header += f" ({role['duration']})"
+        technologies = _join(role.get("technologies"))
+        if technologies:
+            header += f" [{technologies}]"
+        lines.append(f"- {_clip(header)}")
+        for achievement in (role.get("key_achievements") or [])[:MAX_ACHIEVEMENTS_PER_ROLE]:
+            if achievement and achievement.strip():
+                lines.append(f"  * {_clip(achievement)}")
+    return "\n".join(lines) or "None listed"
+
+def render_projects(projects):
+    """'- Resume Analyzer [LangGraph, Django]: LLM powered resume screening'"""
+    lines = []
+    for project in (projects or [])[:MAX_PROJECTS]:
+        line = project.get("name") or "Project"
+        technologies = _join(project.get("technologies"))
+        if technologies:
+            line += f" [{technologies}]"
+        if project.get("description"):
+            line += f": {project['description']}"
+        lines.append(f"- {_clip(line)}")
+    return "\n".join(lines) or "None listed"
+
+def build_candidate_brief(parsed_resume):
+    """The prompt fields the interviewers use, rendered once per interview session."""
+    parsed_resume = parsed_resume or {}
+    return {
+        "format": BRIEF_FORMAT,
+        "full_name": parsed_resume.get("full_name") or "Candidate",
+        "workexperience": render_work_experience(parsed_resume.get("work_experience")),
+        "projects": render_projects(parsed_resume.get("projects")),
+    }
+
+def brief_is_current(brief):
+    return bool(brief) and brief.get("format") == BRIEF_FORMAT
+
+def count_text_tokens(text):
+    from langchain_core.messages.utils import count_tokens_approximately
+    return count_tokens_approximately([("system", text)])
@@ -0,0 +1,41 @@
+# utils/feedback_report.py
+# Extracts the hiring decision and round scores from the feedback agent's markdown report
+# (the OUTPUT FORMAT of system_prompt_feedback in utils/interview_agent.py).
+import re
+
+SELECTED = "SELECTED"
+REJECTED = "REJECTED"
+
+_DECISION = re.compile(r"DECISION\s*\**\s*:?\s*\**\s*([^\n]*)", re.IGNORECASE)
+_ROUND_SCORES = {
+    "technical": re.compile(r"ROUND\s*1\b[^\n]*?\(\s*(\d+(?:\.\d+)?)\s*/\s*10\s*\)", re.IGNORECASE),
+    "dsa": re.compile(r"ROUND\s*2\b[^\n]*?\(\s*(\d+(?:\.\d+)?)\s*/\s*10\s*\)", re.IGNORECASE),
+}
+
+
+def parse_decision(report):
+    """SELECTED / REJECTED from the '## DECISION:' line, or None if missing or ambiguous."""
+    for match in _DECISION.finditer(report or ""):
+        line = match.group(1).upper()
+        found = {word for word in (SELECTED, REJECTED) if word in line}
+        if len(found) == 1:
+            return found.pop()
+    return None
+
+
+def parse_section_scores(report):
+    """Round scores out of 10, e.g. {"technical": 6.0, "dsa": 4.0}; missing rounds are left out."""
+    scores = {}
+    for section, pattern in _ROUND_SCORES.items():
+        match = pattern.search(report or "")
+        if match:
+            scores[section] = min(float(match.group(1)), 10.0)
+    return scores
+
+
+def parse_feedback_report(report):
+    return {
+        "report": report,
+        "decision": parse_decision(report),
+        "scores": parse_section_scores(report),
+    }
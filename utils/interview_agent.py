@@ -1,15 +1,15 @@
-import os
-from typing import TypedDict, Literal, List
-from langchain_groq import ChatGroq
+from functools import lru_cache
+from typing import Annotated, TypedDict, Literal
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
 from langgraph.types import Command
 
-# Load API Key
-api_key = os.getenv("GROQ_API_KEY")
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=api_key)
+from .llm import get_chat_model
+
 
 # --- State Definitions ---
 class WorkExperience(TypedDict):
@@ -24,11 +24,16 @@ class Projects(TypedDict):
     technologies: list[str]
 
 class AgentState(TypedDict):
-    messages: List[any] # Stores chat history
+    # Recent chat history (older turns live in conversation_summary). Appended to, not
+    # replaced, so a checkpointed turn only sends its new message
+    messages: Annotated[list, add_messages]
+    conversation_summary: str
+    turn_count: int # Candidate messages so far, including the current one
     full_name: str
     job_description: str
-    workexperience: List[WorkExperience]
-    projects: List[Projects]
+    # Pre-rendered compact text (utils/candidate_brief.py), not the raw parsed dicts
+    workexperience: str
+    projects: str
 
 # --- Prompts (Ported from Notebook) ---
 
@@ -217,67 +222,123 @@ Claimed: [Quote] | Actual: O(?) | Correct: Yes/No
 
 Analyze the transcript and provide feedback now.
 """
-# --- Node Functions ---
+# --- Prompt Chains ---
+# Prompt templates and chains are immutable Runnables, so they are built once per process
+# and shared by every request thread instead of being rebuilt on each turn.
 
-def get_hr_response(state: AgentState):
+# Appended to every agent prompt; older turns are summarized here (utils/interview_memory.py)
+memory_prompt = """
+
+**Earlier in this interview (summary of messages no longer shown):**
+{conversation_summary}
+"""
+
+NO_SUMMARY = "Nothing yet. The full conversation is shown below."
+
+def _build_chain(system_prompt, chat_llm):
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt_hr),
+        ("system", system_prompt + memory_prompt),
         MessagesPlaceholder(variable_name="messages"),
     ])
-    chain = prompt | llm | StrOutputParser()
-    response = chain.invoke(state)
-    return {"messages": [AIMessage(content=response)]}
+    return prompt | chat_llm | StrOutputParser()
+
+def build_agent_chains(chat_llm=None):
+    """One prompt | llm | parser chain per interview agent."""
+    # Provider default temperature: interview questions should vary between candidates
+    chat_llm = chat_llm or get_chat_model()
+    return {
+        "hr_agent": _build_chain(system_prompt_hr, chat_llm),
+        "technical_agent": _build_chain(system_prompt_dsa, chat_llm),
+        "feedback_agent": _build_chain(system_prompt_feedback, chat_llm),
+    }
+
+@lru_cache(maxsize=1)
+def get_agent_chains():
+    return build_agent_chains()
+
+# --- Node Functions ---
+
+def _prompt_input(state):
+    return {**state, "conversation_summary": state.get("conversation_summary") or NO_SUMMARY}
+
+def _agent_node(chain):
+    """
+    Graph node for one agent. Has a sync and an async implementation, so the graph can be
+    driven with invoke() (WSGI, workers) or ainvoke()/astream() without tying up a thread.
+    """
+    def respond(state: AgentState):
+        response = chain.invoke(_prompt_input(state))
+        return {"messages": [AIMessage(content=response)]}
+
+    async def arespond(state: AgentState):
+        response = await chain.ainvoke(_prompt_input(state))
+        return {"messages": [AIMessage(content=response)]}
+
+    return RunnableLambda(respond, afunc=arespond)
+
+def get_hr_response(state: AgentState):
+    return _agent_node(get_agent_chains()["hr_agent"]).invoke(state)
 
 def get_technical_response(state: AgentState):
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt_dsa),
-        MessagesPlaceholder(variable_name="messages"),
-    ])
-    chain = prompt | llm | StrOutputParser()
-    response = chain.invoke(state)
-    return {"messages": [AIMessage(content=response)]}
+    return _agent_node(get_agent_chains()["technical_agent"]).invoke(state)
 
 def get_feedback_response(state: AgentState):
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt_feedback),
-        MessagesPlaceholder(variable_name="messages"),
-    ])
-    chain = prompt | llm | StrOutputParser()
-    response = chain.invoke(state)
-    return {"messages": [AIMessage(content=response)]}
+    return _agent_node(get_agent_chains()["feedback_agent"]).invoke(state)
+
+# Rounds by candidate turn (the notebook's 8 / 14 message thresholds)
+HR_ROUND_TURNS = 4
+TECHNICAL_ROUND_TURNS = 7
+
+def write_feedback_report(state: AgentState, chat_llm=None):
+    """
+    Runs the feedback agent outside the chat graph (from a background job).
+    Returns the markdown report.
+    """
+    chain = build_agent_chains(chat_llm)["feedback_agent"] if chat_llm is not None else get_agent_chains()["feedback_agent"]
+    return chain.invoke(_prompt_input(state))
 
 def supervisor_node(state: AgentState) -> Literal["hr_agent", "technical_agent", "feedback_agent"]:
-    messages = state["messages"]
-    # Logic from notebook: 
-    # <= 8 messages (~4 turns) -> HR
-    # <= 14 messages (~3 turns) -> Technical
-    # > 14 -> Feedback
-    if len(messages) <= 8:
+    # Routed by turn number, not len(messages): the message window is bounded
+    # turns 0-4 -> HR, 5-7 -> Technical, 8+ -> Feedback
+    turn = state.get("turn_count")
+    if turn is None:
+        turn = len(state["messages"]) // 2
+    if turn <= HR_ROUND_TURNS:
         return "hr_agent"
-    elif len(messages) <= 14:
+    elif turn <= TECHNICAL_ROUND_TURNS:
         return "technical_agent"
     else:
         return "feedback_agent"
 
 # --- Graph Construction ---
 
-def build_interview_graph():
+def build_interview_graph(chat_llm=None, checkpointer=None):
+    """
+    Builds and compiles the interview graph. Pass `chat_llm` to run it against another
+    model (e.g. a fake one in benchmarks); otherwise the shared chains are used.
+    With a `checkpointer` the state is persisted per thread, and each invocation only
+    needs the new messages (see applicants/checkpoint.py).
+    Views should use a process-wide graph instead of compiling on every request.
+    """
+    chains = build_agent_chains(chat_llm) if chat_llm is not None else get_agent_chains()
     graph = StateGraph(AgentState)
     
-    graph.add_node("hr_agent", get_hr_response)
-    graph.add_node("technical_agent", get_technical_response)
-    graph.add_node("feedback_agent", get_feedback_response)
+    for name, chain in chains.items():
+        graph.add_node(name, _agent_node(chain))
 
     # Conditional logic handled by edges or a router
     # Here we simplify: The 'Supervisor' logic decides where to go based on state
-    
-    def router(state):
-        route = supervisor_node(state)
-        return route
-
-    graph.add_conditional_edges(START, router)
+    graph.add_conditional_edges(START, supervisor_node)
     graph.add_edge("hr_agent", END)
     graph.add_edge("technical_agent", END)
     graph.add_edge("feedback_agent", END)
 
-    return graph.compile()
\ No newline at end of file
+    return graph.compile(checkpointer=checkpointer)
+
+@lru_cache(maxsize=1)
+def get_interview_graph():
+    """
+    Process-wide compiled graph. It has no checkpointer and keeps no per-run state,
+    so concurrent invoke() calls from different request threads are safe.
+    """
+    return build_interview_graph()
@@ -0,0 +1,118 @@
+# utils/interview_memory.py
+# Bounded interview memory: a token-budgeted window of the most recent messages plus a
+# rolling summary of everything older. The summary and the window start are stored on the
+# InterviewSession and advanced once per turn, so prompts stop growing with the interview.
+# Messages are dicts with "role" ('user' / 'ai') and "content", e.g. InterviewMessage.values().
+# LangChain is imported inside the functions, so importing this module stays cheap.
+import os
+from functools import lru_cache
+
+# Approximate token budget of the verbatim message window sent with every turn
+MEMORY_WINDOW_TOKENS = int(os.getenv("INTERVIEW_MEMORY_WINDOW_TOKENS", 1500))
+# When the window overflows it is cut down to this share of the budget, so the
+# summary is refreshed every few turns instead of on every turn
+MEMORY_FOLD_RATIO = 0.5
+# The latest exchange is always kept verbatim
+MEMORY_MIN_MESSAGES = 2
+
+summary_system_prompt = """You maintain the running notes of a technical job interview.
+Update the existing notes with the new transcript lines. Keep:
+- every question the interviewer asked, and which round it belonged to,
+- the substance of each candidate answer, quoting short key phrases verbatim,
+- any code the candidate wrote (verbatim if short, otherwise its approach and bugs),
+- claimed complexities, mistakes, red flags and moments of honesty or bluffing.
+Drop greetings and filler. Write compact bullet points. Return only the updated notes."""
+
+
+def to_langchain_messages(chat_history):
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    return [
+        HumanMessage(content=msg['content']) if msg['role'] == 'user' else AIMessage(content=msg['content'])
+        for msg in chat_history
+    ]
+
+
+def from_langchain_messages(messages):
+    """Inverse of to_langchain_messages, e.g. for the messages of a graph checkpoint."""
+    return [
+        {"role": "user" if msg.type == "human" else "ai", "content": msg.content}
+        for msg in messages
+    ]
+
+
+def count_tokens(messages):
+    """Approximate token count (about 4 characters per token), good enough for budgeting."""
+    from langchain_core.messages.utils import count_tokens_approximately
+
+    return count_tokens_approximately(messages)
+
+
+def fold_point(window, budget=MEMORY_WINDOW_TOKENS, fold_ratio=MEMORY_FOLD_RATIO):
+    """
+    How many of the oldest `window` messages should move into the summary.
+    Returns 0 while the window fits the budget; otherwise enough messages for the rest
+    to fit `budget * fold_ratio`.
+    """
+    messages = to_langchain_messages(window)
+    if count_tokens(messages) <= budget:
+        return 0
+
+    target = budget * fold_ratio
+    sizes = [count_tokens([message]) for message in messages]
+    remaining = sum(sizes)
+    folded = 0
+    while remaining > target and len(messages) - folded > MEMORY_MIN_MESSAGES:
+        remaining -= sizes[folded]
+        folded += 1
+    return folded
+
+
+def _format_transcript(chat_history):
+    return "\n".join(
+        f"{'Candidate' if msg['role'] == 'user' else 'Interviewer'}: {msg['content']}" for msg in chat_history
+    )
+
+
+@lru_cache(maxsize=1)
+def get_summary_chain():
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+    from .llm import get_chat_model
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", summary_system_prompt),
+        ("human", "Existing notes:\n{summary}\n\nNew transcript lines:\n{transcript}"),
+    ])
+    return prompt | get_chat_model() | StrOutputParser()
+
+
+def _summary_input(summary, folded_messages):
+    return {
+        "summary": summary or "(none yet)",
+        "transcript": _format_transcript(folded_messages),
+    }
+
+
+def update_memory(window, summary, chain=None):
+    """
+    Advances the memory after a turn. Returns (summary, number of window messages folded);
+    the summary is only regenerated (one LLM call over the newly folded messages) when
+    the window overflowed.
+    """
+    folded = fold_point(window)
+    if not folded:
+        return summary, 0
+    chain = chain or get_summary_chain()
+    summary = chain.invoke(_summary_input(summary, window[:folded]))
+    return summary.strip(), folded
+
+
+async def aupdate_memory(window, summary, chain=None):
+    """Async version of update_memory."""
+    folded = fold_point(window)
+    if not folded:
+        return summary, 0
+    chain = chain or get_summary_chain()
+    summary = await chain.ainvoke(_summary_input(summary, window[:folded]))
+    return summary.strip(), folded
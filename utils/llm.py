@@ -0,0 +1,608 @@
+# utils/llm.py
+# One place that decides which chat model the pipeline talks to. Backends (LLM_BACKEND):
+#   groq   - the live Groq API (default)
+#   record - Groq, and every request/response pair is saved under LLM_RECORDINGS_DIR
+#   replay - serves recorded pairs without the network, with artificial latency
+#   fake   - deterministic local answers, schema-valid for the structured outputs
+# With replay or fake, the CPU, DB and I/O cost of the pipeline can be measured offline.
+# Calls to the provider (groq, record) go through the rate governor in utils/llm_governor.py,
+# and a circuit breaker with deadline-aware retries (utils/resilience.py).
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from .resilience import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, acall_with_retries, call_with_retries, remaining,
+)
+from .skill_index import compact_key, get_skill_index
+
+
+def _setting(name, default):
+    """Django setting when running inside the project, else the environment variable."""
+    try:
+        from django.conf import settings
+        if settings.configured and hasattr(settings, name):
+            return getattr(settings, name)
+    except ImportError:
+        pass
+    return os.getenv(name, default)
+
+
+class ReplayMissError(LookupError):
+    """The replay backend has no recording for a request."""
+
+
+# --- 1. Shared Tool Binding ---
+
+class _ToolCallingChatModel(BaseChatModel):
+    """
+    bind_tools() for the local backends, formatted like ChatGroq's, so with_structured_output()
+    works and a recorded request and its replay carry the same `tools` / `tool_choice`.
+    """
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        if tool_choice:
+            if tool_choice == "any":
+                tool_choice = "required"
+            if tool_choice is True:
+                tool_choice = formatted_tools[0]["function"]["name"]
+            if isinstance(tool_choice, str) and tool_choice not in ("auto", "none", "required"):
+                tool_choice = {"type": "function", "function": {"name": tool_choice}}
+            kwargs["tool_choice"] = tool_choice
+        return self.bind(tools=formatted_tools, **kwargs)
+
+
+# --- 2. Record / Replay ---
+
+def request_key(messages, stop=None, **kwargs):
+    """
+    Stable hash of a request. Only message types and contents count (not the random
+    message ids LangGraph assigns), plus the bound tools and other call options.
+    """
+    payload = {
+        "messages": [[m.type, m.content, getattr(m, "tool_calls", None) or []] for m in messages],
+        "stop": stop,
+        "kwargs": kwargs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class RecordReplayChatModel(_ToolCallingChatModel):
+    """
+    In "record" mode forwards every call to `inner` and stores the pair as
+    `<directory>/<request_key>.json`; in "replay" mode answers from those files.
+    `latency_ms` is the artificial delay per replayed call; None replays the recorded latency.
+    """
+    mode: str
+    directory: str
+    inner: Optional[BaseChatModel] = None
+    latency_ms: Optional[float] = None
+
+    @property
+    def _llm_type(self):
+        return f"{self.mode}-llm"
+
+    def _path(self, key):
+        return Path(self.directory) / f"{key}.json"
+
+    def _load(self, messages, stop, kwargs):
+        key = request_key(messages, stop, **kwargs)
+        try:
+            recording = json.loads(self._path(key).read_text())
+        except FileNotFoundError:
+            raise ReplayMissError(
+                f"No recording {key} in {self.directory}; run the same workload with LLM_BACKEND=record first"
+            )
+        message = messages_from_dict([recording["response"]])[0]
+        delay = recording.get("latency_ms", 0) if self.latency_ms is None else self.latency_ms
+        return ChatResult(generations=[ChatGeneration(message=message)]), delay / 1000
+
+    def _save(self, messages, stop, kwargs, result, seconds):
+        path = self._path(request_key(messages, stop, **kwargs))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        recording = {
+            "request": {"messages": [message_to_dict(m) for m in messages], "stop": stop, "kwargs": kwargs},
+            "response": message_to_dict(result.generations[0].message),
+            "latency_ms": round(seconds * 1000, 1),
+        }
+        # Write-then-rename, so concurrent workers never read a half-written file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(recording, indent=1, default=str))
+        tmp.replace(path)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.mode == "replay":
+            result, delay = self._load(messages, stop, kwargs)
+            time.sleep(delay)
+            return result
+        started = time.perf_counter()
+        result = self.inner._generate(messages, stop=stop, **kwargs)
+        self._save(messages, stop, kwargs, result, time.perf_counter() - started)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.mode == "replay":
+            result, delay = self._load(messages, stop, kwargs)
+            await asyncio.sleep(delay)
+            return result
+        started = time.perf_counter()
+        result = await self.inner._agenerate(messages, stop=stop, **kwargs)
+        self._save(messages, stop, kwargs, result, time.perf_counter() - started)
+        return result
+
+
+# --- 3. Rate Governor ---
+
+class GovernedChatModel(_ToolCallingChatModel):
+    """
+    Runs every call of `inner` through the shared LLMGovernor (utils/llm_governor.py):
+    waits for the request and token budgets at the caller's priority, then corrects the
+    token budget with the usage the provider reported.
+    """
+    inner: BaseChatModel
+    governor: Any
+    completion_tokens: int = 512
+
+    @property
+    def _llm_type(self):
+        return self.inner._llm_type
+
+    def _estimate(self, messages, kwargs):
+        from langchain_core.messages.utils import count_tokens_approximately
+        prompt = count_tokens_approximately(messages, tools=kwargs.get("tools"))
+        return prompt + (kwargs.get("max_tokens") or getattr(self.inner, "max_tokens", None) or self.completion_tokens)
+
+    def _settle(self, estimated, message):
+        usage = getattr(message, "usage_metadata", None)
+        if usage and usage.get("total_tokens"):
+            self.governor.settle(estimated, usage["total_tokens"])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = self._estimate(messages, kwargs)
+        self.governor.acquire(estimated, timeout=remaining())
+        result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        self._settle(estimated, result.generations[0].message)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = self._estimate(messages, kwargs)
+        await self.governor.aacquire(estimated, timeout=remaining())
+        result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        await asyncio.to_thread(self._settle, estimated, result.generations[0].message)
+        return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = self._estimate(messages, kwargs)
+        self.governor.acquire(estimated, timeout=remaining())
+        for chunk in self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            # Usage arrives on the last chunk
+            if chunk.message.usage_metadata:
+                self._settle(estimated, chunk.message)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = self._estimate(messages, kwargs)
+        await self.governor.aacquire(estimated, timeout=remaining())
+        async for chunk in self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            if chunk.message.usage_metadata:
+                await asyncio.to_thread(self._settle, estimated, chunk.message)
+            yield chunk
+
+
+# --- 4. Retries & Circuit Breaker ---
+
+def is_transient_error(error):
+    """Provider failures worth retrying: timeouts, dropped connections, 408/409/429 and 5xx responses."""
+    import httpx
+    from groq import APIConnectionError
+
+    from .llm_governor import LLMBudgetTimeout
+
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in (408, 409, 429) or status >= 500
+    # Our own limits: retrying cannot help within the same deadline / budget
+    if isinstance(error, (DeadlineExceeded, CircuitOpenError, LLMBudgetTimeout)):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return isinstance(error, (APIConnectionError, httpx.TransportError))
+
+
+class ResilientChatModel(_ToolCallingChatModel):
+    """
+    Calls `inner` through the LLM circuit breaker with bounded, jittered retries of transient
+    failures. Each attempt gets the time left before the current deadline as its request
+    timeout. A stream is only retried until its first chunk arrived.
+    """
+    inner: BaseChatModel
+    breaker: Any
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    @property
+    def _llm_type(self):
+        return self.inner._llm_type
+
+    def _call_kwargs(self, kwargs):
+        left = remaining()
+        if left is None:
+            return kwargs
+        if left <= 0:
+            raise DeadlineExceeded("Deadline exceeded before the LLM call")
+        return {**kwargs, "timeout": left}
+
+    def _guarded(self, call):
+        self.breaker.before_call()
+        try:
+            result = call()
+        except Exception as e:
+            if is_transient_error(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _aguarded(self, call):
+        self.breaker.before_call()
+        try:
+            result = await call()
+        except Exception as e:
+            if is_transient_error(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _retrying(self, call):
+        return call_with_retries(
+            lambda: self._guarded(call), attempts=self.attempts, base_delay=self.base_delay,
+            max_delay=self.max_delay, retry_if=is_transient_error,
+        )
+
+    async def _aretrying(self, call):
+        return await acall_with_retries(
+            lambda: self._aguarded(call), attempts=self.attempts, base_delay=self.base_delay,
+            max_delay=self.max_delay, retry_if=is_transient_error,
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._retrying(
+            lambda: self.inner._generate(messages, stop=stop, run_manager=run_manager, **self._call_kwargs(kwargs))
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await self._aretrying(
+            lambda: self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **self._call_kwargs(kwargs))
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        def start():
+            chunks = self.inner._stream(messages, stop=stop, run_manager=run_manager, **self._call_kwargs(kwargs))
+            return chunks, next(chunks, None)
+
+        chunks, first = self._retrying(start)
+        if first is None:
+            return
+        yield first
+        yield from chunks
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async def start():
+            chunks = self.inner._astream(messages, stop=stop, run_manager=run_manager, **self._call_kwargs(kwargs))
+            return chunks, await anext(chunks, None)
+
+        chunks, first = await self._aretrying(start)
+        if first is None:
+            return
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+
+@lru_cache(maxsize=1)
+def get_llm_breaker():
+    """Process-wide breaker shared by every provider model."""
+    return CircuitBreaker(
+        "llm",
+        failure_threshold=int(_setting("LLM_BREAKER_FAILURES", 5)),
+        reset_timeout=float(_setting("LLM_BREAKER_RESET_SECONDS", 30)),
+    )
+
+
+def llm_available():
+    """False while the provider circuit is open: callers should use their heuristic fallback."""
+    return not get_llm_breaker().is_open
+
+
+def provider_model(model):
+    """Wraps a provider client: breaker and retries outside, so every attempt waits for the governor."""
+    return ResilientChatModel(
+        inner=governed(model),
+        breaker=get_llm_breaker(),
+        attempts=int(_setting("LLM_RETRY_ATTEMPTS", 3)),
+        base_delay=float(_setting("LLM_RETRY_BASE_SECONDS", 0.5)),
+        max_delay=float(_setting("LLM_RETRY_MAX_SECONDS", 8)),
+    )
+
+
+def governed(model):
+    """`model` behind the process-wide governor, or unchanged when rate limiting is off."""
+    from .llm_governor import get_llm_governor
+    governor = get_llm_governor()
+    if governor is None:
+        return model
+    return GovernedChatModel(
+        inner=model, governor=governor, completion_tokens=int(_setting("LLM_COMPLETION_TOKENS_ESTIMATE", 512))
+    )
+
+
+# --- 5. Deterministic Fake ---
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_YEARS = re.compile(r"(\d+)\+?\s*(?:years|yrs)", re.IGNORECASE)
+_LIST_FIELD = r"{label}:\s*\[(.*?)\]"
+
+
+def _input_text(messages):
+    return "\n".join(str(m.content) for m in messages if m.type == "human")
+
+
+def _fake_resume(text):
+    skills = get_skill_index().scan(text, strict=True)
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    email = _EMAIL.search(text)
+    phone = _PHONE.search(text)
+    return {
+        "full_name": lines[0][:80] if lines else "Candidate",
+        "summary": " ".join(lines[1:3])[:300],
+        "email": email.group(0) if email else "",
+        "phone": phone.group(0).strip() if phone else "",
+        "skills": skills,
+        "work_experience": [{
+            "role": "Software Engineer", "company": "Example Corp", "duration": "2021 - Present",
+            "technologies": skills[:5], "key_achievements": lines[3:5],
+        }] if skills else [],
+        "projects": [{
+            "name": "Portfolio Project", "description": " ".join(lines[5:7])[:200],
+            "technologies": skills[5:10], "url": None,
+        }] if len(skills) > 5 else [],
+        "education": [],
+        "certifications": [],
+    }
+
+
+def _fake_job_description(text):
+    skills = get_skill_index().scan(text, strict=True)
+    years = _YEARS.search(text)
+    split = max(1, (len(skills) * 2 + 2) // 3) if skills else 0
+    return {
+        "required_skills": skills[:split],
+        "nice_to_have": skills[split:],
+        "min_experience_years": int(years.group(1)) if years else 0,
+    }
+
+
+def _listed(text, label):
+    found = re.search(_LIST_FIELD.format(label=re.escape(label)), text, re.DOTALL)
+    return re.findall(r"'([^']*)'|\"([^\"]*)\"", found.group(1)) if found else []
+
+
+def _fake_skill_match(text):
+    resume = {compact_key(a or b) for a, b in _listed(text, "Candidate Skills")}
+    required = [a or b for a, b in _listed(text, "Job Requirements")]
+    matching = [skill for skill in required if compact_key(skill) in resume]
+    return {
+        "match_percentage": round(len(matching) / len(required) * 100, 1) if required else 100.0,
+        "missing_skills": [skill for skill in required if skill not in matching],
+        "matching_skills": matching,
+    }
+
+
+# Structured outputs by tool (schema class) name; other schemas get empty values of the right type
+FAKE_STRUCTURED_OUTPUTS = {
+    "ResumeSchema": _fake_resume,
+    "JobDescriptionSchema": _fake_job_description,
+    "SkillMatchSchema": _fake_skill_match,
+}
+
+_EMPTY_BY_TYPE = {"string": "", "array": [], "object": {}, "integer": 0, "number": 0.0, "boolean": False}
+
+
+def _empty_arguments(tool):
+    properties = tool["function"].get("parameters", {}).get("properties", {})
+    return {name: _EMPTY_BY_TYPE.get(spec.get("type"), None) for name, spec in properties.items()}
+
+
+FAKE_INTERVIEW_REPLY = "Okay. Walk me through how you implemented that, and why you chose that approach."
+FAKE_FEEDBACK_REPORT = """# FEEDBACK REPORT
+
+## DECISION: REJECTED
+
+## ROUND 1: TECHNICAL (5/10)
+
+## ROUND 2: DSA (4/10)
+"""
+FAKE_SUMMARY = "- Candidate described their projects; answers stayed at a high level."
+
+
+class FakeChatModel(_ToolCallingChatModel):
+    """Deterministic offline model: same request, same answer, no network."""
+
+    @property
+    def _llm_type(self):
+        return "fake-llm"
+
+    def _reply(self, messages, kwargs):
+        tools = kwargs.get("tools")
+        if tools:
+            tool = tools[0]
+            name = tool["function"]["name"]
+            builder = FAKE_STRUCTURED_OUTPUTS.get(name)
+            arguments = builder(_input_text(messages)) if builder else _empty_arguments(tool)
+            return AIMessage(content="", tool_calls=[{"name": name, "args": arguments, "id": f"call_{name}"}])
+
+        system = str(messages[0].content) if messages and messages[0].type == "system" else ""
+        if "FEEDBACK REPORT" in system:
+            return AIMessage(content=FAKE_FEEDBACK_REPORT)
+        if "running notes" in system:
+            return AIMessage(content=FAKE_SUMMARY)
+        return AIMessage(content=FAKE_INTERVIEW_REPLY)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages, kwargs))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._reply(messages, kwargs)
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": 0}
+                for call in message.tool_calls
+            ]))
+            return
+        for word in re.findall(r"\S+\s*", message.content):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word))
+            if run_manager:
+                run_manager.on_llm_new_token(word, chunk=chunk)
+            yield chunk
+
+
+# --- 6. Registry ---
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    """Registers `factory(temperature) -> chat model` under an LLM_BACKEND name."""
+    def decorator(factory):
+        BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def _http_options():
+    import httpx
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(_setting("LLM_HTTP_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=int(_setting("LLM_HTTP_KEEPALIVE_CONNECTIONS", 10)),
+            # Well above the think time between interview turns, so they reuse the TLS connection
+            keepalive_expiry=float(_setting("LLM_HTTP_KEEPALIVE_SECONDS", 120)),
+        ),
+        "timeout": httpx.Timeout(float(_setting("LLM_HTTP_TIMEOUT_SECONDS", 60)), connect=5.0),
+    }
+
+
+@lru_cache(maxsize=1)
+def get_http_client():
+    """Process-wide keep-alive connection pool shared by every Groq model (sync calls)."""
+    from groq import DefaultHttpxClient
+    return DefaultHttpxClient(**_http_options())
+
+
+# Event loop -> its async connection pool. Under WSGI every async_to_sync call runs on a new
+# loop, and a keep-alive connection opened on a loop that has since closed cannot be reused
+_async_http_clients = {}
+_async_http_clients_lock = threading.Lock()
+
+
+def get_async_http_client():
+    """Async counterpart of get_http_client(), used by ainvoke / astream: one pool per running event loop."""
+    from groq import DefaultAsyncHttpxClient
+    loop = asyncio.get_running_loop()
+    with _async_http_clients_lock:
+        client = _async_http_clients.get(loop)
+        if client is None:
+            # The pools of finished loops hold only dead connections
+            for closed in [other for other in _async_http_clients if other.is_closed()]:
+                del _async_http_clients[closed]
+            client = _async_http_clients[loop] = DefaultAsyncHttpxClient(**_http_options())
+    return client
+
+
+class LoopLocalCompletions:
+    """
+    Stands in for ChatGroq.async_client: each call goes through a copy of the Groq async
+    client on the current event loop's connection pool (get_async_http_client).
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def create(self, **kwargs):
+        return await self.client.copy(http_client=get_async_http_client()).chat.completions.create(**kwargs)
+
+
+def _groq_kwargs(temperature):
+    kwargs = {
+        "model": _setting("LLM_MODEL", "llama-3.3-70b-versatile"),
+        "api_key": os.getenv("GROQ_API_KEY"),
+        "http_client": get_http_client(),
+        # Retried by ResilientChatModel instead, within the caller's deadline
+        "max_retries": 0,
+    }
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
+@register_backend("groq")
+def groq_backend(temperature):
+    from langchain_groq import ChatGroq
+    model = ChatGroq(**_groq_kwargs(temperature))
+    model.async_client = LoopLocalCompletions(model.async_client._client)
+    return provider_model(model)
+
+
+@register_backend("record")
+def record_backend(temperature):
+    return RecordReplayChatModel(
+        mode="record", inner=groq_backend(temperature), directory=str(_setting("LLM_RECORDINGS_DIR", "llm_recordings"))
+    )
+
+
+@register_backend("replay")
+def replay_backend(temperature):
+    latency = _setting("LLM_REPLAY_LATENCY_MS", "recorded")
+    return RecordReplayChatModel(
+        mode="replay",
+        directory=str(_setting("LLM_RECORDINGS_DIR", "llm_recordings")),
+        latency_ms=None if latency in (None, "", "recorded") else float(latency),
+    )
+
+
+@register_backend("fake")
+def fake_backend(temperature):
+    return FakeChatModel()
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(temperature=None, backend=None):
+    """
+    Process-wide chat model of the configured backend (LLM_BACKEND, default "groq").
+    `temperature=None` keeps the provider default. The Groq models of every temperature
+    share one HTTP connection pool (get_http_client).
+    """
+    backend = backend or _setting("LLM_BACKEND", "groq")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND {backend!r}; expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend](temperature)
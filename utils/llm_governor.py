@@ -0,0 +1,272 @@
+# utils/llm_governor.py
+# Central admission control for provider LLM calls. Every call takes one request from a
+# requests-per-minute bucket and its estimated tokens from a tokens-per-minute bucket.
+# The buckets live in a small SQLite file, so all web and worker processes on the host
+# share one budget. Calls wait in priority order: a live interview turn is admitted before
+# any waiting analysis, and lower priorities cannot spend the last LLM_LOW_PRIORITY_RESERVE
+# of either budget, so interactive calls rarely wait at all.
+import asyncio
+import contextlib
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+# Same scale as AnalysisJob.PRIORITY_*: higher is more urgent
+PRIORITY_BATCH = 0
+PRIORITY_INTERACTIVE = 10
+PRIORITY_CHAT = 20  # live interview turns
+
+_priority = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+# How often a waiting call re-checks the budget when it is blocked by a higher priority
+POLL_SECONDS = 0.1
+
+
+class LLMBudgetTimeout(TimeoutError):
+    """A call waited longer than LLM_GOVERNOR_MAX_WAIT_SECONDS (LLM_CHAT_MAX_WAIT_SECONDS for chat) for the rate budget."""
+
+
+@contextlib.contextmanager
+def llm_priority(priority):
+    """Runs the LLM calls made inside the block (and its threads / tasks) at `priority`."""
+    previous = _priority.get()
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        try:
+            _priority.reset(token)
+        except ValueError:
+            # Left in another context, e.g. an async generator resumed by a different task
+            _priority.set(previous)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def _setting(name, default):
+    from .llm import _setting as setting
+    return setting(name, default)
+
+
+class _Bucket:
+    def __init__(self, name, per_minute):
+        self.name = name
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bucket (name TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS waiter (id INTEGER PRIMARY KEY, priority INTEGER NOT NULL, pid INTEGER NOT NULL,
+                                   enqueued REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS stat (priority INTEGER PRIMARY KEY, calls INTEGER NOT NULL DEFAULT 0,
+                                 waited INTEGER NOT NULL DEFAULT 0, wait_total REAL NOT NULL DEFAULT 0,
+                                 wait_max REAL NOT NULL DEFAULT 0, tokens INTEGER NOT NULL DEFAULT 0);
+"""
+
+
+class LLMGovernor:
+    """
+    Token-bucket rate limiter shared through a SQLite file. `rpm` / `tpm` of 0 disable
+    that budget. Thread and process safe; every check is one short IMMEDIATE transaction.
+    Chat calls give up after `chat_max_wait` instead of `max_wait`: the interview turn
+    holds its session's lock while it waits.
+    """
+
+    def __init__(self, path, rpm, tpm, reserve=0.2, max_wait=120.0, chat_max_wait=15.0):
+        self.path = str(path)
+        self.buckets = [_Bucket(name, limit) for name, limit in (("rpm", rpm), ("tpm", tpm)) if limit]
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.chat_max_wait = chat_max_wait
+        self._local = threading.local()
+
+    # --- Storage ---
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _levels(self, conn, now):
+        """Current level of every bucket, refilled for the time since its last update."""
+        stored = {name: (level, updated) for name, level, updated in conn.execute("SELECT * FROM bucket")}
+        levels = {}
+        for bucket in self.buckets:
+            level, updated = stored.get(bucket.name, (bucket.capacity, now))
+            levels[bucket.name] = min(bucket.capacity, level + max(0.0, now - updated) * bucket.rate)
+        return levels
+
+    # --- Admission ---
+
+    def _try_take(self, tokens, priority):
+        """Takes the budget for one call. Returns 0 when admitted, else the seconds to wait."""
+        now = time.time()
+        with self._transaction() as conn:
+            # Waiters of crashed processes
+            conn.execute("DELETE FROM waiter WHERE enqueued < ?", (now - self.max_wait - 60,))
+            if conn.execute("SELECT 1 FROM waiter WHERE priority > ? LIMIT 1", (priority,)).fetchone():
+                return POLL_SECONDS
+
+            reserve = self.reserve if priority < PRIORITY_CHAT else 0.0
+            levels = self._levels(conn, now)
+            wait = 0.0
+            for bucket in self.buckets:
+                floor = bucket.capacity * reserve
+                # A call larger than the whole budget is admitted once the bucket is full
+                needed = min(1.0 if bucket.name == "rpm" else tokens, bucket.capacity - floor)
+                wait = max(wait, (needed + floor - levels[bucket.name]) / bucket.rate)
+                levels[bucket.name] -= needed
+            if wait > 0:
+                return max(wait, 0.01)
+
+            conn.executemany(
+                "INSERT INTO bucket (name, level, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET level = excluded.level, updated = excluded.updated",
+                [(name, level, now) for name, level in levels.items()],
+            )
+            return 0.0
+
+    def _enqueue(self, priority):
+        with self._transaction() as conn:
+            return conn.execute(
+                "INSERT INTO waiter (priority, pid, enqueued) VALUES (?, ?, ?)", (priority, os.getpid(), time.time())
+            ).lastrowid
+
+    def _dequeue(self, waiter_id):
+        self._db().execute("DELETE FROM waiter WHERE id = ?", (waiter_id,))
+
+    def _check_deadline(self, started, wait, timeout, priority):
+        waited = time.monotonic() - started
+        max_wait = self.chat_max_wait if priority >= PRIORITY_CHAT else self.max_wait
+        if waited + wait > (max_wait if timeout is None else min(max_wait, timeout)):
+            raise LLMBudgetTimeout(
+                f"LLM rate budget not available after {waited:.1f}s (needs {wait:.1f}s more)"
+            )
+
+    def acquire(self, tokens, priority=None, timeout=None):
+        """
+        Blocks until the call may run. Returns the seconds waited. Raises LLMBudgetTimeout
+        when the budget will not be there within `timeout` (or the max wait of `priority`).
+        """
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        wait = self._try_take(tokens, priority)
+        waiter_id = None
+        if wait:
+            waiter_id = self._enqueue(priority)
+            try:
+                while wait:
+                    self._check_deadline(started, wait, timeout, priority)
+                    time.sleep(min(wait, 1.0))
+                    wait = self._try_take(tokens, priority)
+            finally:
+                self._dequeue(waiter_id)
+        waited = time.monotonic() - started
+        self._record(priority, waited, tokens, queued=waiter_id is not None)
+        return waited
+
+    async def aacquire(self, tokens, priority=None, timeout=None):
+        """Async version of acquire(); waits without blocking the event loop."""
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        wait = await asyncio.to_thread(self._try_take, tokens, priority)
+        waiter_id = None
+        if wait:
+            waiter_id = await asyncio.to_thread(self._enqueue, priority)
+            try:
+                while wait:
+                    self._check_deadline(started, wait, timeout, priority)
+                    await asyncio.sleep(min(wait, 1.0))
+                    wait = await asyncio.to_thread(self._try_take, tokens, priority)
+            finally:
+                await asyncio.to_thread(self._dequeue, waiter_id)
+        waited = time.monotonic() - started
+        await asyncio.to_thread(self._record, priority, waited, tokens, waiter_id is not None)
+        return waited
+
+    def settle(self, estimated, actual, priority=None):
+        """Corrects the token budget once the provider reported the real usage of a call."""
+        priority = current_priority() if priority is None else priority
+        with self._transaction() as conn:
+            if any(bucket.name == "tpm" for bucket in self.buckets):
+                conn.execute("UPDATE bucket SET level = level + ? WHERE name = 'tpm'", (estimated - actual,))
+            conn.execute("UPDATE stat SET tokens = tokens + ? WHERE priority = ?", (actual - estimated, priority))
+
+    # --- Metrics ---
+
+    def _record(self, priority, waited, tokens, queued):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO stat (priority, calls, waited, wait_total, wait_max, tokens) VALUES (?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT(priority) DO UPDATE SET calls = calls + 1, waited = waited + excluded.waited, "
+                "wait_total = wait_total + excluded.wait_total, wait_max = MAX(wait_max, excluded.wait_max), "
+                "tokens = tokens + excluded.tokens",
+                (priority, int(queued), waited, waited, int(tokens)),
+            )
+
+    def metrics(self):
+        """Budgets, queue depth per priority, and call / wait-time totals per priority since the last reset."""
+        conn = self._db()
+        levels = self._levels(conn, time.time())
+        queue = dict(conn.execute("SELECT priority, COUNT(*) FROM waiter GROUP BY priority"))
+        stats = {}
+        for priority, calls, waited, wait_total, wait_max, tokens in conn.execute("SELECT * FROM stat ORDER BY priority"):
+            stats[priority] = {
+                "calls": calls,
+                "waited_calls": waited,
+                "avg_wait_ms": round(wait_total / calls * 1000, 1) if calls else 0.0,
+                "max_wait_ms": round(wait_max * 1000, 1),
+                "tokens": tokens,
+            }
+        return {
+            "budgets": {
+                bucket.name: {"limit_per_minute": bucket.capacity, "available": round(levels[bucket.name], 1)}
+                for bucket in self.buckets
+            },
+            "queue_depth": {priority: queue.get(priority, 0) for priority in sorted({*queue, *stats})},
+            "priorities": stats,
+        }
+
+    def reset_metrics(self):
+        self._db().execute("DELETE FROM stat")
+
+
+@lru_cache(maxsize=1)
+def get_llm_governor():
+    """
+    Process-wide governor configured from LLM_RPM_LIMIT / LLM_TPM_LIMIT, or None when both
+    are 0 (the default). Every process pointing at the same LLM_GOVERNOR_DB shares the budgets.
+    """
+    rpm = float(_setting("LLM_RPM_LIMIT", 0))
+    tpm = float(_setting("LLM_TPM_LIMIT", 0))
+    if not rpm and not tpm:
+        return None
+    return LLMGovernor(
+        _setting("LLM_GOVERNOR_DB", "llm_governor.sqlite3"),
+        rpm=rpm,
+        tpm=tpm,
+        reserve=float(_setting("LLM_LOW_PRIORITY_RESERVE", 0.2)),
+        max_wait=float(_setting("LLM_GOVERNOR_MAX_WAIT_SECONDS", 120)),
+        chat_max_wait=float(_setting("LLM_CHAT_MAX_WAIT_SECONDS", 15)),
+    )
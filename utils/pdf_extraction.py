@@ -0,0 +1,62 @@
+# utils/pdf_extraction.py
+# Streaming PDF text extraction. Kept free of LangChain/LLM imports so that
+# PDF worker processes (utils/pdf_pool.py) start quickly. pdfplumber itself is imported
+# on first use, so web and job processes that only import this module do not pay for it.
+import os
+import time
+from typing import NamedTuple
+
+# Extraction budgets: a resume never needs more than a few pages of text
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 10))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 40000))
+
+class PageText(NamedTuple):
+    number: int
+    text: str
+    seconds: float
+
+def iter_pdf_pages(file_path, max_pages=None, max_chars=None):
+    """
+    Yields the text of each page as it is extracted, stopping early once the page
+    or character budget is reached. Each page's parsed layout objects are released
+    before moving on, so memory stays flat regardless of the PDF size.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+
+    import pdfplumber
+
+    total_chars = 0
+    with pdfplumber.open(file_path) as pdf:
+        for number, page in enumerate(pdf.pages, start=1):
+            if number > max_pages:
+                break
+            start = time.perf_counter()
+            text = page.extract_text() or ""
+            page.close()
+
+            text = text[:max_chars - total_chars]
+            total_chars += len(text)
+            yield PageText(number, text, time.perf_counter() - start)
+
+            if total_chars >= max_chars:
+                break
+
+def extract_pdf(file_path, max_pages=None, max_chars=None):
+    """
+    Streams the PDF through iter_pdf_pages and returns (text, report).
+    The report holds the page count, character count and per-page timings.
+    """
+    texts, page_seconds = [], []
+    for page in iter_pdf_pages(file_path, max_pages=max_pages, max_chars=max_chars):
+        texts.append(page.text)
+        page_seconds.append(round(page.seconds, 4))
+
+    text = "\n\n".join(texts)
+    report = {
+        "pages": len(texts),
+        "chars": len(text),
+        "page_seconds": page_seconds,
+        "total_seconds": round(sum(page_seconds), 4),
+    }
+    return text, report
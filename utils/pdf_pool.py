@@ -0,0 +1,180 @@
+# utils/pdf_pool.py
+# Runs PDF extraction in long-lived worker processes. pdfplumber is pure Python and
+# CPU bound: in-process it holds the GIL, and a malformed file can hang it forever.
+# Each job here gets a hard timeout and an RSS cap; offending workers are killed and replaced.
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from .pdf_extraction import extract_pdf
+
+PDF_POOL_SIZE = int(os.getenv("PDF_POOL_SIZE", 2))
+PDF_TIMEOUT_SECONDS = float(os.getenv("PDF_TIMEOUT_SECONDS", 30))
+PDF_RSS_LIMIT_MB = int(os.getenv("PDF_RSS_LIMIT_MB", 512))
+# Workers are also recycled after this many jobs, to cap slow leaks
+PDF_MAX_JOBS_PER_WORKER = int(os.getenv("PDF_MAX_JOBS_PER_WORKER", 200))
+
+
+class PDFExtractionError(Exception):
+    """Structured extraction failure. `code` is one of: timeout, memory, crashed, invalid_pdf."""
+    # The same file fails the same way on every attempt, so background jobs should not retry it
+    retryable = False
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def _rss_mb(pid):
+    """Current resident set size of a process in MiB (Linux /proc); None where unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _worker_main(conn):
+    """Worker process: receives (path, max_pages, max_chars) jobs until the pipe closes."""
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        path, max_pages, max_chars = job
+        try:
+            text, report = extract_pdf(path, max_pages=max_pages, max_chars=max_chars)
+            conn.send(("ok", text, report))
+        except MemoryError:
+            conn.send(("error", "memory", "PDF extraction ran out of memory"))
+            break
+        except Exception as e:
+            conn.send(("error", "invalid_pdf", f"Could not read PDF: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+
+    def kill(self):
+        try:
+            self.conn.close()
+        finally:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=5)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.kill()
+
+
+class PDFProcessPool:
+    """
+    Fixed-size pool of persistent extraction processes. Thread safe: callers block
+    until a worker is free. Workers are started lazily and replaced when they time out,
+    exceed the RSS limit, crash, or reach `max_jobs_per_worker`.
+    """
+
+    def __init__(self, size=PDF_POOL_SIZE, timeout=PDF_TIMEOUT_SECONDS, rss_limit_mb=PDF_RSS_LIMIT_MB,
+                 max_jobs_per_worker=PDF_MAX_JOBS_PER_WORKER):
+        self.timeout = timeout
+        self.rss_limit_mb = rss_limit_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._ctx = multiprocessing.get_context("spawn")
+        # LIFO so the most recently used (already warm) worker is picked first
+        self._slots = queue.LifoQueue()
+        for _ in range(size):
+            self._slots.put(None)  # worker started on first use
+        self._closed = False
+
+    def extract(self, path, max_pages=None, max_chars=None, timeout=None):
+        """Returns (text, report) like extract_pdf, or raises PDFExtractionError."""
+        if self._closed:
+            raise RuntimeError("PDF pool has been shut down")
+        timeout = self.timeout if timeout is None else timeout
+
+        worker = self._slots.get()
+        try:
+            if worker is None or not worker.process.is_alive():
+                worker = _Worker(self._ctx)
+            worker.conn.send((str(path), max_pages, max_chars))
+            message = self._wait(worker, timeout)
+            worker.jobs_done += 1
+
+            if message[0] == "error":
+                if message[1] == "memory":
+                    worker.kill()
+                    worker = None
+                raise PDFExtractionError(message[1], message[2])
+
+            if worker.jobs_done >= self.max_jobs_per_worker:
+                worker.stop()
+                worker = None
+            _, text, report = message
+            return text, report
+        except PDFExtractionError:
+            raise
+        except (EOFError, OSError, BrokenPipeError):
+            if worker is not None:
+                worker.kill()
+            worker = None
+            raise PDFExtractionError("crashed", "PDF worker process crashed while reading the file")
+        finally:
+            self._slots.put(worker)
+
+    def _wait(self, worker, timeout):
+        """Waits for the worker's reply while enforcing the deadline and the RSS limit."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                worker.kill()
+                raise PDFExtractionError("timeout", f"PDF extraction timed out after {timeout:g}s")
+            if worker.conn.poll(min(remaining, 0.1)):
+                return worker.conn.recv()
+            rss = _rss_mb(worker.process.pid)
+            if rss is not None and rss > self.rss_limit_mb:
+                worker.kill()
+                raise PDFExtractionError("memory", f"PDF extraction exceeded {self.rss_limit_mb} MiB")
+            if not worker.process.is_alive():
+                raise EOFError
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._slots.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_pool():
+    """Process-wide pool, created on first use and shut down at interpreter exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PDFProcessPool()
+            atexit.register(_pool.shutdown)
+        return _pool
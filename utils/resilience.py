@@ -0,0 +1,174 @@
+# utils/resilience.py
+# Failure handling for calls to the LLM provider: deadlines that follow the work into
+# the calls made on its behalf, bounded retries with jittered backoff, and a circuit
+# breaker that fails fast while the provider is down, so callers can fall back at once.
+import asyncio
+import contextlib
+import contextvars
+import random
+import threading
+import time
+
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The current deadline (see `deadline()`) passed before the work could finish."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The circuit breaker is open: the call was rejected without reaching the provider."""
+
+
+# --- 1. Deadlines ---
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """
+    Work inside the block should finish within `seconds` (None: no limit). Nested deadlines
+    keep the earliest. Retries and LLM calls read it through remaining().
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left before the current deadline, or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def check_deadline():
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+
+
+# --- 2. Retries ---
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """'Full jitter' exponential backoff: uniform in [0, min(max_delay, base_delay * 2^(attempt-1))]."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def _next_delay(error, attempt, attempts, base_delay, max_delay, retry_if):
+    """Sleep before the next attempt, or None when `error` should be raised."""
+    if attempt >= attempts or not retry_if(error):
+        return None
+    delay = backoff_delay(attempt, base_delay, max_delay)
+    left = remaining()
+    if left is not None and delay >= left:
+        return None
+    print(f"Retrying after {type(error).__name__} (attempt {attempt}/{attempts}) in {delay:.2f}s")
+    return delay
+
+
+def call_with_retries(func, attempts=3, base_delay=0.5, max_delay=8.0, retry_if=lambda error: True):
+    """
+    Calls `func()` up to `attempts` times while `retry_if(error)` holds, with jittered
+    exponential backoff in between. Never sleeps past the current deadline.
+    """
+    for attempt in range(1, attempts + 1):
+        check_deadline()
+        try:
+            return func()
+        except Exception as e:
+            delay = _next_delay(e, attempt, attempts, base_delay, max_delay, retry_if)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+async def acall_with_retries(func, attempts=3, base_delay=0.5, max_delay=8.0, retry_if=lambda error: True):
+    """Async version of call_with_retries(); `func` returns an awaitable."""
+    for attempt in range(1, attempts + 1):
+        check_deadline()
+        try:
+            return await func()
+        except Exception as e:
+            delay = _next_delay(e, attempt, attempts, base_delay, max_delay, retry_if)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+
+
+# --- 3. Circuit Breaker ---
+
+class CircuitBreaker:
+    """
+    closed: calls pass; `failure_threshold` consecutive failures open the circuit.
+    open: calls fail with CircuitOpenError until `reset_timeout` seconds have passed.
+    half-open: a single trial call passes; its success closes the circuit, a failure reopens it.
+    Per process and thread safe.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def is_open(self):
+        """True while calls would be rejected (open, or half-open with its trial call running)."""
+        with self._lock:
+            state = self._state()
+            return state == self.OPEN or (state == self.HALF_OPEN and self._trial_running)
+
+    def before_call(self):
+        """Raises CircuitOpenError unless the call may go ahead."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(f"Circuit '{self.name}' is open; next trial in {retry_in:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    print(f"Circuit '{self.name}' opened after {self._failures} failure(s)")
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self):
+        """Ends a call that neither proved nor disproved the provider's health (e.g. a bad request)."""
+        with self._lock:
+            self._trial_running = False
@@ -1,43 +1,89 @@
 import os
 import re
 import json
-from langchain_community.document_loaders import PDFPlumberLoader
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
+import time
+import hashlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
 from pydantic import BaseModel, Field
-from typing import List
-
-# Initialize LLM
-api_key = os.getenv("GROQ_API_KEY")
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0, api_key=api_key)
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from .resume_parser import heuristic_parse_resume, parse_resume_content
+from .resilience import deadline
+from .pdf_extraction import extract_pdf
+from .pdf_pool import PDFExtractionError, get_pdf_pool
+from .skill_index import SKILL_INDEX_VERSION, canonicalize_job_description, compact_key, get_skill_index
+from .skill_matcher import get_skill_matcher, MATCHED, MISSING, UNRESOLVED
 
 # --- 1. Helpers & Extraction ---
 
-def extract_text_from_pdf(file_path):
-    try:
-        loader = PDFPlumberLoader(file_path)
-        pages = loader.load()
-        text = "\n\n".join([p.page_content for p in pages])
-        return text
-    except Exception as e:
-        print(f"Error loading PDF: {e}")
-        return ""
+# Run pdfplumber in the isolated worker pool (set to 0 to extract in-process, e.g. for debugging)
+PDF_USE_PROCESS_POOL = os.getenv("PDF_USE_PROCESS_POOL", "1") == "1"
+
+def extract_text_from_pdf(file_path, max_pages=None, max_chars=None):
+    """
+    Extracts the resume text in a PDF worker process.
+    Raises PDFExtractionError (timeout / memory / crashed / invalid_pdf) instead of hanging.
+    """
+    if PDF_USE_PROCESS_POOL:
+        text, report = get_pdf_pool().extract(file_path, max_pages=max_pages, max_chars=max_chars)
+    else:
+        try:
+            text, report = extract_pdf(file_path, max_pages=max_pages, max_chars=max_chars)
+        except Exception as e:
+            raise PDFExtractionError("invalid_pdf", f"Could not read PDF: {e}") from e
+
+    print(f"PDF extracted: {report['pages']} page(s), {report['chars']} chars in {report['total_seconds']}s "
+          f"(per page: {report['page_seconds']})")
+    return text
 
 class JobDescriptionSchema(BaseModel):
     required_skills: List[str] = Field(description="Must-have technical skills")
     nice_to_have: List[str] = Field(description="Bonus skills")
     min_experience_years: int = Field(description="Minimum years of experience required")
 
-def parse_job_description(jd_text):
-    """Extracts structured requirements from the JD text."""
-    structured_llm = llm.with_structured_output(JobDescriptionSchema)
-    
+jd_system_prompt = "Extract technical requirements from the Job Description. Return a clean list of strings."
+
+# Version tag of stored JD parses (changes with the schema or the prompt)
+JD_PARSER_VERSION = hashlib.sha256(
+    (json.dumps(JobDescriptionSchema.model_json_schema(), sort_keys=True) + jd_system_prompt + SKILL_INDEX_VERSION).encode("utf-8")
+).hexdigest()[:16]
+
+@lru_cache(maxsize=1)
+def get_jd_parser_chain():
+    """Prompt + structured LLM for JD parsing, built once per process."""
+    from langchain_core.prompts import ChatPromptTemplate
+    from .llm import get_chat_model
+
     prompt = ChatPromptTemplate.from_messages([
-        ("system", "Extract technical requirements from the Job Description. Return a clean list of strings."),
+        ("system", jd_system_prompt),
         ("human", "{jd_text}"),
     ])
-    chain = prompt | structured_llm
-    return chain.invoke({"jd_text": jd_text})
+    return prompt | get_chat_model(temperature=0).with_structured_output(JobDescriptionSchema)
+
+def parse_job_description(jd_text):
+    """Extracts structured requirements from the JD text."""
+    return canonicalize_job_description(get_jd_parser_chain().invoke({"jd_text": jd_text}))
+
+YEARS_PATTERN = re.compile(r"(\d+)\+?\s*(?:years|yrs)", re.IGNORECASE)
+NICE_TO_HAVE_PATTERN = re.compile(r"nice[\s-]to[\s-]have|bonus|preferred|a plus", re.IGNORECASE)
+
+def heuristic_parse_job_description(jd_text):
+    """
+    JD requirements without the LLM: the dictionary skills mentioned before a
+    "nice to have" / "bonus" / "preferred" marker are required, later ones optional.
+    """
+    jd_text = jd_text or ""
+    marker = NICE_TO_HAVE_PATTERN.search(jd_text)
+    split = marker.start() if marker else len(jd_text)
+    index = get_skill_index()
+    required = index.scan(jd_text[:split], strict=True)
+    years = YEARS_PATTERN.search(jd_text)
+    return JobDescriptionSchema(
+        required_skills=required,
+        nice_to_have=[skill for skill in index.scan(jd_text[split:], strict=True) if skill not in required],
+        min_experience_years=int(years.group(1)) if years else 0,
+    )
 
 # --- 2. Semantic Skill Matcher (NEW) ---
 
@@ -46,19 +92,7 @@ class SkillMatchSchema(BaseModel):
     missing_skills: List[str] = Field(description="Skills from the JD that are completely missing (semantically) from the resume.")
     matching_skills: List[str] = Field(description="Skills from the JD that were found in the resume (directly or semantically).")
 
-def evaluate_semantic_match(resume_skills, jd_skills):
-    """
-    Uses LLM to compare skills semantically instead of exact string matching.
-    """
-    if not jd_skills:
-        return SkillMatchSchema(match_percentage=100.0, missing_skills=[], matching_skills=[])
-    
-    if not resume_skills:
-        return SkillMatchSchema(match_percentage=0.0, missing_skills=jd_skills, matching_skills=[])
-
-    structured_llm = llm.with_structured_output(SkillMatchSchema)
-    
-    system_prompt = """
+semantic_match_system_prompt = """
     You are a Technical Recruiter. Compare the Candidate's Skills vs Job Requirements.
     
     Rules:
@@ -69,14 +103,87 @@ def evaluate_semantic_match(resume_skills, jd_skills):
     2. Be generous with related technologies.
     3. Return a score (0-100) representing how well the candidate covers the requirements.
     """
-    
+
+@lru_cache(maxsize=1)
+def get_semantic_match_chain():
+    """Prompt + structured LLM for the semantic skill match, built once per process."""
+    from langchain_core.prompts import ChatPromptTemplate
+    from .llm import get_chat_model
+
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        ("system", semantic_match_system_prompt),
         ("human", "Candidate Skills: {resume_skills}\n\nJob Requirements: {jd_skills}"),
     ])
+    return prompt | get_chat_model(temperature=0).with_structured_output(SkillMatchSchema)
+
+def evaluate_semantic_match(resume_skills, jd_skills):
+    """
+    Uses LLM to compare skills semantically instead of exact string matching.
+    """
+    if not jd_skills:
+        return SkillMatchSchema(match_percentage=100.0, missing_skills=[], matching_skills=[])
     
-    chain = prompt | structured_llm
-    return chain.invoke({"resume_skills": str(resume_skills), "jd_skills": str(jd_skills)})
+    if not resume_skills:
+        return SkillMatchSchema(match_percentage=0.0, missing_skills=jd_skills, matching_skills=[])
+
+    return get_semantic_match_chain().invoke({"resume_skills": str(resume_skills), "jd_skills": str(jd_skills)})
+
+def summarize_skill_details(details):
+    """Builds the SkillMatchSchema from per-requirement match details."""
+    if not details:
+        return SkillMatchSchema(match_percentage=100.0, missing_skills=[], matching_skills=[])
+    matching = [d["requirement"] for d in details if d["status"] == MATCHED]
+    missing = [d["requirement"] for d in details if d["status"] != MATCHED]
+    return SkillMatchSchema(
+        match_percentage=round(len(matching) / len(details) * 100, 1),
+        missing_skills=missing,
+        matching_skills=matching,
+    )
+
+def match_skill_details(resume_skills, jd_skills, llm_fallback=True):
+    """
+    Resolves every requirement with the local SkillMatcher and sends only the
+    requirements it cannot resolve to the LLM. Returns per-requirement details.
+    """
+    details = get_skill_matcher().resolve(resume_skills or [], jd_skills or [])
+    unresolved = [d for d in details if d["status"] == UNRESOLVED]
+
+    if unresolved and llm_fallback:
+        print(f"Semantic fallback for: {[d['requirement'] for d in unresolved]}")
+        llm_result = evaluate_semantic_match(resume_skills, [d["requirement"] for d in unresolved])
+        llm_matching = {compact_key(skill) for skill in llm_result.matching_skills}
+        for d in unresolved:
+            d["status"] = MATCHED if compact_key(d["requirement"]) in llm_matching else MISSING
+            d["source"] = "llm"
+    return details
+
+def rematch_skill_details(previous_details, resume_skills, jd_skills, llm_fallback=True):
+    """
+    Re-matches only the requirements that changed since `previous_details` were stored.
+    Requirements already resolved before (by the matcher or the LLM) are reused as is;
+    new requirements, and ones left unresolved, are matched again. Removed ones are dropped.
+    Returns (details, number of requirements that had to be matched).
+    """
+    previous = {
+        compact_key(d["requirement"]): d
+        for d in previous_details or []
+        if d.get("status") != UNRESOLVED
+    }
+    pending = [skill for skill in jd_skills or [] if compact_key(skill) not in previous]
+    fresh = {}
+    if pending:
+        for d in match_skill_details(resume_skills, pending, llm_fallback=llm_fallback):
+            fresh[compact_key(d["requirement"])] = d
+
+    details = []
+    for skill in jd_skills or []:
+        key = compact_key(skill)
+        details.append({**(previous.get(key) or fresh[key]), "requirement": skill})
+    return details, len(pending)
+
+def match_skills(resume_skills, jd_skills, llm_fallback=True):
+    """Drop-in replacement for evaluate_semantic_match that is local-first."""
+    return summarize_skill_details(match_skill_details(resume_skills, jd_skills, llm_fallback=llm_fallback))
 
 # --- 3. The BS Detector (Heuristics) ---
 
@@ -115,38 +222,167 @@ def analyze_impact_heuristics(work_experience):
     score = int((strong_bullets / total_bullets) * 100)
     return score, feedback
 
-# --- 4. The Main Coordinator ---
+# --- 4. Stage Graph ---
 
-def analyze_resume_compatibility(parsed_resume, jd_text):
+class Stage(NamedTuple):
     """
-    Orchestrates the comparison between Structured Resume and JD.
+    One step of the analysis pipeline.
+    `func` receives the results of the stages it depends on (by name).
+    `fallback` (same signature, no LLM) replaces its result when `func` fails or times out.
     """
-    # 1. Parse JD into Structure
-    parsed_jd = parse_job_description(jd_text)
-    
-    resume_skills = parsed_resume.get('skills', [])
-    jd_skills = parsed_jd.required_skills
-    
-    print(f"JD Requirements: {jd_skills}")
-    print(f"Resume Skills: {resume_skills}")
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[[Dict[str, Any]], Any]] = None
 
-    # 2. Semantic Skill Match (AI Powered)
-    print("Performing Semantic Analysis...")
-    semantic_result = evaluate_semantic_match(resume_skills, jd_skills)
-    
+class StageTimeoutError(TimeoutError):
+    def __init__(self, stage_name, timeout):
+        super().__init__(f"Stage '{stage_name}' did not finish within {timeout}s")
+        self.stage_name = stage_name
+
+# Per-stage timeouts in seconds (LLM stages dominate the wall clock)
+STAGE_TIMEOUTS = {
+    "raw_text": float(os.getenv("STAGE_TIMEOUT_EXTRACT", 60)),
+    "parsed_resume": float(os.getenv("STAGE_TIMEOUT_PARSE_RESUME", 90)),
+    "parsed_jd": float(os.getenv("STAGE_TIMEOUT_PARSE_JD", 60)),
+    "skill_details": float(os.getenv("STAGE_TIMEOUT_SKILL_MATCH", 60)),
+}
+
+def _run_stage(stage, results):
+    # The stage timeout is also the deadline of the LLM calls and retries inside it
+    with deadline(stage.timeout):
+        return stage.func(results)
+
+def run_stage_graph(stages, targets=None, seed=None, max_workers=4):
+    """
+    Runs a small dependency graph of stages on a thread pool.
+    A stage starts as soon as all of its dependencies have finished, so independent
+    stages (e.g. the resume and the JD parse) overlap and the wall clock follows the
+    longest path instead of the sum of all stages.
+
+    `seed` provides already known results (e.g. cache hits); those stages and any
+    upstream stages needed only by them are skipped. Returns a dict name -> result,
+    plus "degraded": the names of the stages whose fallback result was used.
+    Raises StageTimeoutError if a stage without a fallback overruns its timeout,
+    or the stage's own exception.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    results = dict(seed or {})
+    degraded = []
+
+    def degrade(name, error):
+        print(f"Stage '{name}' degraded to its fallback: {type(error).__name__}: {error}")
+        results[name] = by_name[name].fallback(dict(results))
+        degraded.append(name)
+
+    # 1. Work out which stages actually have to run
+    needed = set()
+    def require(name):
+        if name in results or name in needed:
+            return
+        needed.add(name)
+        for dep in by_name[name].deps:
+            require(dep)
+    for name in (targets or by_name):
+        require(name)
+
+    # 2. Schedule stages as their dependencies complete
+    running = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-stage")
+    try:
+        while needed or running:
+            for name in [n for n in needed if all(dep in results for dep in by_name[n].deps)]:
+                stage = by_name[name]
+                stage_deadline = time.monotonic() + stage.timeout if stage.timeout else None
+                # Copy the context, so the caller's LLM priority and deadline reach the stage's calls
+                future = executor.submit(contextvars.copy_context().run, _run_stage, stage, dict(results))
+                running[future] = (name, stage_deadline)
+                needed.discard(name)
+
+            if not running:
+                raise ValueError(f"Stages with unresolvable dependencies: {sorted(needed)}")
+
+            deadlines = [stage_deadline for _, stage_deadline in running.values() if stage_deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, _ = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    results[name] = future.result()
+                elif isinstance(error, Exception) and by_name[name].fallback:
+                    degrade(name, error)
+                else:
+                    raise error
+
+            now = time.monotonic()
+            for future, (name, stage_deadline) in list(running.items()):
+                if stage_deadline is not None and now >= stage_deadline:
+                    if not by_name[name].fallback:
+                        raise StageTimeoutError(name, by_name[name].timeout)
+                    running.pop(future)
+                    degrade(name, StageTimeoutError(name, by_name[name].timeout))
+    finally:
+        # Threads cannot be killed; a timed out stage finishes in the background and is discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results["degraded"] = degraded
+    return results
+
+def build_analysis_stages(resume_path=None, jd_text=None):
+    """
+    raw_text -> parsed_resume -+-> skill_details
+    parsed_jd -----------------+
+    parsed_resume -------------> impact
+
+    The LLM stages fall back to heuristics (dictionary skills, regexes, local skill matching),
+    so a provider outage or timeout costs precision instead of the whole analysis.
+    """
+    def skill_details(results, llm_fallback=True):
+        resume_skills = results["parsed_resume"].get('skills', [])
+        jd_skills = results["parsed_jd"].required_skills
+        print(f"JD Requirements: {jd_skills}")
+        print(f"Resume Skills: {resume_skills}")
+        return match_skill_details(resume_skills, jd_skills, llm_fallback=llm_fallback)
+
+    def impact(results):
+        return analyze_impact_heuristics(results["parsed_resume"].get('work_experience', []))
+
+    return [
+        Stage("raw_text", lambda results: extract_text_from_pdf(resume_path), timeout=STAGE_TIMEOUTS["raw_text"]),
+        Stage("parsed_resume", lambda results: parse_resume_content(results["raw_text"]), ("raw_text",), STAGE_TIMEOUTS["parsed_resume"],
+              fallback=lambda results: heuristic_parse_resume(results["raw_text"])),
+        Stage("parsed_jd", lambda results: parse_job_description(jd_text), timeout=STAGE_TIMEOUTS["parsed_jd"],
+              fallback=lambda results: heuristic_parse_job_description(jd_text)),
+        Stage("skill_details", skill_details, ("parsed_resume", "parsed_jd"), STAGE_TIMEOUTS["skill_details"],
+              fallback=lambda results: skill_details(results, llm_fallback=False)),
+        Stage("impact", impact, ("parsed_resume",)),
+    ]
+
+# --- 5. The Main Coordinator ---
+
+# Share of the overall score per component (normalized, so they need not sum to 1)
+DEFAULT_SCORE_WEIGHTS = {"skills": 0.6, "impact": 0.4}
+
+def build_analysis_results(semantic_result, impact_result, weights=None):
+    """
+    Combines the skill match and impact heuristics into the dashboard metrics.
+    Cheap and LLM free: re-run it on stored artifacts to re-score with other `weights`.
+    """
     skill_score = semantic_result.match_percentage
     missing_skills = semantic_result.missing_skills
-    
+    impact_score, impact_feedback = impact_result
+
     print(f"Semantic Score: {skill_score}")
     print(f"Actually Missing: {missing_skills}")
 
-    # 3. Impact Score (Heuristics)
-    experience_list = parsed_resume.get('work_experience', [])
-    impact_score, impact_feedback = analyze_impact_heuristics(experience_list)
-    
-    # 4. Final Weighted Score
-    # Skills (60%), Formatting/Impact (40%)
-    overall_score = (skill_score * 0.6) + (impact_score * 0.4)
+    # Final Weighted Score
+    # Skills (60%), Formatting/Impact (40%) by default
+    weights = weights or DEFAULT_SCORE_WEIGHTS
+    total_weight = (weights["skills"] + weights["impact"]) or 1.0
+    overall_score = (skill_score * weights["skills"] + impact_score * weights["impact"]) / total_weight
     
     return {
         "overall_match_score": round(overall_score, 1),
@@ -156,4 +392,34 @@ def analyze_resume_compatibility(parsed_resume, jd_text):
         },
         "missing_keywords": missing_skills,
         "improved_suggestion": impact_feedback
-    }
\ No newline at end of file
+    }
+
+def run_analysis_pipeline(resume_path=None, jd_text=None, parsed_resume=None, parsed_jd=None, weights=None):
+    """
+    Runs extraction, both parses, the skill match and the impact heuristics as a stage graph.
+    Already known parses (cache hits) are passed in and their stages are skipped.
+    Returns the stage results (including the per-requirement "skill_details" and the
+    "impact" tuple, which are stored for re-scoring) plus the final metrics under "results".
+    When LLM stages fell back to heuristics, they are listed under "degraded" and
+    "needs_refinement" is set: the result is provisional until re-run with the LLM.
+    """
+    seed = {}
+    if parsed_resume is not None:
+        seed["parsed_resume"] = parsed_resume
+    if parsed_jd is not None:
+        seed["parsed_jd"] = parsed_jd
+
+    stages = build_analysis_stages(resume_path=resume_path, jd_text=jd_text)
+    outputs = run_stage_graph(stages, targets=("skill_details", "impact"), seed=seed)
+    outputs["skill_match"] = summarize_skill_details(outputs["skill_details"])
+    outputs["results"] = build_analysis_results(outputs["skill_match"], outputs["impact"], weights)
+    outputs["needs_refinement"] = bool(outputs["degraded"])
+    return outputs
+
+def analyze_resume_compatibility(parsed_resume, jd_text=None, parsed_jd=None, weights=None):
+    """
+    Orchestrates the comparison between Structured Resume and JD.
+    Pass `parsed_jd` (a JobDescriptionSchema) to reuse an existing JD parse.
+    """
+    outputs = run_analysis_pipeline(jd_text=jd_text, parsed_resume=parsed_resume, parsed_jd=parsed_jd, weights=weights)
+    return outputs["results"]
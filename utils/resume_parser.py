@@ -1,25 +1,12 @@
 # utils/resume_parser.py
-import os
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
+import re
+import json
+import hashlib
+from functools import lru_cache
 from .structures import ResumeSchema  # Importing the blueprint we just created
+from .skill_index import SKILL_INDEX_VERSION, canonicalize_resume, get_skill_index
 
-# Initialize LLM
-api_key = os.getenv("GROQ_API_KEY")
-if not api_key:
-    raise ValueError("GROQ_API_KEY environment variable is not set")
-
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0, api_key=api_key)
-
-# Configure the LLM to strictly follow our Pydantic schema
-structured_llm = llm.with_structured_output(ResumeSchema)
-
-def parse_resume_content(resume_text: str) -> dict:
-    """
-    Parses raw PDF text into a structured JSON dictionary.
-    """
-    
-    system_prompt = """
+system_prompt = """
     You are an expert Resume Parser. 
     Extract details from the resume text below and structure them strictly.
     
@@ -29,22 +16,73 @@ def parse_resume_content(resume_text: str) -> dict:
     3. Do not invent information. If it's not there, leave it blank.
     4. For 'technologies' in Work Experience, infer them from the bullet points if not explicitly listed.
     """
-    
+
+# Version tag of the parser output. Changes whenever the schema, the prompt or the
+# skill dictionary changes, so cached parses produced by an older parser are never served.
+PARSER_VERSION = hashlib.sha256(
+    (json.dumps(ResumeSchema.model_json_schema(), sort_keys=True) + system_prompt + SKILL_INDEX_VERSION).encode("utf-8")
+).hexdigest()[:16]
+
+@lru_cache(maxsize=1)
+def get_resume_parser_chain():
+    """
+    Prompt + structured LLM, built once per process and reused for every resume.
+    LangChain and the LLM client load on first use, not when Django imports this module.
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+    from .llm import get_chat_model
+
     prompt = ChatPromptTemplate.from_messages([
         ("system", system_prompt),
         ("human", "{resume_text}"),
     ])
+    # Configure the LLM (backend chosen in utils/llm.py) to strictly follow our Pydantic schema
+    return prompt | get_chat_model(temperature=0).with_structured_output(ResumeSchema)
+
+def parse_resume_content(resume_text: str) -> dict:
+    """
+    Parses raw PDF text into a structured JSON dictionary.
+    Raises when the LLM call fails; the analysis pipeline falls back to heuristic_parse_resume.
+    """
+    chain = get_resume_parser_chain()
 
-    chain = prompt | structured_llm
-
-    try:
-        # Invoke the chain
-        print("Parsing resume with AI...")
-        result = chain.invoke({"resume_text": resume_text})
-        
-        # Convert Pydantic object back to standard Python Dictionary
-        return result.dict()
-        
-    except Exception as e:
-        print(f"Parsing Error: {e}")
-        return {}
\ No newline at end of file
+    # Invoke the chain
+    print("Parsing resume with AI...")
+    result = chain.invoke({"resume_text": resume_text})
+
+    # Convert Pydantic object back to standard Python Dictionary,
+    # with skills/technologies mapped to their canonical names
+    return canonicalize_resume(result.dict())
+
+# --- Heuristic fallback (no LLM) ---
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+BULLET_PATTERN = re.compile(r"^\s*[-*\u2022\u25aa\u25cf\u2013\u2023\u2043]\s*(.+)")
+
+def heuristic_parse_resume(resume_text: str) -> dict:
+    """
+    ResumeSchema-shaped parse without the LLM, used while the provider is unavailable:
+    skills come from the skill dictionary, contact details from regexes, and the bullet
+    points (for the impact heuristics) are kept as one untitled role.
+    """
+    lines = [line.strip() for line in (resume_text or "").splitlines() if line.strip()]
+    bullets = [match.group(1).strip() for match in map(BULLET_PATTERN.match, lines) if match]
+    email = EMAIL_PATTERN.search(resume_text or "")
+    phone = PHONE_PATTERN.search(resume_text or "")
+    index = get_skill_index()
+    return {
+        "full_name": lines[0][:80] if lines else "",
+        "summary": "",
+        "email": email.group(0) if email else "",
+        "phone": phone.group(0).strip() if phone else "",
+        "skills": index.scan(resume_text or "", strict=True),
+        "work_experience": [{
+            "role": "Experience", "company": "", "duration": "",
+            "technologies": index.scan(" ".join(bullets), strict=True),
+            "key_achievements": bullets,
+        }] if bullets else [],
+        "projects": [],
+        "education": [],
+        "certifications": [],
+    }
@@ -0,0 +1,144 @@
+# utils/skill_index.py
+# Compiled alias index over the shipped skill dictionary (utils/skill_taxonomy.py).
+# Used to canonicalize parsed resumes and JDs deterministically, after the LLM parse.
+import hashlib
+import json
+import re
+from functools import lru_cache
+
+from .skill_taxonomy import SKILL_TAXONOMY
+
+# Changes whenever the skill dictionary changes (part of the parser version tags)
+SKILL_INDEX_VERSION = hashlib.sha256(json.dumps(SKILL_TAXONOMY, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+# Aliases that are ordinary English words; only trusted as a whole list item, never inside free text
+AMBIGUOUS_IN_TEXT = {
+    "go", "rest", "net", "spring", "next", "node", "express", "rails", "shell", "cache", "search",
+    "agents", "torch", "lambda", "os", "cv", "tf", "dl", "rl", "ai", "r", "c", "ts", "js", "py",
+}
+
+# Characters that mark a list item as several skills ("Python/Django", "AWS, GCP", "C & C++")
+COMPOUND_SEPARATORS = re.compile(r"[/,;&|]|\band\b|\(")
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+_END = "$"
+
+
+def compact_key(skill):
+    """'React JS', 'react.js' and 'ReactJS' all become 'reactjs'. Keeps '+' and '#' (C++, C#)."""
+    return re.sub(r"[\s._\-]+", "", skill.strip().casefold())
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.casefold())
+
+
+class SkillIndex:
+    """
+    Two lookups compiled once from the taxonomy:
+    * `aliases`: compact key -> canonical name, for whole list items (O(1) dict lookup).
+    * a token trie over every alias phrase, for finding skills inside longer strings
+      ("Built data pipelines in Airflow and PySpark") by longest match.
+    """
+
+    def __init__(self, taxonomy=SKILL_TAXONOMY):
+        self.aliases = {}
+        self.trie = {}
+        for canonical, entry in taxonomy.items():
+            for phrase in [canonical] + list(entry.get("aliases", [])):
+                self.aliases.setdefault(compact_key(phrase), canonical)
+                self._insert(phrase, canonical)
+
+    def _insert(self, phrase, canonical):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            ambiguous = len(tokens) == 1 and tokens[0] in AMBIGUOUS_IN_TEXT
+            node[_END] = (canonical, ambiguous)
+
+    def lookup(self, skill):
+        """Canonical name for a single skill string, or None."""
+        key = compact_key(skill)
+        if key in self.aliases:
+            return self.aliases[key]
+        # 'Kubernetes (EKS)' -> 'Kubernetes'
+        base_key = compact_key(re.sub(r"\(.*?\)", "", skill))
+        return self.aliases.get(base_key) if base_key else None
+
+    def scan(self, text, strict=True):
+        """
+        Returns the canonical skills mentioned in `text` (in order, without duplicates),
+        using longest match over the token trie. With `strict`, aliases that are also
+        common words ('go', 'rest', 'spring') are ignored.
+        """
+        tokens = tokenize(text)
+        found = []
+        i = 0
+        while i < len(tokens):
+            node, match, match_end = self.trie, None, i
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _END in node:
+                    match, match_end = node[_END], j + 1
+            if match and not (strict and match[1]):
+                if match[0] not in found:
+                    found.append(match[0])
+                i = match_end
+            else:
+                i += 1
+        return found
+
+    def normalize(self, skill):
+        """Canonical form(s) of one list item. Unknown skills are kept as written."""
+        skill = skill.strip()
+        if not skill:
+            return []
+        canonical = self.lookup(skill)
+        if canonical:
+            return [canonical]
+        if COMPOUND_SEPARATORS.search(skill):
+            found = self.scan(skill, strict=False)
+            if found:
+                return found
+        return [skill]
+
+    def normalize_list(self, skills):
+        normalized, seen = [], set()
+        for skill in skills or []:
+            for name in self.normalize(skill):
+                if name.casefold() not in seen:
+                    seen.add(name.casefold())
+                    normalized.append(name)
+        return normalized
+
+
+@lru_cache(maxsize=1)
+def get_skill_index():
+    """Process-wide index; compiled on first use."""
+    return SkillIndex()
+
+
+def canonicalize_resume(parsed_resume):
+    """Canonicalizes `skills` and the `technologies` of every role and project in one pass."""
+    if not parsed_resume:
+        return parsed_resume
+    index = get_skill_index()
+    parsed_resume["skills"] = index.normalize_list(parsed_resume.get("skills"))
+    for section in ("work_experience", "projects"):
+        for entry in parsed_resume.get(section) or []:
+            entry["technologies"] = index.normalize_list(entry.get("technologies"))
+    return parsed_resume
+
+
+def canonicalize_job_description(parsed_jd):
+    """Canonicalizes the skill lists of a JobDescriptionSchema in place."""
+    index = get_skill_index()
+    parsed_jd.required_skills = index.normalize_list(parsed_jd.required_skills)
+    parsed_jd.nice_to_have = index.normalize_list(parsed_jd.nice_to_have)
+    return parsed_jd
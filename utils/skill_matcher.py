@@ -0,0 +1,144 @@
+# utils/skill_matcher.py
+# Local, deterministic skill matching: taxonomy aliases + "implies" closure + character n-gram similarity.
+import zlib
+from functools import lru_cache
+
+from .skill_taxonomy import SKILL_TAXONOMY
+from .skill_index import compact_key, get_skill_index
+
+MATCHED = "matched"
+MISSING = "missing"
+UNRESOLVED = "unresolved"
+
+
+class SkillMatcher:
+    """
+    Resolves each job requirement against a candidate's skills without calling an LLM.
+
+    1. Both sides are mapped to canonical taxonomy names (exact alias, then fuzzy).
+    2. The candidate's skills are expanded with everything they imply (transitively).
+    3. A requirement is MATCHED if it is covered by the expanded set, or if a candidate
+       skill is a close character n-gram match of it.
+    4. A requirement known to the taxonomy but not covered is MISSING.
+    5. Anything else is UNRESOLVED and left for the LLM.
+    """
+
+    def __init__(self, taxonomy=SKILL_TAXONOMY, ngram=3, dims=1024, fuzzy_threshold=0.82):
+        self.ngram = ngram
+        self.dims = dims
+        self.fuzzy_threshold = fuzzy_threshold
+
+        # 1. Alias table: compact key -> canonical name (shared with the normalization index)
+        self.index = get_skill_index()
+        self.aliases = self.index.aliases
+
+        # 2. Transitive "implies" closure per canonical skill
+        self.implied = {}
+        for canonical in taxonomy:
+            seen, stack = set(), list(taxonomy[canonical].get("implies", []))
+            while stack:
+                skill = stack.pop()
+                if skill in seen or skill == canonical:
+                    continue
+                seen.add(skill)
+                stack.extend(taxonomy.get(skill, {}).get("implies", []))
+            self.implied[canonical] = frozenset(seen)
+
+        # 3. N-gram matrix over every alias, for fuzzy canonicalization (e.g. 'Tensorflow 2')
+        self._alias_keys = list(self.aliases)
+        self._alias_matrix = self._vectorize(self._alias_keys)
+
+    # --- Vectorization ---
+
+    @lru_cache(maxsize=4096)
+    def _vector(self, key):
+        # numpy is imported on first use so loading the URLconf does not pay for it
+        import numpy as np
+
+        vec = np.zeros(self.dims, dtype=np.float32)
+        padded = f" {key} "
+        for i in range(max(1, len(padded) - self.ngram + 1)):
+            vec[zlib.crc32(padded[i:i + self.ngram].encode("utf-8")) % self.dims] += 1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _vectorize(self, keys):
+        import numpy as np
+
+        if not keys:
+            return np.zeros((0, self.dims), dtype=np.float32)
+        return np.vstack([self._vector(key) for key in keys])
+
+    # --- Canonicalization ---
+
+    def canonicalize(self, skill):
+        """Returns the canonical taxonomy name for a skill string, or None if unknown."""
+        import numpy as np
+
+        key = compact_key(skill)
+        if not key:
+            return None
+        canonical = self.index.lookup(skill)
+        if canonical:
+            return canonical
+        similarity = self._alias_matrix @ self._vector(key)
+        best = int(np.argmax(similarity))
+        if similarity[best] >= self.fuzzy_threshold:
+            return self.aliases[self._alias_keys[best]]
+        return None
+
+    def covered_skills(self, resume_skills):
+        """Maps canonical skill -> the resume skill that covers it (directly or by implication)."""
+        covered = {}
+        for skill in resume_skills:
+            canonical = self.canonicalize(skill)
+            if canonical is None:
+                continue
+            covered.setdefault(canonical, skill)
+            for implied in self.implied.get(canonical, ()):
+                covered.setdefault(implied, skill)
+        return covered
+
+    # --- Matching ---
+
+    def resolve(self, resume_skills, jd_skills):
+        """
+        Returns one dict per requirement:
+        {"requirement", "status" (matched/missing/unresolved), "evidence", "source"}.
+        """
+        import numpy as np
+
+        resume_skills = [s for s in resume_skills if s and s.strip()]
+        covered = self.covered_skills(resume_skills)
+        resume_keys = [compact_key(s) for s in resume_skills]
+        resume_canonicals = [self.canonicalize(s) for s in resume_skills]
+        resume_matrix = self._vectorize(resume_keys)
+
+        details = []
+        for requirement in jd_skills:
+            canonical = self.canonicalize(requirement)
+            if canonical is not None and canonical in covered:
+                details.append({"requirement": requirement, "status": MATCHED,
+                                "evidence": covered[canonical], "source": "taxonomy"})
+                continue
+
+            if len(resume_keys):
+                similarity = resume_matrix @ self._vector(compact_key(requirement))
+                best = int(np.argmax(similarity))
+                # Two different taxonomy skills never match by spelling ('R programming' vs 'Programming')
+                known_apart = canonical is not None and resume_canonicals[best] not in (None, canonical)
+                if similarity[best] >= self.fuzzy_threshold and not known_apart:
+                    details.append({"requirement": requirement, "status": MATCHED,
+                                    "evidence": resume_skills[best], "source": "fuzzy"})
+                    continue
+
+            status = MISSING if canonical is not None else UNRESOLVED
+            details.append({"requirement": requirement, "status": status, "evidence": None,
+                            "source": "taxonomy" if canonical is not None else None})
+        return details
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher():
+    """Process-wide matcher; building the alias matrix is done once."""
+    return SkillMatcher()
@@ -0,0 +1,156 @@
+# utils/skill_taxonomy.py
+# Canonical skill names with their aliases and "implies" relations.
+# "implies" means: a candidate who lists the skill also covers the implied skills
+# (Django -> Python, TensorFlow -> Neural Networks). Relations are applied transitively.
+
+SKILL_TAXONOMY = {
+    # --- Languages ---
+    "Python": {"aliases": ["py", "python3", "python 3"], "implies": ["Programming"]},
+    "Java": {"aliases": ["java se", "java ee", "core java"], "implies": ["Programming", "Object-Oriented Programming"]},
+    "JavaScript": {"aliases": ["js", "javascript es6", "es6", "ecmascript"], "implies": ["Programming"]},
+    "TypeScript": {"aliases": ["ts"], "implies": ["JavaScript"]},
+    "C": {"aliases": ["c language", "ansi c"], "implies": ["Programming"]},
+    "C++": {"aliases": ["cpp", "c plus plus"], "implies": ["Programming", "Object-Oriented Programming"]},
+    "C#": {"aliases": ["csharp", "c sharp"], "implies": ["Programming", "Object-Oriented Programming"]},
+    "Go": {"aliases": ["golang"], "implies": ["Programming"]},
+    "Rust": {"aliases": ["rust lang", "rustlang"], "implies": ["Programming"]},
+    "Ruby": {"aliases": [], "implies": ["Programming"]},
+    "PHP": {"aliases": [], "implies": ["Programming"]},
+    "Kotlin": {"aliases": [], "implies": ["Programming"]},
+    "Swift": {"aliases": [], "implies": ["Programming"]},
+    "Scala": {"aliases": [], "implies": ["Programming"]},
+    "R": {"aliases": ["r language", "r programming"], "implies": ["Programming", "Statistics"]},
+    "SQL": {"aliases": ["structured query language", "t-sql", "tsql", "pl/sql", "plsql"], "implies": ["Databases"]},
+    "Bash": {"aliases": ["shell scripting", "shell", "bash scripting"], "implies": ["Linux"]},
+    "HTML": {"aliases": ["html5"], "implies": ["Web Development"]},
+    "CSS": {"aliases": ["css3"], "implies": ["Web Development"]},
+    "Programming": {"aliases": ["coding", "software development", "software engineering"], "implies": []},
+    "Object-Oriented Programming": {"aliases": ["oop", "oops", "object oriented programming", "object oriented design"], "implies": []},
+
+    # --- Web / Backend ---
+    "Django": {"aliases": [], "implies": ["Python", "Web Development", "Backend Development"]},
+    "Django REST Framework": {"aliases": ["drf", "django rest"], "implies": ["Django", "REST APIs"]},
+    "Flask": {"aliases": [], "implies": ["Python", "Web Development", "Backend Development"]},
+    "FastAPI": {"aliases": ["fast api"], "implies": ["Python", "REST APIs", "Backend Development"]},
+    "Node.js": {"aliases": ["node", "nodejs"], "implies": ["JavaScript", "Backend Development"]},
+    "Express.js": {"aliases": ["express", "expressjs"], "implies": ["Node.js", "REST APIs"]},
+    "Spring Boot": {"aliases": ["spring", "springboot", "spring framework"], "implies": ["Java", "Backend Development"]},
+    "Ruby on Rails": {"aliases": ["rails", "ror"], "implies": ["Ruby", "Backend Development"]},
+    "Laravel": {"aliases": [], "implies": ["PHP", "Backend Development"]},
+    "ASP.NET": {"aliases": ["asp.net core", ".net core", "dotnet", ".net"], "implies": ["C#", "Backend Development"]},
+    "REST APIs": {"aliases": ["rest", "restful", "rest api", "restful apis", "restful api", "api development"], "implies": ["Backend Development"]},
+    "GraphQL": {"aliases": [], "implies": ["Backend Development"]},
+    "gRPC": {"aliases": [], "implies": ["Backend Development"]},
+    "Microservices": {"aliases": ["microservice architecture", "micro services"], "implies": ["Backend Development", "System Design"]},
+    "Backend Development": {"aliases": ["backend", "back-end", "server-side development"], "implies": ["Web Development"]},
+    "Web Development": {"aliases": ["web dev"], "implies": ["Programming"]},
+    "WebSockets": {"aliases": ["websocket", "socket.io"], "implies": ["Web Development"]},
+
+    # --- Frontend ---
+    "React.js": {"aliases": ["react", "reactjs", "react js"], "implies": ["JavaScript", "Frontend Development"]},
+    "Next.js": {"aliases": ["next", "nextjs"], "implies": ["React.js"]},
+    "Angular": {"aliases": ["angularjs", "angular.js"], "implies": ["TypeScript", "Frontend Development"]},
+    "Vue.js": {"aliases": ["vue", "vuejs"], "implies": ["JavaScript", "Frontend Development"]},
+    "Redux": {"aliases": ["redux toolkit"], "implies": ["React.js"]},
+    "Tailwind CSS": {"aliases": ["tailwind", "tailwindcss"], "implies": ["CSS"]},
+    "Bootstrap": {"aliases": [], "implies": ["CSS"]},
+    "jQuery": {"aliases": ["jquery"], "implies": ["JavaScript"]},
+    "Frontend Development": {"aliases": ["frontend", "front-end", "front end development", "ui development"], "implies": ["Web Development"]},
+    "React Native": {"aliases": [], "implies": ["React.js", "Mobile Development"]},
+    "Flutter": {"aliases": ["dart"], "implies": ["Mobile Development"]},
+    "Android": {"aliases": ["android development"], "implies": ["Mobile Development"]},
+    "iOS": {"aliases": ["ios development"], "implies": ["Mobile Development"]},
+    "Mobile Development": {"aliases": ["mobile apps", "mobile app development"], "implies": ["Programming"]},
+
+    # --- Databases ---
+    "PostgreSQL": {"aliases": ["postgres", "psql", "postgre sql"], "implies": ["SQL", "Databases"]},
+    "MySQL": {"aliases": ["my sql", "mariadb"], "implies": ["SQL", "Databases"]},
+    "SQLite": {"aliases": ["sqlite3"], "implies": ["SQL", "Databases"]},
+    "Oracle Database": {"aliases": ["oracle", "oracle db"], "implies": ["SQL", "Databases"]},
+    "SQL Server": {"aliases": ["mssql", "ms sql", "microsoft sql server"], "implies": ["SQL", "Databases"]},
+    "MongoDB": {"aliases": ["mongo"], "implies": ["NoSQL", "Databases"]},
+    "Redis": {"aliases": [], "implies": ["NoSQL", "Caching"]},
+    "Cassandra": {"aliases": ["apache cassandra"], "implies": ["NoSQL"]},
+    "DynamoDB": {"aliases": ["dynamo db"], "implies": ["NoSQL", "AWS"]},
+    "Elasticsearch": {"aliases": ["elastic search", "elk", "opensearch"], "implies": ["NoSQL", "Search"]},
+    "NoSQL": {"aliases": ["no sql", "nosql databases"], "implies": ["Databases"]},
+    "Databases": {"aliases": ["database", "dbms", "rdbms", "database design", "relational databases"], "implies": []},
+    "Caching": {"aliases": ["cache"], "implies": []},
+    "Search": {"aliases": ["full-text search"], "implies": []},
+    "ORM": {"aliases": ["sqlalchemy", "django orm", "hibernate", "prisma"], "implies": ["Databases"]},
+
+    # --- Cloud / DevOps ---
+    "AWS": {"aliases": ["amazon web services", "aws cloud", "ec2", "s3", "aws lambda", "lambda"], "implies": ["Cloud Computing"]},
+    "Azure": {"aliases": ["microsoft azure"], "implies": ["Cloud Computing"]},
+    "GCP": {"aliases": ["google cloud", "google cloud platform"], "implies": ["Cloud Computing"]},
+    "Cloud Computing": {"aliases": ["cloud", "cloud platforms", "cloud services"], "implies": []},
+    "Docker": {"aliases": ["containers", "containerization", "dockerfile"], "implies": ["DevOps"]},
+    "Kubernetes": {"aliases": ["k8s", "kubectl", "helm"], "implies": ["Docker", "DevOps"]},
+    "Terraform": {"aliases": ["infrastructure as code", "iac"], "implies": ["DevOps"]},
+    "Ansible": {"aliases": [], "implies": ["DevOps"]},
+    "CI/CD": {"aliases": ["ci cd", "cicd", "continuous integration", "continuous deployment", "github actions", "gitlab ci", "jenkins", "circleci"], "implies": ["DevOps"]},
+    "DevOps": {"aliases": ["dev ops"], "implies": []},
+    "Linux": {"aliases": ["unix", "ubuntu", "linux administration"], "implies": []},
+    "Git": {"aliases": ["github", "gitlab", "bitbucket", "version control"], "implies": []},
+    "Nginx": {"aliases": [], "implies": ["DevOps"]},
+    "Celery": {"aliases": [], "implies": ["Python", "Message Queues"]},
+    "Kafka": {"aliases": ["apache kafka"], "implies": ["Message Queues", "Distributed Systems"]},
+    "RabbitMQ": {"aliases": ["rabbit mq"], "implies": ["Message Queues"]},
+    "Message Queues": {"aliases": ["message queue", "message brokers", "pub/sub"], "implies": ["Distributed Systems"]},
+    "Distributed Systems": {"aliases": ["distributed computing"], "implies": ["System Design"]},
+    "System Design": {"aliases": ["software architecture", "system architecture", "scalable systems"], "implies": []},
+
+    # --- Data / ML / AI ---
+    "Machine Learning": {"aliases": ["ml", "ai/ml", "ml/ai", "machine learning algorithms"], "implies": ["Artificial Intelligence"]},
+    "Deep Learning": {"aliases": ["dl"], "implies": ["Machine Learning", "Neural Networks"]},
+    "Neural Networks": {"aliases": ["neural network", "ann", "artificial neural networks"], "implies": ["Machine Learning"]},
+    "Artificial Intelligence": {"aliases": ["ai"], "implies": []},
+    "TensorFlow": {"aliases": ["tensor flow", "tf", "keras"], "implies": ["Deep Learning", "Neural Networks", "Python"]},
+    "PyTorch": {"aliases": ["torch", "py torch"], "implies": ["Deep Learning", "Neural Networks", "Python"]},
+    "Scikit-learn": {"aliases": ["sklearn", "scikit learn", "scikit"], "implies": ["Machine Learning", "Python"]},
+    "XGBoost": {"aliases": ["lightgbm", "catboost", "gradient boosting"], "implies": ["Machine Learning"]},
+    "Computer Vision": {"aliases": ["cv", "image processing", "opencv", "open cv"], "implies": ["Machine Learning"]},
+    "Natural Language Processing": {"aliases": ["nlp", "text mining", "spacy", "nltk"], "implies": ["Machine Learning"]},
+    "Large Language Models": {"aliases": ["llm", "llms", "gpt", "generative ai", "genai", "gen ai"], "implies": ["Natural Language Processing", "Deep Learning"]},
+    "Transformers": {"aliases": ["hugging face", "huggingface", "bert"], "implies": ["Natural Language Processing", "Deep Learning"]},
+    "LangChain": {"aliases": ["lang chain"], "implies": ["Large Language Models", "Python"]},
+    "LangGraph": {"aliases": ["lang graph"], "implies": ["LangChain", "AI Agents"]},
+    "AI Agents": {"aliases": ["agents", "agentic ai", "multi-agent systems", "llm agents"], "implies": ["Large Language Models"]},
+    "RAG": {"aliases": ["retrieval augmented generation", "retrieval-augmented generation"], "implies": ["Large Language Models", "Vector Databases"]},
+    "Prompt Engineering": {"aliases": ["prompting"], "implies": ["Large Language Models"]},
+    "Vector Databases": {"aliases": ["vector db", "pinecone", "faiss", "chromadb", "chroma", "weaviate", "qdrant", "pgvector"], "implies": ["Databases"]},
+    "Reinforcement Learning": {"aliases": ["rl"], "implies": ["Machine Learning"]},
+    "MLOps": {"aliases": ["ml ops", "mlflow", "kubeflow", "model deployment"], "implies": ["Machine Learning", "DevOps"]},
+    "Data Science": {"aliases": ["data scientist"], "implies": ["Data Analysis", "Machine Learning", "Statistics"]},
+    "Data Analysis": {"aliases": ["data analytics", "analytics", "exploratory data analysis", "eda"], "implies": []},
+    "Statistics": {"aliases": ["statistical analysis", "probability", "statistical modeling"], "implies": []},
+    "Pandas": {"aliases": [], "implies": ["Python", "Data Analysis"]},
+    "NumPy": {"aliases": ["numpy"], "implies": ["Python"]},
+    "Matplotlib": {"aliases": ["seaborn", "plotly"], "implies": ["Data Visualization", "Python"]},
+    "Data Visualization": {"aliases": ["dataviz", "visualization"], "implies": ["Data Analysis"]},
+    "Tableau": {"aliases": [], "implies": ["Data Visualization"]},
+    "Power BI": {"aliases": ["powerbi"], "implies": ["Data Visualization"]},
+    "Excel": {"aliases": ["ms excel", "microsoft excel", "spreadsheets"], "implies": ["Data Analysis"]},
+    "Apache Spark": {"aliases": ["spark", "pyspark"], "implies": ["Big Data", "Distributed Systems"]},
+    "Hadoop": {"aliases": ["hdfs", "mapreduce", "hive"], "implies": ["Big Data"]},
+    "Airflow": {"aliases": ["apache airflow"], "implies": ["Data Engineering", "Python"]},
+    "ETL": {"aliases": ["elt", "data pipelines", "data pipeline"], "implies": ["Data Engineering"]},
+    "Data Engineering": {"aliases": ["data engineer"], "implies": ["Databases"]},
+    "Big Data": {"aliases": [], "implies": ["Data Engineering"]},
+    "Snowflake": {"aliases": [], "implies": ["SQL", "Data Engineering"]},
+    "dbt": {"aliases": ["data build tool"], "implies": ["SQL", "Data Engineering"]},
+
+    # --- Practices / CS fundamentals ---
+    "Data Structures": {"aliases": ["data structures and algorithms", "dsa", "ds&a", "ds and algo"], "implies": ["Algorithms"]},
+    "Algorithms": {"aliases": ["algorithm design", "problem solving"], "implies": []},
+    "Unit Testing": {"aliases": ["testing", "pytest", "unittest", "jest", "junit", "tdd", "test driven development"], "implies": []},
+    "Agile": {"aliases": ["scrum", "kanban", "agile methodologies"], "implies": []},
+    "Security": {"aliases": ["cybersecurity", "application security", "owasp", "information security"], "implies": []},
+    "Authentication": {"aliases": ["oauth", "oauth2", "jwt", "sso", "authorization"], "implies": ["Security"]},
+    "Networking": {"aliases": ["tcp/ip", "computer networks", "http"], "implies": []},
+    "Operating Systems": {"aliases": ["os", "operating system"], "implies": []},
+    "Concurrency": {"aliases": ["multithreading", "multi-threading", "parallel programming", "asyncio", "async programming"], "implies": ["Programming"]},
+    "Performance Optimization": {"aliases": ["performance tuning", "profiling", "optimization"], "implies": []},
+    "Communication": {"aliases": ["communication skills", "verbal communication", "written communication"], "implies": []},
+    "Leadership": {"aliases": ["team leadership", "mentoring", "team management"], "implies": []},
+}